@@ -0,0 +1,89 @@
+"""Concurrent-request throughput: sync engine inside async handlers vs the async engine.
+
+Simulates N API requests on one event loop (one worker), `--concurrency` at a time.
+Each request does what `/search/{sport}` does: one awaited non-DB step (standing in
+for the geocode/cache lookup) and the search-shaped slot query. The "sync" mode runs
+that query through `database.get_all_rows` exactly as the handlers used to, blocking
+the loop for the round trip; the "async" mode runs it through `async_database`.
+
+Usage:
+    python benchmarks/async_db_throughput.py --requests 400 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+from datetime import date
+from time import perf_counter
+
+from sqlmodel import select
+
+import sportscanner.storage.postgres.async_database as async_db
+import sportscanner.storage.postgres.database as db
+from sportscanner.logger import logging
+from sportscanner.storage.postgres.tables import BadmintonMasterTable, SportsVenue
+
+
+def _search_query(composite_keys, search_date):
+    return (
+        select(BadmintonMasterTable)
+        .where(BadmintonMasterTable.composite_key.in_(composite_keys))
+        .where(BadmintonMasterTable.spaces > 0)
+        .where(BadmintonMasterTable.date == search_date)
+        .where(db.in_published_generation(BadmintonMasterTable))
+    )
+
+
+async def _request(mode: str, composite_keys, search_date, other_io_seconds: float) -> float:
+    tic = perf_counter()
+    await asyncio.sleep(other_io_seconds)
+    if mode == "sync":
+        db.get_all_rows(db.engine, None, _search_query(composite_keys, search_date))
+    else:
+        await async_db.get_all_rows_async(_search_query(composite_keys, search_date))
+    return perf_counter() - tic
+
+
+async def _run(mode: str, requests: int, concurrency: int, composite_keys, search_date, other_io_seconds):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            return await _request(mode, composite_keys, search_date, other_io_seconds)
+
+    # Warm both pools so connection setup isn't measured.
+    await bounded()
+    tic = perf_counter()
+    latencies = await asyncio.gather(*(bounded() for _ in range(requests)))
+    elapsed = perf_counter() - tic
+    latencies = sorted(latencies)
+    return {
+        "mode": mode,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--other-io-ms", type=float, default=20.0,
+                        help="Awaited non-DB latency per request (geocode/cache stand-in)")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    composite_keys = [venue.composite_key for venue in db.get_all_rows(db.engine, SportsVenue, select(SportsVenue))]
+    results = [
+        asyncio.run(_run(mode, args.requests, args.concurrency, composite_keys, args.date, args.other_io_ms / 1000))
+        for mode in ("sync", "async")
+    ]
+    for result in results:
+        logging.info(
+            f"{result['mode']:>5}: {result['throughput_rps']:.1f} req/s, "
+            f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
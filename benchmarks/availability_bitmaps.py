@@ -0,0 +1,101 @@
+"""Storage size and search latency: row-per-slot tables vs bitmap-encoded availability.
+
+Seeds synthetic venues and slots (`storage/postgres/seeder.py`), builds
+`availability_bitmap` for badminton from them, then compares:
+  - on-disk size (heap + indexes + TOAST) of the badminton slot table, its
+    availability documents and its bitmaps;
+  - median latency of "which of these venues have a free court between T1 and T2 on
+    this date": a bookable-slots query over the slot table (as the per-venue search
+    runs it) vs `free_between_query` over the bitmaps.
+
+Writes synthetic rows to the configured database (DB_CONNECTION_STRING); like the
+seeder, it refuses to run with ENV=prod. Point it at a scratch database.
+
+Usage:
+    python benchmarks/availability_bitmaps.py --venues 2000 --days 14 --repeat 20
+"""
+import argparse
+import statistics
+from datetime import date, time, timedelta
+from time import perf_counter
+
+from sqlalchemy import text
+
+import sportscanner.storage.postgres.database as db
+from sportscanner.logger import logging
+from sportscanner.storage.postgres import seeder
+from sportscanner.storage.postgres.availability_bitmaps import free_between_query, rebuild_availability_bitmaps
+from sportscanner.storage.postgres.tables import BadmintonMasterTable
+
+_SPORT = BadmintonMasterTable.__tablename__
+
+
+def _row_query(composite_keys, search_date, starting, ending):
+    return (
+        db.select(BadmintonMasterTable.composite_key)
+        .distinct()
+        .where(BadmintonMasterTable.composite_key.in_(composite_keys))
+        .where(BadmintonMasterTable.date == search_date)
+        .where(BadmintonMasterTable.spaces > 0)
+        .where(BadmintonMasterTable.starting_time >= starting)
+        .where(BadmintonMasterTable.ending_time <= ending)
+        .where(db.in_published_generation(BadmintonMasterTable))
+    )
+
+
+def _sizes(conn) -> dict:
+    sizes = {}
+    for name, relation, where in (
+        ("slot rows", f"public.{_SPORT}", "TRUE"),
+        ("availability documents", "public.availability_document", f"sport = '{_SPORT}'"),
+        ("bitmaps", "public.availability_bitmap", f"sport = '{_SPORT}'"),
+    ):
+        sizes[name] = {
+            "bytes": conn.execute(text(f"SELECT pg_total_relation_size('{relation}')")).scalar_one(),
+            "rows": conn.execute(text(f"SELECT count(*) FROM {relation} WHERE {where}")).scalar_one(),
+        }
+    return sizes
+
+
+def _median_ms(conn, statement, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        tic = perf_counter()
+        conn.execute(statement).all()
+        timings.append((perf_counter() - tic) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--venues", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--slots-per-day", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query; median latency is reported")
+    parser.add_argument("--search-venues", type=int, default=30, help="Venues per search (a radius search's worth)")
+    args = parser.parse_args()
+
+    venues, _ = seeder.seed(args.venues, args.days, args.slots_per_day, args.seed)
+    rebuild_availability_bitmaps(BadmintonMasterTable)
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"VACUUM ANALYZE public.{_SPORT}"))
+        conn.execute(text("VACUUM ANALYZE public.availability_bitmap"))
+
+    composite_keys = [venue.composite_key for venue in venues if _SPORT in venue.sports][:args.search_venues]
+    search_date = date.today() + timedelta(days=1)
+    windows = {"evening": (time(18), time(22)), "morning": (time(7), time(10))}
+
+    with db.engine.connect() as conn:
+        for name, size in _sizes(conn).items():
+            logging.info(f"{name:>22}: {size['bytes'] / 1024:10.1f} KiB in {size['rows']} rows")
+        for window, (starting, ending) in windows.items():
+            rows_ms = _median_ms(conn, _row_query(composite_keys, search_date, starting, ending), args.repeat)
+            bitmap_ms = _median_ms(
+                conn, free_between_query(_SPORT, composite_keys, search_date, starting, ending), args.repeat
+            )
+            logging.info(f"{window:>8} search: slot rows {rows_ms:7.2f} ms, bitmaps {bitmap_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""EXPLAIN (ANALYZE, BUFFERS) plans and timings for the slot-table read queries.
+
+Seeds synthetic venues and slots (`storage/postgres/seeder.py`), then runs the search,
+per-venue search, health and analytics queries (built with the same functions the
+API uses) twice: once against the previous index set ((composite_key, date) and its
+spaces > 0 partial twin) and once against `ensure_performance_indexes`. The baseline
+run swaps the indexes inside a transaction that is rolled back, so the database is
+left with the current index set.
+
+It seeds synthetic rows and drops/creates indexes, so the database is given
+explicitly with `--dsn` and must be a scratch database, never production; the
+configured DB_CONNECTION_STRING is ignored. Like the seeder, it also refuses to run
+with ENV=prod.
+
+Usage:
+    python benchmarks/explain_indexes.py --dsn postgresql://localhost/sportscanner_bench \\
+        --venues 200 --days 10 --output explain.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import text
+
+
+def _point_at(dsn: str):
+    """The seeder, the write path it replays and the query builders all use the engine
+    `storage/postgres/database.py` builds from DB_CONNECTION_STRING when first
+    imported, so the scratch DSN has to be in place before any of them are."""
+    if "sportscanner.storage.postgres.database" in sys.modules:
+        raise RuntimeError("database.py was imported before --dsn was applied")
+    os.environ["DB_CONNECTION_STRING"] = dsn
+
+
+_TABLE = "badminton"  # BadmintonMasterTable.__tablename__
+
+# The index set `ensure_performance_indexes` created before ix_{table}_bookable and
+# ix_{table}_date_freshness.
+_BASELINE_INDEXES = (
+    f"CREATE INDEX ix_{_TABLE}_composite_key_date ON public.{_TABLE} (composite_key, date)",
+    f"CREATE INDEX ix_{_TABLE}_composite_key_date_active ON public.{_TABLE} (composite_key, date) WHERE spaces > 0",
+)
+_CURRENT_INDEXES = (f"ix_{_TABLE}_bookable", f"ix_{_TABLE}_date_freshness")
+
+
+def queries(venues):
+    from sportscanner.analytics.consecutive import bookable_slots_query
+    from sportscanner.api.routers.health.endpoints import scraper_freshness_query
+    from sportscanner.api.routers.search.endpoints import venue_slots_query
+    from sportscanner.storage.postgres.dataset_transform import search_documents_query
+    from sportscanner.storage.postgres.tables import BadmintonMasterTable
+
+    today = date.today()
+    composite_keys = [venue.composite_key for venue in venues if _TABLE in venue.sports][:30]
+    return {
+        "search": search_documents_query(_TABLE, {key: 1.0 for key in composite_keys}, today),
+        "search_venue": venue_slots_query(BadmintonMasterTable, composite_keys[0], today, datetime.combine(today, time(12))),
+        "health": scraper_freshness_query(_TABLE),
+        "analytics": bookable_slots_query(time(18), time(22), today, today + timedelta(days=3)),
+    }
+
+
+def _explain(conn, statement) -> dict:
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    plan = conn.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    return plan[0]
+
+
+def _scan_nodes(node: dict):
+    if "Scan" in node["Node Type"]:
+        yield f'{node["Node Type"]} on {node.get("Relation Name")}' + (
+            f' using {node["Index Name"]}' if "Index Name" in node else ""
+        )
+    for child in node.get("Plans", []):
+        yield from _scan_nodes(child)
+
+
+def measure(conn, statements: dict, repeat: int) -> dict:
+    results = {}
+    for name, statement in statements.items():
+        plans = [_explain(conn, statement) for _ in range(repeat)]
+        last = plans[-1]
+        results[name] = {
+            "execution_ms": statistics.median(plan["Execution Time"] for plan in plans),
+            "planning_ms": statistics.median(plan["Planning Time"] for plan in plans),
+            "shared_hit_blocks": last["Plan"].get("Shared Hit Blocks", 0),
+            "shared_read_blocks": last["Plan"].get("Shared Read Blocks", 0),
+            "scans": list(_scan_nodes(last["Plan"])),
+            "plan": last,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", required=True, help="Scratch database to seed, re-index and query")
+    parser.add_argument("--venues", type=int, default=200)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--slots-per-day", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; median timings are reported")
+    parser.add_argument("--output", help="Write full plans and timings as JSON")
+    args = parser.parse_args()
+
+    _point_at(args.dsn)
+    import sportscanner.storage.postgres.database as db
+    from sportscanner.logger import logging
+    from sportscanner.storage.postgres import seeder
+
+    venues, _ = seeder.seed(args.venues, args.days, args.slots_per_day, args.seed)
+    statements = queries(venues)
+
+    report = {}
+    with db.engine.connect() as conn:
+        with conn.begin() as transaction:
+            for index in _CURRENT_INDEXES:
+                conn.execute(text(f"DROP INDEX public.{index}"))
+            for ddl in _BASELINE_INDEXES:
+                conn.execute(text(ddl))
+            conn.execute(text(f"ANALYZE public.{_TABLE}"))
+            report["baseline"] = measure(conn, statements, args.repeat)
+            transaction.rollback()
+        with conn.begin():
+            report["current"] = measure(conn, statements, args.repeat)
+
+    for index_set, results in report.items():
+        for name, result in results.items():
+            logging.info(
+                f"{index_set:>8} {name:<13} {result['execution_ms']:8.2f} ms "
+                f"(hit {result['shared_hit_blocks']}, read {result['shared_read_blocks']}) "
+                f"{'; '.join(result['scans'])}"
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": {**vars(args), "dsn": None}, "results": report}, f, indent=2, default=str)
+        logging.info(f"Plans written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""MCP request throughput with and without the API token cache.
+
+Simulates N authenticated MCP calls on one event loop (one worker), `--concurrency`
+at a time. Each call authenticates an `ssc_` token the way `HybridTokenVerifier`
+does (`ApiTokenRepository.authenticate`, synchronously on the loop) and then awaits
+`--other-io-ms` standing in for the tool's own work. The "uncached" mode sets
+`API_TOKEN_CACHE_SECONDS` and `API_TOKEN_LAST_USED_FLUSH_SECONDS` to 0, i.e. a
+SELECT plus an UPDATE/COMMIT per call as before; "cached" uses the configured values.
+
+A throwaway token is minted for `--kinde-user-id` (an existing user) and revoked at
+the end.
+
+Usage:
+    python benchmarks/mcp_token_auth_throughput.py --kinde-user-id kp_... --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+from time import perf_counter
+
+import sportscanner.storage.postgres.database as db
+from sportscanner.logger import logging
+from sportscanner.storage.postgres.api_token_repository import ApiTokenRepository
+from sportscanner.variables import settings
+
+
+async def _request(repo: ApiTokenRepository, raw_token: str, other_io_seconds: float) -> float:
+    tic = perf_counter()
+    if repo.authenticate(f"Bearer {raw_token}") is None:
+        raise RuntimeError("Benchmark token was rejected")
+    await asyncio.sleep(other_io_seconds)
+    return perf_counter() - tic
+
+
+async def _run(mode: str, repo: ApiTokenRepository, raw_token: str, requests: int, concurrency: int,
+               other_io_seconds: float):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            return await _request(repo, raw_token, other_io_seconds)
+
+    # Warm the pool so connection setup isn't measured.
+    await bounded()
+    tic = perf_counter()
+    latencies = await asyncio.gather(*(bounded() for _ in range(requests)))
+    elapsed = perf_counter() - tic
+    repo.flush_last_used()
+    latencies = sorted(latencies)
+    return {
+        "mode": mode,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kinde-user-id", required=True, help="Existing user to mint the benchmark token for")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--other-io-ms", type=float, default=5.0,
+                        help="Awaited non-auth latency per call (tool work stand-in)")
+    args = parser.parse_args()
+
+    repo = ApiTokenRepository(db.engine)
+    raw_token, token = repo.create(args.kinde_user_id, "benchmark")
+    configured = (settings.API_TOKEN_CACHE_SECONDS, settings.API_TOKEN_LAST_USED_FLUSH_SECONDS)
+    results = []
+    try:
+        for mode, (cache_seconds, flush_seconds) in (("uncached", (0, 0)), ("cached", configured)):
+            settings.API_TOKEN_CACHE_SECONDS = cache_seconds
+            settings.API_TOKEN_LAST_USED_FLUSH_SECONDS = flush_seconds
+            results.append(asyncio.run(
+                _run(mode, repo, raw_token, args.requests, args.concurrency, args.other_io_ms / 1000)
+            ))
+    finally:
+        settings.API_TOKEN_CACHE_SECONDS, settings.API_TOKEN_LAST_USED_FLUSH_SECONDS = configured
+        repo.revoke(args.kinde_user_id, token.id)
+
+    for result in results:
+        logging.info(
+            f"{result['mode']:>8}: {result['throughput_rps']:.1f} req/s, "
+            f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,17 @@ from typing import List, Optional, Tuple
 from black.lines import LeafID
 from sportscanner.logger import logging
 from pydantic import BaseModel
+from sqlalchemy import Row
 from sqlmodel import select
 
 from sportscanner.storage.postgres.database import (
     engine,
-    get_all_rows,
+    fetch_rows,
+    in_published_generation,
 )
-from sportscanner.storage.postgres.tables import BadmintonMasterTable, SportsVenue
+from sportscanner.storage.postgres.tables import BadmintonMasterTable
+from sportscanner.storage.postgres.venue_registry import venue_registry
+from sportscanner.storage.snapshots import read_snapshot, read_venues_snapshot
 from sportscanner.utils import timeit
 from rich import print
 
@@ -29,6 +33,37 @@ class ConsecutiveSlotsCarousalDisplay(BaseModel):
     bookings_url: Optional[str]
 
 
+def bookable_slots_query(starting_time: time, ending_time: time, starting_date: date, ending_date: date):
+    """Bookable badminton slots within a daily time window over a date range."""
+    return (
+        select(
+            BadmintonMasterTable.composite_key,
+            BadmintonMasterTable.category,
+            BadmintonMasterTable.date,
+            BadmintonMasterTable.starting_time,
+            BadmintonMasterTable.ending_time,
+            BadmintonMasterTable.booking_url,
+        )
+        .where(BadmintonMasterTable.spaces > 0)
+        .where(BadmintonMasterTable.starting_time >= starting_time)
+        .where(BadmintonMasterTable.ending_time <= ending_time)
+        .where(BadmintonMasterTable.date >= starting_date)
+        .where(BadmintonMasterTable.date <= ending_date)
+        .where(in_published_generation(BadmintonMasterTable))
+    )
+
+
+def _bookable_slots_from_snapshot(starting_time: time, ending_time: time, starting_date: date, ending_date: date):
+    """`bookable_slots_query` and the venue lookup, answered from the Parquet snapshot.
+    Rows are named tuples with the same attributes as the database rows."""
+    df = read_snapshot(BadmintonMasterTable.__tablename__, starting_date, ending_date)
+    df = df[(df.spaces > 0) & (df.starting_time >= starting_time) & (df.ending_time <= ending_time)]
+    slots = list(df[["composite_key", "category", "date", "starting_time", "ending_time", "booking_url"]]
+                 .itertuples(index=False, name="Row"))
+    venues = list(read_venues_snapshot()[["composite_key", "venue_name"]].itertuples(index=False, name="Row"))
+    return slots, venues
+
+
 @timeit
 def find_consecutive_slots(
     consecutive_count: int = 3,
@@ -36,26 +71,28 @@ def find_consecutive_slots(
     ending_time: time = time(22, 00),
     starting_date: date = datetime.now().date(),
     ending_date: date = datetime.now().date() + timedelta(days=3),
-) -> List[List[BadmintonMasterTable]]:
+    from_snapshot: bool = False,
+) -> List[List[Row]]:
     """Finds consecutively overlapping slots i.e. end time of one slot overlaps with start time of
     another and calculates the `n` consecutive slots
     Returns: List of grouped consecutively occurring slots
+
+    With `from_snapshot`, reads the latest Parquet snapshot (`storage/snapshots.py`)
+    instead of querying Postgres.
     """
 
-    slots: List[BadmintonMasterTable] = get_all_rows(
-        engine,
-        BadmintonMasterTable,
-        select(BadmintonMasterTable)
-        .where(BadmintonMasterTable.spaces > 0)
-        .where(BadmintonMasterTable.starting_time >= starting_time)
-        .where(BadmintonMasterTable.ending_time <= ending_time)
-        .where(BadmintonMasterTable.date >= starting_date)
-        .where(BadmintonMasterTable.date <= ending_date),
-    )
-    sports_centre_lists = get_all_rows(engine, SportsVenue, select(SportsVenue))
+    if from_snapshot:
+        slots, sports_centre_lists = _bookable_slots_from_snapshot(
+            starting_time, ending_time, starting_date, ending_date
+        )
+    else:
+        slots = fetch_rows(
+            engine, bookable_slots_query(starting_time, ending_time, starting_date, ending_date)
+        )
+        sports_centre_lists = venue_registry().venues
     dates: List[date] = list(set([row.date for row in slots]))
     consecutive_slots_list = []
-    parameter_sets: List[Tuple[date, SportsVenue]] = [(x, y) for x, y in itertools.product(dates, sports_centre_lists)]
+    parameter_sets: List[Tuple[date, Row]] = [(x, y) for x, y in itertools.product(dates, sports_centre_lists)]
 
     for target_date, venue in parameter_sets:
         logging.info(
@@ -98,13 +135,10 @@ def find_consecutive_slots(
 
 @timeit
 def format_consecutive_slots_groupings(
-    consecutive_slots: List[List[BadmintonMasterTable]],
+    consecutive_slots: List[List[Row]],
 ) -> List[ConsecutiveSlotsCarousalDisplay]:
     temp = []
-    sports_venues: List[SportsVenue] = get_all_rows(
-        engine, SportsVenue, select(SportsVenue)
-    )
-    venue_slug_map = {venue.slug: venue for venue in sports_venues}
+    venue_map = venue_registry().by_key
     for group_for_consecutive_slots in consecutive_slots:
         gather_slots_starting_times = []
         for slot in group_for_consecutive_slots:
@@ -113,20 +147,17 @@ def format_consecutive_slots_groupings(
         display_message_slots_starting_times: str = (
             "Slots starting at " f"{', '.join(gather_slots_starting_times)}"
         )
-        initial_slot_in_group: BadmintonMasterTable = group_for_consecutive_slots[0]
-        final_slot_in_group: BadmintonMasterTable = group_for_consecutive_slots[0]
-        # replacing slug with names
-        if initial_slot_in_group.venue_slug in venue_slug_map:
-            # Replace venue_slug with the corresponding slug from SportsVenue
-            venue_name_lookup = venue_slug_map[
-                initial_slot_in_group.venue_slug
-            ].venue_name
+        initial_slot_in_group: Row = group_for_consecutive_slots[0]
+        final_slot_in_group: Row = group_for_consecutive_slots[0]
+        # replacing composite_key with venue names
+        if initial_slot_in_group.composite_key in venue_map:
+            venue = venue_map[initial_slot_in_group.composite_key]
 
             temp.append(
                 ConsecutiveSlotsCarousalDisplay(
                     distance="Greater London, England",
-                    venue=venue_name_lookup,
-                    organisation=initial_slot_in_group.organisation,
+                    venue=venue.venue_name,
+                    organisation=venue.organisation,
                     raw_date=initial_slot_in_group.date,
                     date=initial_slot_in_group.date.strftime("%Y-%m-%d (%A)"),
                     group_start_time=initial_slot_in_group.starting_time,
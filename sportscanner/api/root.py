@@ -1,4 +1,6 @@
+import asyncio
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import List
 
@@ -7,6 +9,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from starlette.requests import Request
 
+from sportscanner.variables import settings
+
+# Must be set before anything imports storage/postgres/database.py: it sizes the sync
+# engine's pool to leave room for the async one within the per-process budget.
+settings.DB_API_PROCESS = True
+
 from sportscanner.api.routers.geolocation.endpoints import router as GeolocationRouter
 from sportscanner.api.routers.search.endpoints import (
     router as SearchRouter,
@@ -19,7 +27,10 @@ from sportscanner.api.routers.notifications.endpoints import router as Notificat
 from sportscanner.api.routers.tokens.endpoints import router as TokensRouter
 from sportscanner.api.routers.mcp_connections.endpoints import router as McpConnectionsRouter
 
+import sportscanner.storage.postgres.database as db
 from sportscanner.logger import logging
+from sportscanner.storage.postgres.api_token_repository import ApiTokenRepository
+from sportscanner.storage.postgres.venue_registry import reload_venue_registry_async
 
 import httpx
 
@@ -57,6 +68,42 @@ except Exception as exc:  # pragma: no cover - defensive
     logging.warning(f"MCP server not mounted (fastmcp unavailable?): {exc}")
 
 
+async def _flush_api_token_uses_periodically():
+    """Flushes buffered API token uses every `API_TOKEN_LAST_USED_FLUSH_SECONDS`; without
+    it, a token used once and then left idle would keep its write until the next call."""
+    repository = ApiTokenRepository(db.engine)
+    while True:
+        await asyncio.sleep(settings.API_TOKEN_LAST_USED_FLUSH_SECONDS)
+        repository.flush_last_used()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Every search and venue lookup reads the venue registry; load it before serving
+    # rather than on the first request. A failure here isn't fatal - the registry
+    # retries on first use.
+    try:
+        await reload_venue_registry_async()
+    except Exception as exc:
+        logging.warning(f"Venue registry not loaded at startup: {exc}")
+    flusher = None
+    if settings.API_TOKEN_LAST_USED_FLUSH_SECONDS > 0:
+        flusher = asyncio.create_task(_flush_api_token_uses_periodically())
+    # FastMCP's streamable-HTTP app needs its lifespan to run so the session
+    # manager is initialised; wiring it here lets us mount it below.
+    try:
+        if _mcp_app is not None:
+            async with _mcp_app.lifespan(app):
+                yield
+        else:
+            yield
+    finally:
+        if flusher is not None:
+            flusher.cancel()
+        # API token uses are buffered (see api_token_repository); don't lose the last batch.
+        ApiTokenRepository(db.engine).flush_last_used()
+
+
 description = """
 ## Sportscanner API
 
@@ -83,9 +130,7 @@ app = FastAPI(
         "name": "Apache 2.0",
         "url": "https://www.apache.org/licenses/LICENSE-2.0.html",
     },
-    # FastMCP's streamable-HTTP app needs its lifespan to run so the session
-    # manager is initialised; wiring it here lets us mount it below.
-    lifespan=_mcp_app.lifespan if _mcp_app is not None else None,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -95,6 +140,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["ETag"],  # So the frontend can revalidate searches with If-None-Match
 )
 
 app.include_router(
@@ -10,7 +10,7 @@ from starlette import status
 from sportscanner.storage.postgres.tables import SportsVenue
 from sportscanner.variables import *
 from sportscanner.api.routers.core.schemas import *
-import sportscanner.storage.postgres.database as db
+import sportscanner.storage.postgres.async_database as async_db
 from sportscanner.api.routers.health.schema import VenueAvailability
 
 router = APIRouter()
@@ -26,11 +26,35 @@ _SPORT_TO_TABLE = {
 }
 
 
+def scraper_freshness_query(sports: str):
+    """Latest refresh per venue/date for one sport (already validated against
+    `_SPORT_TO_TABLE`), oldest first. Reads the pipeline-maintained `venue_freshness`
+    (one row per venue/date) rather than aggregating the slot table."""
+    return text("""
+        SELECT
+            v.venue_name,
+            f.date,
+            f.last_refreshed AS latest_refresh,
+            f.slot_count,
+            f.bookable_count,
+            f.provider_status
+        FROM
+            venue_freshness f
+        JOIN
+            sportsvenue v ON f.composite_key = v.composite_key
+        WHERE
+            f.sport = :sport
+        ORDER BY
+            latest_refresh ASC,
+            v.venue_name;
+    """).bindparams(sport=_SPORT_TO_TABLE[sports])
+
+
 @router.get("/scrapers") # /health/scrapers?sports=badminton
 async def scrapers_healthcheck(
     sports: str = Query(..., description="Scraper sport category to check health for"),
 ) -> List[VenueAvailability]:
-    # `sports` selects a TABLE NAME below, which can never be a bound SQL parameter —
+    # `sports` selects a TABLE NAME in the query, which can never be a bound SQL parameter —
     # it must be validated against the allow-list before it reaches the query string.
     # (The previous unvalidated version was also broken for a missing `sports`: an
     # f-string `FROM {sports}` with sports=None produced invalid SQL `FROM None t1`,
@@ -40,37 +64,15 @@ async def scrapers_healthcheck(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported sport category: {sports!r}. Must be one of {sorted(_SPORT_TO_TABLE)}",
         )
-    table_name = _SPORT_TO_TABLE[sports]
-    clause = text(f"""
-        SELECT
-            t2.venue_name,
-            t1.date,
-            MAX(t1.last_refreshed) AS latest_refresh
-        FROM
-            {table_name} t1
-        JOIN
-            sportsvenue t2 ON t1.composite_key = t2.composite_key
-        WHERE
-            t2.sports @> :sport_array ::varchar[]
-        GROUP BY
-            t1.composite_key,
-            t2.venue_name,
-            t1.date
-        ORDER BY
-            latest_refresh ASC,
-            t2.venue_name;
-    """).bindparams(sport_array=[sports])
-
-    rows= db.get_all_rows(
-        db.engine,
-        None,
-        clause
-    )
+    rows = await async_db.fetch_rows_async(scraper_freshness_query(sports))
     results: List[VenueDistanceModel] = [
         VenueAvailability(
             venue_name=row.venue_name,
             date=row.date,
-            latest_refresh=row.latest_refresh
+            latest_refresh=row.latest_refresh,
+            slot_count=row.slot_count,
+            bookable_count=row.bookable_count,
+            provider_status=row.provider_status,
         )
         for row in rows
     ]
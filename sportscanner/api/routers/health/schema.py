@@ -7,6 +7,9 @@ class VenueAvailability(BaseModel):
     venue_name: str
     date: Optional[date]
     latest_refresh: Optional[datetime]
+    slot_count: Optional[int] = None
+    bookable_count: Optional[int] = None
+    provider_status: Optional[str] = None
 
     @computed_field
     @property
@@ -11,22 +11,21 @@ from fastapi import APIRouter, Header, HTTPException, Path
 from starlette import status
 
 import sportscanner.storage.postgres.database as db
-from sportscanner.core.kinde.auth import get_kinde_access_token, get_kinde_user_details
+from sportscanner.core.kinde.auth import resolve_kinde_identity
 from sportscanner.storage.postgres.mcp_client_repository import McpAuthorizedClientRepository
 
 router = APIRouter()
 repo = McpAuthorizedClientRepository(db.engine)
 
 
-def _kinde_user_id(refresh_token):
-    access_token = get_kinde_access_token(refresh_token=refresh_token)
-    return get_kinde_user_details(access_token)["id"]
+async def _kinde_user_id(refresh_token):
+    return (await resolve_kinde_identity(refresh_token)).user_id
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def list_connections(Authorization: str = Header(default=None)):
     """List the caller's authorized MCP clients."""
-    user_id = _kinde_user_id(Authorization)
+    user_id = await _kinde_user_id(Authorization)
     return [
         {
             "id": row.id,
@@ -42,7 +41,7 @@ async def revoke_connection(
     connection_id: str = Path(..., description="Connection id to revoke"),
     Authorization: str = Header(default=None),
 ):
-    user_id = _kinde_user_id(Authorization)
+    user_id = await _kinde_user_id(Authorization)
     row = repo.get_owned(user_id, connection_id)
     if not row:
         raise HTTPException(status_code=404, detail="Connection not found")
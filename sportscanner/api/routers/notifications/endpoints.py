@@ -2,10 +2,10 @@ import uuid
 from datetime import datetime
 
 from fastapi import APIRouter, Header, HTTPException, status
-from sqlmodel import Session, select
+from sqlmodel import select
 
-from sportscanner.core.kinde.auth import get_kinde_access_token, get_kinde_user_details
-from sportscanner.storage.postgres.database import engine
+from sportscanner.core.kinde.auth import resolve_kinde_identity
+from sportscanner.storage.postgres.async_database import async_session
 from sportscanner.storage.postgres.tables import Notification, NotificationAck
 
 from .schemas import NotificationIn, NotificationOut, NotificationUpdate
@@ -13,10 +13,8 @@ from .schemas import NotificationIn, NotificationOut, NotificationUpdate
 router = APIRouter()
 
 
-def _get_user_id(Authorization: str) -> str:
-    access_token = get_kinde_access_token(refresh_token=Authorization)
-    user_details = get_kinde_user_details(access_token)
-    return user_details["id"]
+async def _get_user_id(Authorization: str) -> str:
+    return (await resolve_kinde_identity(Authorization)).user_id
 
 
 @router.get("/", response_model=list[NotificationOut])
@@ -26,16 +24,16 @@ async def list_notifications(
     ),
 ):
     """List all active notifications for the current user, with acknowledged_at set when the user has dismissed it."""
-    user_id = _get_user_id(Authorization)
-    with Session(engine) as session:
-        notifications = session.exec(
+    user_id = await _get_user_id(Authorization)
+    async with async_session() as session:
+        notifications = (await session.exec(
             select(Notification).where(Notification.active == True).order_by(Notification.created_at.desc())
-        ).all()
+        )).all()
         acks = {
             ack.notification_id: ack.acknowledged_at
-            for ack in session.exec(
+            for ack in (await session.exec(
                 select(NotificationAck).where(NotificationAck.user_id == user_id)
-            ).all()
+            )).all()
         }
     return [
         NotificationOut(
@@ -59,22 +57,22 @@ async def acknowledge_notification(
     ),
 ):
     """Mark a notification as acknowledged (dismissed) for the current user."""
-    user_id = _get_user_id(Authorization)
-    with Session(engine) as session:
-        notification = session.get(Notification, notification_id)
+    user_id = await _get_user_id(Authorization)
+    async with async_session() as session:
+        notification = await session.get(Notification, notification_id)
         if not notification:
             raise HTTPException(status_code=404, detail="Notification not found")
-        existing = session.exec(
+        existing = (await session.exec(
             select(NotificationAck).where(
                 NotificationAck.user_id == user_id,
                 NotificationAck.notification_id == notification_id,
             )
-        ).first()
+        )).first()
         if not existing:
             session.add(
                 NotificationAck(user_id=user_id, notification_id=notification_id)
             )
-            session.commit()
+            await session.commit()
 
 
 # --- Admin: create/update notifications (you can add role checks later) ---
@@ -88,17 +86,17 @@ async def create_notification(
     ),
 ):
     """Create a new notification (all users will see it until they acknowledge)."""
-    _get_user_id(Authorization)  # require auth
+    await _get_user_id(Authorization)  # require auth
     notification = Notification(
         id=str(uuid.uuid4()),
         title=body.title,
         message=body.message,
         active=body.active,
     )
-    with Session(engine) as session:
+    async with async_session() as session:
         session.add(notification)
-        session.commit()
-        session.refresh(notification)
+        await session.commit()
+        await session.refresh(notification)
     return NotificationOut(
         id=str(notification.id),
         title=notification.title,
@@ -119,9 +117,9 @@ async def update_notification(
     ),
 ):
     """Update a notification (e.g. edit message or set active=false to hide from everyone)."""
-    _get_user_id(Authorization)  # require auth
-    with Session(engine) as session:
-        notification = session.get(Notification, notification_id)
+    await _get_user_id(Authorization)  # require auth
+    async with async_session() as session:
+        notification = await session.get(Notification, notification_id)
         if not notification:
             raise HTTPException(status_code=404, detail="Notification not found")
         if body.title is not None:
@@ -132,8 +130,8 @@ async def update_notification(
             notification.active = body.active
         notification.updated_at = datetime.utcnow()
         session.add(notification)
-        session.commit()
-        session.refresh(notification)
+        await session.commit()
+        await session.refresh(notification)
     return NotificationOut(
         id=str(notification.id),
         title=notification.title,
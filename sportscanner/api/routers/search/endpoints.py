@@ -1,22 +1,30 @@
 from sportscanner.api.routers.core.schemas import SportscannerSupportedSports
 from sportscanner.logger import logging
+import json
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Header, HTTPException, Query, Request, Path
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Path, Response
+from fastapi.responses import StreamingResponse
 from rich import print
 from starlette import status
 
+import sportscanner.api.routers.search.response_cache as response_cache
+import sportscanner.storage.postgres.async_database as async_db
 import sportscanner.storage.postgres.database as db
 from sportscanner.storage.postgres.tables import BadmintonMasterTable, SquashMasterTable, PickleballMasterTable, PadelMasterTable
-from sportscanner.api.routers.search.schemas import SearchCriteria, SortByOptions
+from sportscanner.api.routers.search.schemas import SearchCriteria
 from sportscanner.api.routers.users.service.userService import UserService
 from sportscanner.api.routers.venues.utils import get_venues_near_postcode
 from sportscanner.crawlers.pipeline import *
+from sportscanner.crawlers.pipeline import CRAWL_HORIZON_DAYS
+from sportscanner.singleflight import single_flight
 from sportscanner.storage.postgres.dataset_transform import (
-    group_slots_by_attributes,
-    sort_and_format_grouped_slots_for_ui,
+    format_search_row_for_ui,
+    format_search_rows_for_ui,
+    search_documents_query,
 )
+from sportscanner.storage.postgres.venue_registry import venue_registry_async
 
 router = APIRouter()
 
@@ -35,17 +43,22 @@ def find_query_table(sport: SportscannerSupportedSports):
             detail=f"Unsupported sport category: {sport}",
         )
 
-@router.post("/{sport}")
-async def search(
-    sport: SportscannerSupportedSports = Path(
-        description="Sport category to filter venues and court availability"
-    ),
-    date: date =  Query(...,description="Date to filter court availability"),
-    filters: SearchCriteria = ...,
-):
-    """Returns all court availability relevant to specified filters passed via payload"""
-    queryTable = find_query_table(sport)
+def venue_slots_query(queryTable, composite_key: str, search_date: date, now: datetime):
+    """Bookable slots at one venue on one date (found through the slot table's partial
+    `ix_{table}_bookable` index, then fetched from the heap)."""
+    return (
+        db.select(queryTable)
+        .where(queryTable.composite_key == composite_key)
+        .where(queryTable.spaces > 0)  # Ignore empty courts
+        .where(queryTable.date == search_date)
+        .where(queryTable.starts_at > now)
+        .where(db.in_published_generation(queryTable))
+    )
+
 
+async def _resolve_venue_distances(filters: SearchCriteria) -> Dict[str, float]:
+    """composite_key -> distance in miles for the venues a search covers: the venues
+    specified in the payload, or else those within the radius of the postcode."""
     try:
         nearby_venues = await get_venues_near_postcode(filters.postcode, filters.radius)
     except ValueError:
@@ -58,38 +71,122 @@ async def search(
     else:
         composite_keys = [venue.composite_key for venue in nearby_venues]
 
-    current_timestamp = datetime.now()
-
-    slots = db.get_all_rows(
-        db.engine,
-        None,
-        db.select(queryTable)
-        .where(queryTable.composite_key.in_(composite_keys))
-        .where(queryTable.spaces > 0)  # Ignore empty courts
-        .where(queryTable.starting_time >= filters.timeRange.starting)
-        .where(queryTable.ending_time <= filters.timeRange.ending)
-        .where(queryTable.date == date)
-        .where(queryTable.starts_at > current_timestamp),
-    )
-    grouped_slots = group_slots_by_attributes(
-        slots, attributes=("composite_key", "date")
-    )
     distance_from_venues_reference = {
         venue.composite_key: venue.distance for venue in nearby_venues
     }
-    _response = sort_and_format_grouped_slots_for_ui(
-        grouped_slots, distance_from_venues_reference
-    )
-    # Function to sort the list based on API payload requirements
-    sorted_response = sorted(
-        _response,
-        key=lambda x: (
-            datetime.strptime(x["date"], "%a, %b %d"),  # Closest date
-            float(x[filters.sortBy.name].replace("£", "")) if filters.sortBy == SortByOptions.price else x[filters.sortBy.name],
-        ),
+    # Specified venues outside the radius have no distance; they sort last
+    return {key: distance_from_venues_reference.get(key, 99) for key in composite_keys}
+
+
+def _rendered_search_response(rendered: response_cache.RenderedResponse, if_none_match: Optional[str]) -> Response:
+    # no-cache: browsers may keep the response but must revalidate it (a cheap 304)
+    headers = {"ETag": rendered.etag, "Cache-Control": "no-cache"}
+    if rendered.matches(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
+
+
+@router.post("/{sport}")
+async def search(
+    sport: SportscannerSupportedSports = Path(
+        description="Sport category to filter venues and court availability"
+    ),
+    date: date =  Query(...,description="Date to filter court availability"),
+    filters: SearchCriteria = ...,
+    if_none_match: Optional[str] = Header(None),
+):
+    """Returns all court availability relevant to specified filters passed via payload.
+    Responses carry a strong ETag; repeating it in `If-None-Match` returns 304 when the
+    results haven't changed."""
+    queryTable = find_query_table(sport)
+    venue_distances = await _resolve_venue_distances(filters)
+    current_timestamp = datetime.now()
+
+    # Cached responses are tagged with the published crawl generation, so they are
+    # only served until the next crawl of this sport lands
+    generation = await response_cache.published_generation(sport.value)
+    cache_key = response_cache.search_cache_key(
+        sport.value,
+        generation,
+        date,
+        venue_distances,
+        filters.timeRange.starting,
+        filters.timeRange.ending,
+        filters.sortBy.name,
+        current_timestamp,
     )
-    logging.warning(f"Time taken for retrieval, transformations, sorting: {datetime.now() - current_timestamp}")
-    return sorted_response
+    cached_response = await response_cache.get_cached_response(cache_key, sport.value, generation)
+    if cached_response is not None:
+        return _rendered_search_response(cached_response, if_none_match)
+
+    async def compute_response() -> response_cache.RenderedResponse:
+        # A flight for this key may have finished since the lookup above
+        cached_response = await response_cache.get_cached_response(cache_key, sport.value, generation)
+        if cached_response is not None:
+            return cached_response
+        # One row per venue/date, filtered to the time range and sorted by Postgres
+        # (see `search_documents_query`)
+        rows = await async_db.fetch_rows_async(
+            search_documents_query(
+                sport.value,
+                venue_distances,
+                date,
+                sort_by=filters.sortBy.name,
+                starting=filters.timeRange.starting,
+                ending=filters.timeRange.ending,
+                now=current_timestamp,
+            )
+        )
+        sorted_response = format_search_rows_for_ui(rows, (await venue_registry_async()).lookup)
+        logging.warning(f"Time taken for retrieval, transformations, sorting: {datetime.now() - current_timestamp}")
+        return await response_cache.cache_response(cache_key, sport.value, generation, sorted_response)
+
+    # Identical searches missing at the same time share one computation
+    rendered = await single_flight(cache_key, compute_response)
+    return _rendered_search_response(rendered, if_none_match)
+
+@router.post("/{sport}/range")
+async def search_range(
+    sport: SportscannerSupportedSports = Path(
+        description="Sport category to filter venues and court availability"
+    ),
+    date_from: date = Query(..., description="First date to return court availability for"),
+    date_to: date = Query(..., description="Last date to return court availability for (inclusive)"),
+    filters: SearchCriteria = ...,
+):
+    """Court availability for every date in [date_from, date_to], streamed as NDJSON:
+    one line per venue/date, in the same shape as the items `POST /search/{sport}`
+    returns, ordered by date (then by `sortBy`). Each date is queried and sent before
+    the next is read, so a week view can render its first day while the rest are still
+    being queried."""
+    horizon = date.today() + timedelta(days=CRAWL_HORIZON_DAYS[sport.value] - 1)
+    if date_to < date_from or date_to > horizon:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"date_from..date_to must be an ordered range ending by {horizon.isoformat()}, the last date {sport.value} is crawled for",
+        )
+    venue_distances = await _resolve_venue_distances(filters)
+    lookup = (await venue_registry_async()).lookup
+    now = datetime.now()
+
+    async def ndjson_lines():
+        # One bounded query per date, each fetched in full so its connection is back in
+        # the (small, no-overflow) async pool before the client reads a line of it.
+        for offset in range((date_to - date_from).days + 1):
+            query = search_documents_query(
+                sport.value,
+                venue_distances,
+                date_from + timedelta(days=offset),
+                sort_by=filters.sortBy.name,
+                starting=filters.timeRange.starting,
+                ending=filters.timeRange.ending,
+                now=now,
+            )
+            for row in await async_db.fetch_rows_async(query):
+                yield json.dumps(format_search_row_for_ui(row, lookup), ensure_ascii=False) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 
 @router.post("/{sport}/{composite_key}")
 async def search(
@@ -101,16 +198,8 @@ async def search(
 ):
     queryTable = find_query_table(sport)
 
-    current_timestamp = datetime.now()
-
-    slots = db.get_all_rows(
-        db.engine,
-        None,
-        db.select(queryTable)
-        .where(queryTable.composite_key == composite_key)
-        .where(queryTable.spaces > 0)  # Ignore empty courts
-        .where(queryTable.date == date)
-        .where(queryTable.starts_at > current_timestamp),
+    slots = await async_db.get_all_rows_async(
+        venue_slots_query(queryTable, composite_key, date, datetime.now())
     )
     return slots
 
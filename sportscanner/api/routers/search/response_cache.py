@@ -0,0 +1,171 @@
+"""Response cache for `POST /search/{sport}`, tagged with the sport's crawl generation.
+
+A search's answer only changes when a crawl of its sport is published (the
+`crawl_generation` pointer is bumped at the end of `database.crawl_generation`), so
+responses are cached under a key that includes the published generation: once a
+crawl lands, every request resolves the new generation, misses, and recomputes.
+Entries for superseded generations are never read again; locally they are purged as
+soon as a newer generation is seen, in Valkey they expire.
+
+Two tiers, checked in order:
+  - in-process: an LRU of at most `SEARCH_CACHE_ENTRIES` responses per worker;
+  - Valkey (`sportscanner/cache.py`): shared by every worker and instance, and
+    best-effort like the rest of the cache, so an outage just means local-only.
+Both also expire entries after `SEARCH_CACHE_TTL_SECONDS`, a backstop rather than
+the invalidation mechanism.
+
+The rest of the key is everything the response depends on: date, the resolved
+venues and their distances, time range and sort order. Searches for today also drop
+slots that have already started, so their key carries the current 5-minute bucket.
+The one other time-dependent field, each item's `healthcheck`, is handled by expiring
+an entry when the first of its items would turn "deprecated".
+
+Responses are cached already serialized, with a strong ETag (a digest of the body):
+a hit is served as the stored bytes, and a client presenting the ETag in
+`If-None-Match` gets a 304 with no body.
+
+Concurrent misses on the same key are coalesced by the endpoint (via
+`sportscanner.singleflight`), as are the generation lookups, so a burst on a cold key
+runs the search query once.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from time import monotonic, time
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import sportscanner.storage.postgres.async_database as async_db
+from sportscanner.cache import cache_get_text_async, cache_set_text_async
+from sportscanner.singleflight import single_flight
+from sportscanner.storage.postgres.database import select
+from sportscanner.storage.postgres.dataset_transform import healthcheck_deadline
+from sportscanner.storage.postgres.tables import CrawlGeneration
+from sportscanner.variables import settings
+
+NOW_BUCKET_MINUTES = 5
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "RenderedResponse":
+        return cls(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an `If-None-Match` header value names this response."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or self.etag in tags
+
+
+# key -> (expires at (monotonic), sport, generation, response)
+_local: "OrderedDict[str, Tuple[float, str, int, RenderedResponse]]" = OrderedDict()
+_latest_generation: Dict[str, int] = {}
+
+
+async def _read_published_generation(sport: str) -> int:
+    rows = await async_db.fetch_rows_async(
+        select(CrawlGeneration.current_generation).where(CrawlGeneration.sport == sport)
+    )
+    return rows[0].current_generation if rows else 0
+
+
+async def published_generation(sport: str) -> int:
+    """The sport's published crawl generation (0 before its first crawl). Concurrent
+    lookups for a sport share one query."""
+    return await single_flight(f"generation:{sport}", lambda: _read_published_generation(sport))
+
+
+def search_cache_key(
+    sport: str,
+    generation: int,
+    search_date: date,
+    venue_distances: Dict[str, Optional[float]],
+    starting: Any,
+    ending: Any,
+    sort_by: str,
+    now: datetime,
+) -> str:
+    venues = hashlib.sha1(json.dumps(sorted(venue_distances.items())).encode()).hexdigest()
+    if search_date == now.date():
+        now_bucket = f"{now.hour:02d}{now.minute // NOW_BUCKET_MINUTES * NOW_BUCKET_MINUTES:02d}"
+    else:
+        now_bucket = "-"
+    return (
+        f"search:{sport}:g{generation}:{search_date.isoformat()}:{venues}:"
+        f"{starting}-{ending}:{sort_by}:{now_bucket}"
+    )
+
+
+def render(response: List[dict]) -> RenderedResponse:
+    """Serializes a response the way FastAPI's JSONResponse would."""
+    body = json.dumps(response, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return RenderedResponse.from_body(body)
+
+
+def _seconds_to_live(response: List[dict]) -> float:
+    """The TTL backstop, cut short to when the first "ok" healthcheck would flip."""
+    now_uk = datetime.now(ZoneInfo("Europe/London"))
+    flips = [
+        (healthcheck_deadline(datetime.fromisoformat(item["last_refreshed"])) - now_uk).total_seconds()
+        for item in response
+        if item["healthcheck"] == "ok"
+    ]
+    return min([settings.SEARCH_CACHE_TTL_SECONDS, *flips])
+
+
+def _purge_superseded(sport: str, generation: int):
+    if generation <= _latest_generation.get(sport, -1):
+        return
+    _latest_generation[sport] = generation
+    for key in [key for key, entry in _local.items() if entry[1] == sport and entry[2] < generation]:
+        del _local[key]
+
+
+def _store_local(key: str, sport: str, generation: int, rendered: RenderedResponse, ttl: float):
+    _local[key] = (monotonic() + ttl, sport, generation, rendered)
+    _local.move_to_end(key)
+    while len(_local) > settings.SEARCH_CACHE_ENTRIES:
+        _local.popitem(last=False)
+
+
+async def get_cached_response(key: str, sport: str, generation: int) -> Optional[RenderedResponse]:
+    """The cached response for `key` from the local tier, else Valkey (which then
+    warms the local tier), or None on a miss."""
+    _purge_superseded(sport, generation)
+    entry = _local.get(key)
+    if entry is not None:
+        if entry[0] > monotonic():
+            _local.move_to_end(key)
+            return entry[3]
+        del _local[key]
+    stored = await cache_get_text_async(key)
+    if stored is None:
+        return None
+    # "<expires at (epoch seconds)>\n<body>", so the local copy expires with it
+    expires_at, body = stored.split("\n", 1)
+    rendered = RenderedResponse.from_body(body.encode("utf-8"))
+    ttl = float(expires_at) - time()
+    if ttl > 0:
+        _store_local(key, sport, generation, rendered, ttl)
+    return rendered
+
+
+async def cache_response(key: str, sport: str, generation: int, response: List[dict]) -> RenderedResponse:
+    """Renders a freshly computed response and stores it in both tiers, unless a newer
+    generation has been seen meanwhile (nothing would look the entry up again) or an
+    item's healthcheck is about to flip. Returns the rendered response either way."""
+    rendered = render(response)
+    ttl = _seconds_to_live(response)
+    if generation < _latest_generation.get(sport, generation) or ttl < 1:
+        return rendered
+    _store_local(key, sport, generation, rendered, ttl)
+    await cache_set_text_async(key, f"{time() + ttl}\n{rendered.body.decode('utf-8')}", ttl_seconds=int(ttl))
+    return rendered
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Header, Request, status
 from rich import print
 
 from sportscanner.api.routers.users.service.userService import UserService
-from sportscanner.core.kinde.auth import get_kinde_access_token, get_kinde_user_details
+from sportscanner.core.kinde.auth import resolve_kinde_identity
 
 router = APIRouter()
 
@@ -22,12 +22,10 @@ PREFERENCE_KEYS = {
 }
 
 
-def _kinde_identity(refresh_token: str) -> tuple[str, str, str]:
+async def _kinde_identity(refresh_token: str) -> tuple[str, str, str]:
     """Returns (kinde_user_id, full_name, email) from a refresh token."""
-    access_token = get_kinde_access_token(refresh_token=refresh_token)
-    d = get_kinde_user_details(access_token)
-    full_name = f"{d.get('first_name', '')} {d.get('last_name', '')}".strip()
-    return d["id"], full_name, d.get("preferred_email", "")
+    identity = await resolve_kinde_identity(refresh_token)
+    return identity.user_id, identity.full_name, identity.email
 
 
 def _preference_updates(body: dict) -> dict:
@@ -44,7 +42,7 @@ def _preference_updates(body: dict) -> dict:
 async def get_user_profile(
     Authorization: str = Header(default=None),
 ):
-    user_id, _, _ = _kinde_identity(Authorization)
+    user_id, _, _ = await _kinde_identity(Authorization)
     profile = UserService().get_full_profile(user_id)
     print(profile)
     return profile
@@ -55,7 +53,7 @@ async def register_user(
     Authorization: str = Header(default=None),
 ):
     """Called automatically from the callback page on first login."""
-    user_id, full_name, email = _kinde_identity(Authorization)
+    user_id, full_name, email = await _kinde_identity(Authorization)
     UserService().register(user_id, full_name, email)
     return {"success": True}
 
@@ -70,7 +68,7 @@ async def update_user(
       { "onboarding": bool, "preferences": { ...any keys... } }
     """
     body = await request.json()
-    user_id, full_name, email = _kinde_identity(Authorization)
+    user_id, full_name, email = await _kinde_identity(Authorization)
     print(body)
     UserService().update(
         kinde_user_id=user_id,
@@ -6,10 +6,20 @@ import httpx
 from sportscanner.logger import logging
 from pydantic import Field, ValidationError
 
+import sportscanner.storage.postgres.async_database as async_db
 import sportscanner.storage.postgres.database as db
 from sportscanner.storage.postgres.tables import SportsVenue
+from sportscanner.storage.postgres.venue_registry import venue_registry
 from sportscanner import config
-from sportscanner.cache import cache_get_json, cache_set_json
+from sportscanner.singleflight import single_flight
+from sportscanner.variables import settings
+from sportscanner.cache import (
+    cache_get_json_async,
+    cache_mget_json_with_ttl_async,
+    cache_set_json_async,
+    cache_set_many_json_async,
+    refresh_ahead,
+)
 from enum import Enum
 from typing import Tuple
 from pydantic import BaseModel
@@ -24,26 +34,15 @@ def get_venues_from_database(
         limit: Annotated[int, Field(description="Limit the number of venues in the response")] = 10
     ) -> List[SportsVenue]:
     """This Tool fetches sports venues from the database offering a specific sport."""
-    venues: List[SportsVenue] = db.get_all_rows(
-        db.engine, 
-        SportsVenue, 
-        db.select(SportsVenue)
-        .where(SportsVenue.sports.overlap(sports))
-        .limit(limit)
-    )
-    return venues
+    venues: List[SportsVenue] = venue_registry().for_sports(sports)
+    return venues[:limit] if limit is not None else venues
 
 def get_venue_by_composite_key(
         composite_key: Annotated[str, Field(description="Composite key identifier to fetch venue information")]
     ) -> List[SportsVenue]:
     """This Tool fetches a particular sports venue from the database based on its composite key."""
-    venues: List[SportsVenue] = db.get_all_rows(
-        db.engine, 
-        SportsVenue, 
-        db.select(SportsVenue)
-        .where(SportsVenue.composite_key == composite_key)
-    )
-    return venues
+    venue: Optional[SportsVenue] = venue_registry().get(composite_key)
+    return [venue] if venue is not None else []
 
 
 def get_sports_venues_within_radius(
@@ -53,12 +52,11 @@ def get_sports_venues_within_radius(
         sport_category: Annotated[List, Field(description="Optional sport category to filter venues on, array elements must be from these options: 'badminton', 'squash', 'pickleball'")] = [],
     ) -> List[SportsVenuesNearRadiusResonseModel]:
     """This Tool fetches venues within a defined radius from a given point and can filter by sport category."""
-    venues: List[SportsVenue] = db.get_all_rows(
-        db.engine,
-        SportsVenue,
-        db.select(SportsVenue)
-        .where(SportsVenue.sports.contains([sport_category]))
-    )
+    sports = [sport_category] if isinstance(sport_category, str) else list(sport_category)
+    venues: List[SportsVenue] = [
+        venue for venue in venue_registry().venues
+        if set(sports).issubset(venue.sports or [])
+    ]
     venues_distance_from_postcode = []
     for sports_venue in venues:
         _dist = calculate_distance_in_miles(
@@ -81,37 +79,121 @@ def _normalize_postcode_for_cache_key(postcode: str) -> str:
     return re.sub(r"\s+", "", postcode).upper()
 
 
+def _geocode_cache_key(postcode: str) -> str:
+    return f"geocode:{_normalize_postcode_for_cache_key(postcode)}"
+
+
+async def _request_geocode_payload(postcode: str) -> dict:
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"https://api.postcodes.io/postcodes/{postcode}")
+    return response.json()
+
+
+async def _fetch_geocode_payload(postcode: str) -> dict:
+    """postcodes.io's response for `postcode`; concurrent lookups of the same
+    (normalized) postcode share one request."""
+    return await single_flight(_geocode_cache_key(postcode), lambda: _request_geocode_payload(postcode))
+
+
+def _geocode_ttl(payload: dict) -> int:
+    """Resolved postcodes are kept for `GEOCODE_CACHE_TTL_SECONDS`; postcodes.io
+    errors (an unknown or not-yet-issued postcode) only for the usual short TTL."""
+    return settings.GEOCODE_CACHE_TTL_SECONDS if payload.get("result") else settings.CACHE_TTL_SECONDS
+
+
+async def _refetch_resolved_geocode(postcode: str) -> Optional[dict]:
+    """A fresh geocode payload for refresh-ahead, or None (keep the cached one until it
+    expires) if postcodes.io had no result this time, e.g. a transient error or a 429."""
+    payload = await _request_geocode_payload(postcode)
+    return payload if payload.get("result") else None
+
+
+def _refresh_geocode_ahead(postcode: str, cache_key: str, seconds_left: Optional[float], payload: dict):
+    refresh_ahead(
+        cache_key,
+        seconds_left,
+        _geocode_ttl(payload),
+        lambda: _refetch_resolved_geocode(postcode),
+        ttl_for=_geocode_ttl,
+    )
+
+
 async def geocode_postcode(postcode: str) -> "PostcodeAPIResponse":
     """Resolve a UK postcode to lat/lng via postcodes.io, cached (near-static data)."""
-    cache_key = f"geocode:{_normalize_postcode_for_cache_key(postcode)}"
-    cached = cache_get_json(cache_key)
+    cache_key = _geocode_cache_key(postcode)
+    cached, seconds_left = (await cache_mget_json_with_ttl_async([cache_key]))[cache_key]
     if cached is not None:
+        _refresh_geocode_ahead(postcode, cache_key, seconds_left, cached)
         return PostcodeAPIResponse(**cached)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"https://api.postcodes.io/postcodes/{postcode}")
-    payload = response.json()
+    payload = await _fetch_geocode_payload(postcode)
     result = PostcodeAPIResponse(**payload)
-    cache_set_json(cache_key, payload)
+    await cache_set_json_async(cache_key, payload, _geocode_ttl(payload))
     return result
 
 
 async def get_venues_near_postcode(postcode: str, distance: float = 10.0) -> List[VenueDistanceModel]:
     """Venues within `distance` miles of `postcode`. Both the geocode lookup and the
-    resulting venue list are cached (short TTL) since this is near-static data re-queried
-    on every search. Used directly by both GET /venues/near and POST /search/{sport} —
-    search calls this in-process rather than looping back over HTTP to its own API.
+    resulting venue list are cached since this is near-static data re-queried on every
+    search: the venue list briefly (`CACHE_TTL_SECONDS`), the geocode for far longer.
+    Hot entries are refreshed in the background before they expire (see
+    `cache.refresh_ahead`). Used directly by both GET /venues/near and POST
+    /search/{sport} — search calls this in-process rather than looping back over HTTP
+    to its own API. Both cache keys are read in one round trip, and written in one.
+    Concurrent calls for the same postcode and distance share one lookup (see
+    `sportscanner.singleflight`).
     """
-    venues_cache_key = f"venues_near:{_normalize_postcode_for_cache_key(postcode)}:{distance}"
-    cached = cache_get_json(venues_cache_key)
-    if cached is not None:
-        return [VenueDistanceModel(**row) for row in cached]
+    venues_cache_key = f"venues_near:{_normalize_postcode_for_cache_key(postcode)}:{float(distance)}"
+    return await single_flight(venues_cache_key, lambda: _venues_near_postcode(postcode, distance, venues_cache_key))
+
 
-    geocoded = await geocode_postcode(postcode)
+async def _venues_near_postcode(postcode: str, distance: float, venues_cache_key: str) -> List[VenueDistanceModel]:
+    geocode_cache_key = _geocode_cache_key(postcode)
+    cached = await cache_mget_json_with_ttl_async([venues_cache_key, geocode_cache_key])
+    venues, venues_seconds_left = cached[venues_cache_key]
+    if venues is not None:
+        refresh_ahead(
+            venues_cache_key,
+            venues_seconds_left,
+            settings.CACHE_TTL_SECONDS,
+            lambda: _recompute_venues_near(postcode, distance),
+        )
+        return [VenueDistanceModel(**row) for row in venues]
+
+    to_cache = {}
+    geocode_payload, geocode_seconds_left = cached[geocode_cache_key]
+    if geocode_payload is None:
+        geocode_payload = to_cache[geocode_cache_key] = await _fetch_geocode_payload(postcode)
+    else:
+        _refresh_geocode_ahead(postcode, geocode_cache_key, geocode_seconds_left, geocode_payload)
+    ttl_by_key = {geocode_cache_key: _geocode_ttl(geocode_payload)}
+    geocoded = PostcodeAPIResponse(**geocode_payload)
     if geocoded.result is None:
+        await cache_set_many_json_async(to_cache, ttl_by_key=ttl_by_key)
         raise ValueError(f"{postcode!r} is not a valid UK postcode")
-    longitude, latitude = geocoded.result.longitude, geocoded.result.latitude
 
+    results = await _query_venues_near(geocoded.result.longitude, geocoded.result.latitude, distance)
+    to_cache[venues_cache_key] = [r.model_dump() for r in results]
+    await cache_set_many_json_async(to_cache, ttl_by_key=ttl_by_key)
+    return results
+
+
+async def _recompute_venues_near(postcode: str, distance: float) -> Optional[list]:
+    """A fresh venues-near cache value for refresh-ahead, geocoding through the cache;
+    None (nothing to write) if the postcode no longer resolves."""
+    geocode_cache_key = _geocode_cache_key(postcode)
+    geocode_payload = await cache_get_json_async(geocode_cache_key)
+    if geocode_payload is None:
+        geocode_payload = await _fetch_geocode_payload(postcode)
+        await cache_set_json_async(geocode_cache_key, geocode_payload, _geocode_ttl(geocode_payload))
+    geocoded = PostcodeAPIResponse(**geocode_payload)
+    if geocoded.result is None:
+        return None
+    results = await _query_venues_near(geocoded.result.longitude, geocoded.result.latitude, distance)
+    return [r.model_dump() for r in results]
+
+
+async def _query_venues_near(longitude: float, latitude: float, distance: float) -> List[VenueDistanceModel]:
     clause = text("""
         SELECT
             composite_key,
@@ -142,8 +224,8 @@ async def get_venues_near_postcode(postcode: str, distance: float = 10.0) -> Lis
         lat=latitude,
         meters=distance * 1609.344,
     )
-    rows = db.get_all_rows(db.engine, SportsVenue, clause)
-    results = [
+    rows = await async_db.fetch_rows_async(clause)
+    return [
         VenueDistanceModel(
             composite_key=row.composite_key,
             venue_name=row.venue_name,
@@ -155,5 +237,3 @@ async def get_venues_near_postcode(postcode: str, distance: float = 10.0) -> Lis
         )
         for row in rows
     ]
-    cache_set_json(venues_cache_key, [r.model_dump() for r in results])
-    return results
\ No newline at end of file
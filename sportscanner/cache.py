@@ -4,17 +4,37 @@ Caching is optional and must never break a request: if VALKEY_URL isn't
 configured, or the cache is unreachable, every function here degrades to a
 silent no-op (cache miss) so callers always fall through to the real data
 source. TTL is short (see settings.CACHE_TTL_SECONDS) because the cached data
-(postcode geocoding, venues-within-radius) is near-static but not immutable —
-new venues can be added at any time.
+(venues-within-radius) is near-static but not immutable — new venues can be added
+at any time. Postcode geocodes are the exception: coordinates don't move, so they
+are kept for settings.GEOCODE_CACHE_TTL_SECONDS.
+
+Two clients: the synchronous one below for scripts and the pipeline, and an
+asyncio one (the `*_async` functions) for API handlers, where a slow or
+unreachable Valkey would otherwise stall the event loop for up to the socket
+timeout on every call. The async client keeps a connection pool, and can read
+several keys in one round trip (`cache_mget_json_async`) and write several in
+one pipelined round trip (`cache_set_many_json_async`).
+
+Refresh-ahead: a hit read with `cache_mget_json_with_ttl_async` also returns the
+entry's remaining TTL. Passing that to `refresh_ahead` counts the hit, and once a key
+has been hit `CACHE_REFRESH_MIN_HITS` times and is in the last
+`CACHE_REFRESH_AHEAD_FRACTION` of its TTL, it is recomputed and rewritten by a
+background task. Hot keys then never expire in front of a request. Counts are per
+process, and so are refreshes (at most one in flight per key).
 """
+import asyncio
 import json
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from sportscanner.logger import logging
 from sportscanner.variables import settings
 
 _client = None
 _client_init_attempted = False
+_async_client = None
+_async_client_init_attempted = False
+
+SOCKET_TIMEOUT_SECONDS = 2
 
 # VALKEY_URL points at a shared instance (other apps use it too), so every
 # key we touch is namespaced to avoid colliding with theirs.
@@ -37,8 +57,8 @@ def _get_client():
         import redis
         _client = redis.from_url(
             settings.VALKEY_URL,
-            socket_timeout=2,
-            socket_connect_timeout=2,
+            socket_timeout=SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=SOCKET_TIMEOUT_SECONDS,
             decode_responses=True,
         )
         _client.ping()
@@ -82,3 +102,179 @@ def cache_set_json(key: str, value: Any, ttl_seconds: Optional[int] = None) -> N
         logging.info(f"Cache SET: {key} (ttl={ttl}s)")
     except Exception as e:
         logging.warning(f"Cache SET failed for key={key}: {e}")
+
+
+async def _get_async_client():
+    """`_get_client` for the asyncio client: one pooled client per process, or None
+    if unconfigured or unreachable."""
+    global _async_client, _async_client_init_attempted
+    if _async_client_init_attempted:
+        return _async_client
+    _async_client_init_attempted = True
+
+    if not settings.VALKEY_URL:
+        logging.debug("VALKEY_URL not configured — caching disabled")
+        return None
+
+    try:
+        import redis.asyncio
+        _async_client = redis.asyncio.from_url(
+            settings.VALKEY_URL,
+            socket_timeout=SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=SOCKET_TIMEOUT_SECONDS,
+            max_connections=settings.VALKEY_MAX_CONNECTIONS,
+            decode_responses=True,
+        )
+        await _async_client.ping()
+        logging.info("Connected to Valkey cache (async)")
+    except Exception as e:
+        logging.warning(f"Valkey cache unavailable, continuing without caching: {e}")
+        _async_client = None
+    return _async_client
+
+
+async def cache_mget_text_async(keys: List[str]) -> Dict[str, Optional[str]]:
+    """Values stored as-is for each of `keys`, fetched in one round trip (MGET). Misses,
+    and every key on a cache failure, map to None."""
+    client = await _get_async_client()
+    if client is None or not keys:
+        return {key: None for key in keys}
+    try:
+        values = await client.mget([KEY_PREFIX + key for key in keys])
+    except Exception as e:
+        logging.warning(f"Cache MGET failed for keys={keys}: {e}")
+        return {key: None for key in keys}
+    for key, raw in zip(keys, values):
+        logging.info(f"Cache {'HIT' if raw is not None else 'MISS'}: {key}")
+    return dict(zip(keys, values))
+
+
+def _decode_json(key: str, raw: Optional[str]) -> Optional[Any]:
+    try:
+        return json.loads(raw) if raw is not None else None
+    except ValueError as e:
+        logging.warning(f"Cache value for key={key} is not valid JSON: {e}")
+        return None
+
+
+async def cache_mget_json_async(keys: List[str]) -> Dict[str, Optional[Any]]:
+    """`cache_mget_text_async`, JSON-decoded."""
+    values = await cache_mget_text_async(keys)
+    return {key: _decode_json(key, raw) for key, raw in values.items()}
+
+
+async def cache_mget_json_with_ttl_async(keys: List[str]) -> Dict[str, Tuple[Optional[Any], Optional[float]]]:
+    """`cache_mget_json_async`, plus each key's remaining TTL in seconds (None on a
+    miss or for a key without one), read in the same pipelined round trip."""
+    client = await _get_async_client()
+    if client is None or not keys:
+        return {key: (None, None) for key in keys}
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.mget([KEY_PREFIX + key for key in keys])
+            for key in keys:
+                pipe.pttl(KEY_PREFIX + key)
+            values, *pttls = await pipe.execute()
+    except Exception as e:
+        logging.warning(f"Cache MGET failed for keys={keys}: {e}")
+        return {key: (None, None) for key in keys}
+    result = {}
+    for key, raw, pttl in zip(keys, values, pttls):
+        logging.info(f"Cache {'HIT' if raw is not None else 'MISS'}: {key}")
+        result[key] = (_decode_json(key, raw), pttl / 1000 if raw is not None and pttl >= 0 else None)
+    return result
+
+
+async def cache_get_text_async(key: str) -> Optional[str]:
+    return (await cache_mget_text_async([key]))[key]
+
+
+async def cache_get_json_async(key: str) -> Optional[Any]:
+    return (await cache_mget_json_async([key]))[key]
+
+
+async def cache_set_many_text_async(
+    values: Dict[str, str],
+    ttl_seconds: Optional[int] = None,
+    ttl_by_key: Optional[Dict[str, int]] = None,
+) -> None:
+    """Writes every key in `values` in one pipelined round trip, each with its TTL in
+    `ttl_by_key` if given there, else `ttl_seconds`. Never raises."""
+    client = await _get_async_client()
+    if client is None or not values:
+        return
+    ttls = {key: (ttl_by_key or {}).get(key) or ttl_seconds or settings.CACHE_TTL_SECONDS for key in values}
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(KEY_PREFIX + key, value, ex=ttls[key])
+            await pipe.execute()
+        logging.info(f"Cache SET: {', '.join(f'{key} (ttl={ttl}s)' for key, ttl in ttls.items())}")
+    except Exception as e:
+        logging.warning(f"Cache SET failed for keys={list(values)}: {e}")
+
+
+async def cache_set_many_json_async(
+    values: Dict[str, Any],
+    ttl_seconds: Optional[int] = None,
+    ttl_by_key: Optional[Dict[str, int]] = None,
+) -> None:
+    """`cache_set_many_text_async`, JSON-encoding each value."""
+    await cache_set_many_text_async(
+        {key: json.dumps(value) for key, value in values.items()}, ttl_seconds, ttl_by_key
+    )
+
+
+async def cache_set_text_async(key: str, value: str, ttl_seconds: Optional[int] = None) -> None:
+    await cache_set_many_text_async({key: value}, ttl_seconds)
+
+
+async def cache_set_json_async(key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+    await cache_set_many_json_async({key: value}, ttl_seconds)
+
+
+# key -> hits since this process last (re)wrote it
+_hits: Dict[str, int] = {}
+_refreshing: Dict[str, "asyncio.Task"] = {}
+MAX_TRACKED_KEYS = 10_000
+
+
+async def _refresh(
+    key: str,
+    recompute: Callable[[], Awaitable[Optional[Any]]],
+    ttl_seconds: int,
+    ttl_for: Optional[Callable[[Any], int]],
+):
+    try:
+        value = await recompute()
+        if value is not None:
+            await cache_set_json_async(key, value, ttl_for(value) if ttl_for else ttl_seconds)
+            logging.info(f"Cache REFRESH: {key}")
+    except Exception as e:
+        logging.warning(f"Cache refresh failed for key={key}: {e}")
+    finally:
+        _hits.pop(key, None)
+        _refreshing.pop(key, None)
+
+
+def refresh_ahead(
+    key: str,
+    seconds_left: Optional[float],
+    ttl_seconds: int,
+    recompute: Callable[[], Awaitable[Optional[Any]]],
+    ttl_for: Optional[Callable[[Any], int]] = None,
+) -> None:
+    """Counts a hit on `key` (with `seconds_left` of its `ttl_seconds`) and, if the key
+    is hot and about to expire, rewrites it in the background with the value
+    `recompute()` returns (None skips the write), for `ttl_for(value)` seconds if given,
+    else `ttl_seconds`. Must be called on the event loop."""
+    if len(_hits) >= MAX_TRACKED_KEYS and key not in _hits:
+        _hits.clear()
+    hits = _hits[key] = _hits.get(key, 0) + 1
+    if seconds_left is None or key in _refreshing:
+        return
+    if hits < settings.CACHE_REFRESH_MIN_HITS:
+        return
+    if seconds_left > ttl_seconds * settings.CACHE_REFRESH_AHEAD_FRACTION:
+        return
+    _refreshing[key] = asyncio.ensure_future(_refresh(key, recompute, ttl_seconds, ttl_for))
@@ -1,9 +1,56 @@
-from sportscanner.variables import settings
+"""Resolving the Kinde user behind the refresh token the frontend sends in
+`Authorization`.
+
+That takes two Kinde round trips (refresh token -> access token -> user profile), and
+every authenticated endpoint used to make both, synchronously, inside an `async def`
+handler, blocking the event loop for hundreds of milliseconds per request. They now
+go through one pooled `httpx.AsyncClient`, and `resolve_kinde_identity` caches the
+result per token for `KINDE_IDENTITY_CACHE_SECONDS` (never past the access token's
+expiry), so repeat requests from the same session make no Kinde calls at all.
+Requests that miss at the same moment (a burst right after the entry expires) are
+coalesced with `single_flight`, so they make one pair of calls between them.
+
+The cache is keyed by a SHA-256 fingerprint of the token, not the token itself, and
+is in-process only: refresh tokens never leave the process.
+"""
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Optional, Tuple
+
 import httpx
 from fastapi import HTTPException
 
+from sportscanner.singleflight import single_flight
+from sportscanner.variables import settings
+
+KINDE_TIMEOUT_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class KindeIdentity:
+    user_id: str
+    full_name: str
+    email: str
+    # monotonic() time the access token it was resolved with expires
+    access_token_expires_at: float
+
+
+_client: Optional[httpx.AsyncClient] = None
+# token fingerprint -> (expires at (monotonic), identity)
+_identities: "OrderedDict[str, Tuple[float, KindeIdentity]]" = OrderedDict()
+
+
+def _async_client() -> httpx.AsyncClient:
+    """One pooled client per process, so repeat calls reuse Kinde connections."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(base_url=settings.KINDE_DOMAIN, timeout=KINDE_TIMEOUT_SECONDS)
+    return _client
 
-def get_kinde_access_token(refresh_token: str):
+
+def _refresh_token_from_header(refresh_token: Optional[str]) -> str:
     if not refresh_token:
         raise HTTPException(
             status_code=400,
@@ -14,27 +61,77 @@ def get_kinde_access_token(refresh_token: str):
         )
     if refresh_token.lower().startswith("bearer "):
         refresh_token = refresh_token.split(" ", 1)[1].strip()
+    return refresh_token
+
 
-    url = f"{settings.KINDE_DOMAIN}/oauth2/token"
+async def get_kinde_access_token_async(refresh_token: str) -> dict:
+    """Kinde's token response (`access_token`, `expires_in`, ...) for a refresh token."""
     payload = {
         "grant_type": "refresh_token",
         "client_id": settings.KINDE_CLIENT_ID,
-        "refresh_token": refresh_token,
+        "refresh_token": _refresh_token_from_header(refresh_token),
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    response = await _async_client().post("/oauth2/token", data=payload, headers=headers)
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.json())
+    return response.json()
 
-    with httpx.Client() as client:
-        response = client.post(url, data=payload, headers=headers)
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail=response.json())
-        return response.json().get("access_token")
 
-def get_kinde_user_details(access_token: str):
-    url = f"{settings.KINDE_DOMAIN}/oauth2/user_profile"
+async def get_kinde_user_details_async(access_token: str) -> dict:
     headers = {"Authorization": f"Bearer {access_token}"}
+    response = await _async_client().get("/oauth2/user_profile", headers=headers)
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.json())
+    return response.json()
+
+
+def _fingerprint(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def _cached_identity(fingerprint: str) -> Optional[KindeIdentity]:
+    entry = _identities.get(fingerprint)
+    if entry is None:
+        return None
+    if entry[0] <= monotonic():
+        del _identities[fingerprint]
+        return None
+    _identities.move_to_end(fingerprint)
+    return entry[1]
+
+
+def _cache_identity(fingerprint: str, identity: KindeIdentity):
+    expires_at = min(monotonic() + settings.KINDE_IDENTITY_CACHE_SECONDS, identity.access_token_expires_at)
+    _identities[fingerprint] = (expires_at, identity)
+    _identities.move_to_end(fingerprint)
+    while len(_identities) > settings.KINDE_IDENTITY_CACHE_ENTRIES:
+        _identities.popitem(last=False)
+
+
+async def _request_kinde_identity(refresh_token: str, fingerprint: str) -> KindeIdentity:
+    token = await get_kinde_access_token_async(refresh_token)
+    expires_at = monotonic() + token.get("expires_in", settings.KINDE_IDENTITY_CACHE_SECONDS)
+    d = await get_kinde_user_details_async(token.get("access_token"))
+    identity = KindeIdentity(
+        user_id=d["id"],
+        full_name=f"{d.get('first_name', '')} {d.get('last_name', '')}".strip(),
+        email=d.get("preferred_email", ""),
+        access_token_expires_at=expires_at,
+    )
+    _cache_identity(fingerprint, identity)
+    return identity
+
 
-    with httpx.Client() as client:
-        response = client.get(url, headers=headers)
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail=response.json())
-        return response.json()
+async def resolve_kinde_identity(refresh_token: Optional[str]) -> KindeIdentity:
+    """The Kinde user a refresh token belongs to, from the cache when this token was
+    resolved recently. Concurrent misses for the same token share one pair of Kinde
+    calls. Kinde errors are raised as HTTPException, as before, and are not cached."""
+    refresh_token = _refresh_token_from_header(refresh_token)
+    fingerprint = _fingerprint(refresh_token)
+    identity = _cached_identity(fingerprint)
+    if identity is not None:
+        return identity
+    return await single_flight(
+        f"kinde_identity:{fingerprint}", lambda: _request_kinde_identity(refresh_token, fingerprint)
+    )
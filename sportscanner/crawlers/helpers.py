@@ -1,5 +1,8 @@
 import asyncio
-from typing import Any, List, Tuple, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator, List, Optional, Tuple, Union
 import pandas as pd
 from sportscanner.crawlers.parsers.core.schemas import UnifiedParserSchema
 from tabulate import tabulate
@@ -26,6 +29,42 @@ async def SportscannerCrawlerBot(
     return await asyncio.gather(*coroutines)
 
 
+@dataclass
+class ProviderRunStats:
+    """One provider's share of a pipeline run, recorded in `crawl_runs.providers`."""
+    provider: str
+    requests: int
+    requests_with_data: int
+    slots: int
+    seconds: float
+    circuit_breaker_tripped: bool
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+_provider_stats: ContextVar[Optional[List[ProviderRunStats]]] = ContextVar("provider_stats", default=None)
+
+
+@contextmanager
+def collect_provider_stats() -> Iterator[List[ProviderRunStats]]:
+    """Collects a `ProviderRunStats` from every crawler that runs inside the block
+    (including inside `asyncio.run`, which copies the current context)."""
+    collected: List[ProviderRunStats] = []
+    token = _provider_stats.set(collected)
+    try:
+        yield collected
+    finally:
+        _provider_stats.reset(token)
+
+
+def record_provider_stats(stats: ProviderRunStats):
+    """Called by each crawler when it finishes; a no-op outside `collect_provider_stats`."""
+    collected = _provider_stats.get()
+    if collected is not None:
+        collected.append(stats)
+
+
 def override(func):
     """
     A simple decorator to mark methods as overriding a parent method.
@@ -2,6 +2,7 @@ import asyncio
 import itertools
 from abc import ABC, abstractmethod
 from datetime import date
+from time import perf_counter
 from typing import Any, Coroutine, List, Optional, Tuple
 
 import httpx
@@ -11,6 +12,7 @@ from sqlmodel import col, select
 import sportscanner.storage.postgres.database as db
 import sportscanner.storage.postgres.tables
 from sportscanner.crawlers.anonymize.proxies import httpxAsyncClient
+from sportscanner.crawlers.helpers import ProviderRunStats, record_provider_stats
 from sportscanner.crawlers.parsers.core.schemas import (
     RawResponseData,
     RequestDetailsWithMetadata,
@@ -21,6 +23,7 @@ from sportscanner.crawlers.parsers.utils import (
     formatted_date_list,
     validate_api_response,
 )
+from sportscanner.crawlers.spool import append_to_spool
 from sportscanner.logger import logging
 from sportscanner.utils import async_timer, timeit
 from sportscanner.variables import settings
@@ -118,6 +121,9 @@ class BaseCrawler(ABC):
         # BaseCrawler subclass instance is created per pipeline run, so this never
         # carries state across runs).
         self._circuit_breaker: Optional[_CircuitBreaker] = None
+        # (requests, requests_with_data, circuit_breaker_tripped) of the last
+        # _send_concurrent_requests run; stays None for providers with their own fetch loop.
+        self._request_counts: Optional[Tuple[int, int, bool]] = None
 
     # ------------------------------------------------------------------ hooks
     def _auth_token(self) -> Optional[str]:
@@ -330,6 +336,7 @@ class BaseCrawler(ABC):
                 logging.info(
                     f"{self.organisation_website}: {with_data}/{total} requests returned data"
                 )
+        self._request_counts = (total, with_data, breaker_tripped_at is not None)
         return flattened_responses
 
     def ScraperCoroutines(
@@ -342,6 +349,35 @@ class BaseCrawler(ABC):
         )
         return self._send_concurrent_requests(parameter_sets)
 
+    async def crawl_and_spool(
+            self, sports_venues: List[SportsVenue], dates: List[date]
+    ) -> List[UnifiedParserSchema]:
+        """Runs `ScraperCoroutines` (the shared fetch loop, or a provider's own override),
+        then records the provider's `ProviderRunStats` and appends its slots to the
+        active spool. Every entry point (`coroutines`, `crawl`, the scrapers' own
+        `coroutines` functions) goes through here, so no provider skips either step."""
+        started = perf_counter()
+        self._request_counts = None
+        slots = await self.ScraperCoroutines(sports_venues, dates)
+        if self._request_counts is not None:
+            requests, requests_with_data, breaker_tripped = self._request_counts
+        else:
+            # Providers with their own fetch loop don't report per-request outcomes,
+            # so count venue/dates crawled and venue/dates that came back with slots.
+            requests = len(sports_venues) * len(dates)
+            requests_with_data = len({(slot.composite_key, slot.date) for slot in slots})
+            breaker_tripped = False
+        record_provider_stats(ProviderRunStats(
+            provider=self.organisation_website,
+            requests=requests,
+            requests_with_data=requests_with_data,
+            slots=len(slots),
+            seconds=round(perf_counter() - started, 3),
+            circuit_breaker_tripped=breaker_tripped,
+        ))
+        append_to_spool(self.organisation_website, slots)
+        return slots
+
     def coroutines(
             self, search_dates: List[date], sport: str, delta: Optional[int] = 6
     ) -> Coroutine[Any, Any, List[UnifiedParserSchema]]:
@@ -363,14 +399,14 @@ class BaseCrawler(ABC):
                 f"No venues found for {self.organisation_website} / sport offering: {sport}"
             )
             return []
-        return self.ScraperCoroutines(sport_venues_to_crawl, allowable_search_dates)
+        return self.crawl_and_spool(sport_venues_to_crawl, allowable_search_dates)
 
     @timeit
     def crawl(self, sports_venues: List[SportsVenue], dates: List[date]) -> List[UnifiedParserSchema]:
         if not sports_venues or not dates:
             logging.warning("No items or dates to crawl.")
             return []
-        coroutines = self.ScraperCoroutines(sports_venues, dates)
+        coroutines = self.crawl_and_spool(sports_venues, dates)
         responses_from_all_sources: List[UnifiedParserSchema] = asyncio.run(coroutines)
         logging.debug(f"Unified parser schema mapped responses count: {len(responses_from_all_sources)}")
         return responses_from_all_sources
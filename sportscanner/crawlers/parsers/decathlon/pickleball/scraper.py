@@ -89,7 +89,7 @@ def coroutines(search_dates: List[date]):
     if not sport_venues_to_crawl:
         logging.warning("No venues found for this organisation / sports offerings")
         return []
-    return crawler.ScraperCoroutines(sport_venues_to_crawl, search_dates[0:1]) # Limiting to 1 day for coroutines
+    return crawler.crawl_and_spool(sport_venues_to_crawl, search_dates[0:1]) # Limiting to 1 day for coroutines
 
 
 if __name__ == "__main__":
@@ -95,7 +95,7 @@ def coroutines(search_dates: List[date]) -> Coroutine[Any, Any, List[UnifiedPars
             return []
 
         return _empty()
-    return crawler.ScraperCoroutines(venues, search_dates)
+    return crawler.crawl_and_spool(venues, search_dates)
 
 
 if __name__ == "__main__":
@@ -171,7 +171,7 @@ def coroutines(search_dates: List[date]):
     if not sport_venues_to_crawl:
         logging.warning("No venues found for this organisation / sports offerings")
         return []
-    return crawler.ScraperCoroutines(sport_venues_to_crawl, search_dates)
+    return crawler.crawl_and_spool(sport_venues_to_crawl, search_dates)
 
 
 if __name__ == "__main__":
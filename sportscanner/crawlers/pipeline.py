@@ -7,7 +7,8 @@ from typing import Any, List, Tuple, Union
 from sportscanner.logger import logging
 from rich import print
 
-from sportscanner.crawlers.helpers import SportscannerCrawlerBot
+from sportscanner.crawlers.helpers import SportscannerCrawlerBot, collect_provider_stats
+from sportscanner.crawlers.spool import RELOAD, UPSERT, crawl_spool, load_spool, spool_stage, spooled_slot_count
 from sportscanner.crawlers.parsers.core.schemas import UnifiedParserSchema
 
 from sportscanner.crawlers.parsers.better.badminton.scraper import coroutines as BetterLeisureBadmintonScraperCoroutines
@@ -33,63 +34,65 @@ from sportscanner.crawlers.parsers.playtomic.padel.scraper import coroutines as
 
 
 from sportscanner.storage.postgres.database import (
-insert_records_to_table, truncate_by_composite_key_and_reload, delete_past_slots
+insert_records_to_table, truncate_by_composite_key_and_reload, delete_past_slots, crawl_generation,
+sync_sports_venues, engine, pipeline_lock, start_crawl_run, finish_crawl_run, CrawlRunOutcome,
+record_provider_status
 )
+from sportscanner.storage.postgres.availability_bitmaps import rebuild_availability_bitmaps
 from sportscanner.storage.postgres.tables import BadmintonMasterTable, PickleballMasterTable, SquashMasterTable, PadelMasterTable
+from sportscanner.storage.snapshots import export_snapshot
 from sportscanner.utils import timeit
 from sportscanner.variables import settings
 
-
-def flatten_responses(responses_from_all_sources) -> List[UnifiedParserSchema]:
-    _validation_check: List[UnifiedParserSchema] = [
-        slot for response in responses_from_all_sources if response for slot in response
-    ]
-    if not all(isinstance(slot, UnifiedParserSchema) for slot in _validation_check):
-        raise TypeError(
-            "One or more elements in `_validation_check` are not of type: `UnifiedParserSchema`"
-        )
-    return _validation_check
+# Days ahead (including today) each sport's pipeline crawls. Search can't return
+# anything beyond it.
+CRAWL_HORIZON_DAYS = {
+    "badminton": 10,
+    "squash": 15,
+    "pickleball": 15,
+    "padel": 10,
+}
 
 
 @timeit
 def badminton_scraping_pipeline():
     logging.warning(f"Running data refresh for environment: `{settings.ENV}`")
     today = date.today()
-    dates = [today + timedelta(days=i) for i in range(10)]
+    dates = [today + timedelta(days=i) for i in range(CRAWL_HORIZON_DAYS["badminton"])]
     logging.info(f"Finding slots for dates: {dates}")
-    responses_for_upsertion: List[UnifiedParserSchema] = asyncio.run(
-        SportscannerCrawlerBot(
-            BetterLeisureBadmintonScraperCoroutines(dates),
-            ActiveLambethBadmintonScraperCoroutines(dates),
-            CitySportsBadmintonScraperCoroutines(dates),
-            EveryoneActiveBadmintonScraperCoroutines(dates),
-            SouthwarkLeisureBadmintonScraperCoroutines(dates),
-            HaringeyCouncilBadmintonScraperCoroutines(dates),
-            UELSportsDockBadmintonScraperCoroutines(dates),
-            PlacesLeisureBadmintonScraperCoroutines(dates)
+    with crawl_spool(BadmintonMasterTable.__tablename__) as spool:
+        asyncio.run(
+            SportscannerCrawlerBot(
+                BetterLeisureBadmintonScraperCoroutines(dates),
+                ActiveLambethBadmintonScraperCoroutines(dates),
+                CitySportsBadmintonScraperCoroutines(dates),
+                EveryoneActiveBadmintonScraperCoroutines(dates),
+                SouthwarkLeisureBadmintonScraperCoroutines(dates),
+                HaringeyCouncilBadmintonScraperCoroutines(dates),
+                UELSportsDockBadmintonScraperCoroutines(dates),
+                PlacesLeisureBadmintonScraperCoroutines(dates)
+            )
         )
-    )
-    responses_for_reload: List[UnifiedParserSchema] = asyncio.run(
-        SportscannerCrawlerBot(
-            TowerHamletsBadmintonScraperCoroutines(dates)
-        )
-    )
-    
-    # Flatten nested list structure and remove empty or failed responses
-    flattened_responses_for_upsertion: List[UnifiedParserSchema] = flatten_responses(responses_for_upsertion)
-    flattened_responses_for_reload: List[UnifiedParserSchema] = flatten_responses(responses_for_reload)
+        with spool_stage(RELOAD):
+            asyncio.run(
+                SportscannerCrawlerBot(
+                    TowerHamletsBadmintonScraperCoroutines(dates)
+                )
+            )
+
+    # What gets loaded is what the crawlers spooled, so decide on that.
+    spooled_for_upsertion = spooled_slot_count(spool, UPSERT)
+    spooled_for_reload = spooled_slot_count(spool, RELOAD)
 
     # Housekeeping: drop past-date rows so the table doesn't grow unbounded over time.
     delete_past_slots(BadmintonMasterTable)
 
-    if flattened_responses_for_upsertion or flattened_responses_for_reload:
-        logging.success(f"Total slots collected for Upsert: {len(flattened_responses_for_upsertion)}")
-        logging.success(f"Total slots collected for Reload: {len(flattened_responses_for_reload)}")
-        logging.info(f"Upserting all data to master table: {BadmintonMasterTable.__tablename__}")
-        insert_records_to_table(flattened_responses_for_upsertion, BadmintonMasterTable)
-        logging.info(f"Reloading all data to master table: {BadmintonMasterTable.__tablename__}")
-        truncate_by_composite_key_and_reload(flattened_responses_for_reload, BadmintonMasterTable)
-        return True
+    if spooled_for_upsertion or spooled_for_reload:
+        logging.success(f"Total slots collected for Upsert: {spooled_for_upsertion}")
+        logging.success(f"Total slots collected for Reload: {spooled_for_reload}")
+        # Upserts and reloads land in one generation, published together once both succeed.
+        logging.info(f"Loading spooled data to master table: {BadmintonMasterTable.__tablename__}")
+        return load_spool(spool)
     else:
         logging.warning(
             "No valid slots were found. Database update skipped (might be an issue)"
@@ -101,23 +104,22 @@ def badminton_scraping_pipeline():
 def squash_scraping_pipeline():
     logging.warning(f"Running data refresh for environment: `{settings.ENV}`")
     today = date.today()
-    dates = [today + timedelta(days=i) for i in range(15)]
+    dates = [today + timedelta(days=i) for i in range(CRAWL_HORIZON_DAYS["squash"])]
     logging.info(f"Finding slots for dates: {dates}")
-    responses_from_all_sources: List[UnifiedParserSchema] = asyncio.run(
-        SportscannerCrawlerBot(
-            BetterLeisureSquashScraperCoroutines(dates),
-            ActiveLambethSquashScraperCoroutines(dates),
+    with crawl_spool(SquashMasterTable.__tablename__) as spool:
+        asyncio.run(
+            SportscannerCrawlerBot(
+                BetterLeisureSquashScraperCoroutines(dates),
+                ActiveLambethSquashScraperCoroutines(dates),
+            )
         )
-    )
-    # Flatten nested list structure and remove empty or failed responses
-    all_slots: List[UnifiedParserSchema] = flatten_responses(responses_from_all_sources)
+    spooled = spooled_slot_count(spool)
     # Housekeeping: drop past-date rows so the table doesn't grow unbounded over time.
     delete_past_slots(SquashMasterTable)
-    if all_slots:
-        logging.success(f"Total slots collected: {len(all_slots)}")
-        logging.info(f"Upserting all data to master table: {SquashMasterTable.__tablename__}")
-        insert_records_to_table(all_slots, SquashMasterTable)
-        return True
+    if spooled:
+        logging.success(f"Total slots collected: {spooled}")
+        logging.info(f"Loading spooled data to master table: {SquashMasterTable.__tablename__}")
+        return load_spool(spool)
     else:
         logging.warning(
             "No valid slots were found. Database update skipped (might be an issue)"
@@ -129,25 +131,24 @@ def squash_scraping_pipeline():
 def pickleball_scraping_pipeline():
     logging.warning(f"Running data refresh for environment: `{settings.ENV}`")
     today = date.today()
-    dates = [today + timedelta(days=i) for i in range(15)]
+    dates = [today + timedelta(days=i) for i in range(CRAWL_HORIZON_DAYS["pickleball"])]
     logging.info(f"Finding slots for dates: {dates}")
-    responses_from_all_sources: List[UnifiedParserSchema] = asyncio.run(
-        SportscannerCrawlerBot(
-            BetterLeisurePickleballScraperCoroutines(dates),
-            SouthwarkLeisurePickleballScraperCoroutines(dates),
-            DecathlonPickleballScraperCoroutines(dates),
-            PlacesLeisurePickleballScraperCoroutines(dates)
+    with crawl_spool(PickleballMasterTable.__tablename__) as spool:
+        asyncio.run(
+            SportscannerCrawlerBot(
+                BetterLeisurePickleballScraperCoroutines(dates),
+                SouthwarkLeisurePickleballScraperCoroutines(dates),
+                DecathlonPickleballScraperCoroutines(dates),
+                PlacesLeisurePickleballScraperCoroutines(dates)
+            )
         )
-    )
-    # Flatten nested list structure and remove empty or failed responses
-    all_slots: List[UnifiedParserSchema] = flatten_responses(responses_from_all_sources)
+    spooled = spooled_slot_count(spool)
     # Housekeeping: drop past-date rows so the table doesn't grow unbounded over time.
     delete_past_slots(PickleballMasterTable)
-    if all_slots:
-        logging.success(f"Total slots collected: {len(all_slots)}")
-        logging.info(f"Upserting all data to master table: {PickleballMasterTable.__tablename__}")
-        insert_records_to_table(all_slots, PickleballMasterTable)
-        return True
+    if spooled:
+        logging.success(f"Total slots collected: {spooled}")
+        logging.info(f"Loading spooled data to master table: {PickleballMasterTable.__tablename__}")
+        return load_spool(spool)
     else:
         logging.warning(
             "No valid slots were found. Database update skipped (might be an issue)"
@@ -159,22 +160,22 @@ def pickleball_scraping_pipeline():
 def padel_scraping_pipeline():
     logging.warning(f"Running data refresh for environment: `{settings.ENV}`")
     today = date.today()
-    dates = [today + timedelta(days=i) for i in range(10)]
+    dates = [today + timedelta(days=i) for i in range(CRAWL_HORIZON_DAYS["padel"])]
     logging.info(f"Finding slots for dates: {dates}")
-    responses_from_all_sources: List[UnifiedParserSchema] = asyncio.run(
-        SportscannerCrawlerBot(
-            MatchiPadelScraperCoroutines(dates),
-            PlaytomicPadelScraperCoroutines(dates),
+    with crawl_spool(PadelMasterTable.__tablename__) as spool:
+        asyncio.run(
+            SportscannerCrawlerBot(
+                MatchiPadelScraperCoroutines(dates),
+                PlaytomicPadelScraperCoroutines(dates),
+            )
         )
-    )
-    all_slots: List[UnifiedParserSchema] = flatten_responses(responses_from_all_sources)
+    spooled = spooled_slot_count(spool)
     # Housekeeping: drop past-date rows so the table doesn't grow unbounded over time.
     delete_past_slots(PadelMasterTable)
-    if all_slots:
-        logging.success(f"Total slots collected: {len(all_slots)}")
-        logging.info(f"Upserting all data to master table: {PadelMasterTable.__tablename__}")
-        insert_records_to_table(all_slots, PadelMasterTable)
-        return True
+    if spooled:
+        logging.success(f"Total slots collected: {spooled}")
+        logging.info(f"Loading spooled data to master table: {PadelMasterTable.__tablename__}")
+        return load_spool(spool)
     else:
         logging.warning(
             "No valid padel slots were found. Database update skipped (might be an issue)"
@@ -182,6 +183,59 @@ def padel_scraping_pipeline():
         return False
 
 
+def run_pipeline(sport: str, pipeline, wait: bool = False):
+    """Runs one sport's pipeline under its cross-process lock and records it in
+    `crawl_runs` (outcome, duration, per-provider counts, and the `UpsertStats` of the
+    load; a pipeline returns those, or False if it had nothing to load). If another run for the sport
+    holds the lock, this one is recorded as skipped and returns None - or, with `wait`,
+    queues until the lock is free."""
+    with pipeline_lock(sport, wait=wait) as acquired:
+        if not acquired:
+            logging.warning(f"A {sport} pipeline run is already in progress; skipping this one")
+            start_crawl_run(sport, outcome=CrawlRunOutcome.SKIPPED)
+            return None
+        run_id = start_crawl_run(sport)
+        with collect_provider_stats() as providers:
+            try:
+                result = pipeline()
+            except BaseException as error:
+                finish_crawl_run(
+                    run_id, CrawlRunOutcome.FAILED, [p.to_dict() for p in providers], error=repr(error)
+                )
+                raise
+        finish_crawl_run(
+            run_id,
+            CrawlRunOutcome.SUCCEEDED if result else CrawlRunOutcome.EMPTY,
+            [p.to_dict() for p in providers],
+            upserts=result or None,
+        )
+        record_provider_status(sport, providers)
+        if result and settings.AVAILABILITY_BITMAPS:
+            rebuild_availability_bitmaps(_SPORT_TABLES[sport])
+        if result and settings.SNAPSHOT_PATH:
+            # Best-effort: the crawl is already published, a failed export shouldn't fail the run.
+            try:
+                export_snapshot(_SPORT_TABLES[sport])
+            except Exception as error:
+                logging.error(f"Parquet snapshot for {sport} failed: {error!r}")
+        return result
+
+
+_SPORT_TABLES = {
+    "badminton": BadmintonMasterTable,
+    "squash": SquashMasterTable,
+    "pickleball": PickleballMasterTable,
+    "padel": PadelMasterTable,
+}
+
+_PIPELINES = {
+    "badminton": badminton_scraping_pipeline,
+    "squash": squash_scraping_pipeline,
+    "pickleball": pickleball_scraping_pipeline,
+    "padel": padel_scraping_pipeline,
+}
+
+
 if __name__ == "__main__":
     """Gathers data from all sources/providers and loads to SQL database"""
 
@@ -192,23 +246,28 @@ if __name__ == "__main__":
         required=False,
         help="Which pipeline to run"
     )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Queue behind a run of the same sport that is already in progress, instead of skipping"
+    )
+    parser.add_argument(
+        "--sync-venues",
+        action="store_true",
+        help="Apply venues.json changes (see `make sync-venues`) before crawling"
+    )
     args = parser.parse_args()
 
-    if args.task == "badminton":
-        logging.info("Starting Badminton scraping pipeline...")
-        badminton_scraping_pipeline()
-    elif args.task == "squash":
-        logging.info("Starting Squash scraping pipeline...")
-        squash_scraping_pipeline()
-    elif args.task == "pickleball":
-        logging.info("Starting Pickleball scraping pipeline...")
-        pickleball_scraping_pipeline()
-    elif args.task == "padel":
-        logging.info("Starting Padel scraping pipeline...")
-        padel_scraping_pipeline()
+    # Crawlers read their venues from sportsvenue, so a venue only starts being
+    # crawled once venues.json has been synced. Removing venues waits for every
+    # sport's pipeline lock, so this runs before this process takes its own.
+    if args.sync_venues:
+        sync_sports_venues(engine)
+
+    if args.task in _PIPELINES:
+        logging.info(f"Starting {args.task.capitalize()} scraping pipeline...")
+        run_pipeline(args.task, _PIPELINES[args.task], wait=args.wait)
     else:
         logging.info("Starting ALL scraping pipelines...")
-        badminton_scraping_pipeline()
-        squash_scraping_pipeline()
-        pickleball_scraping_pipeline()
-        padel_scraping_pipeline()
+        for sport, pipeline in _PIPELINES.items():
+            run_pipeline(sport, pipeline, wait=args.wait)
@@ -0,0 +1,228 @@
+"""Local write-ahead spool for crawled slots.
+
+Crawling and loading used to be one step: a pipeline held every provider's parsed
+slots in memory and handed them to `insert_records_to_table` at the end, so if
+Postgres was slow or briefly unreachable then, the insert failed and the whole run's
+data was lost. Now each crawler appends what it parsed to a spool on local disk as
+soon as it finishes (`append_to_spool`, called by `BaseCrawler.crawl_and_spool`), and a separate
+loader stage streams the spool into Postgres with retries (`load_spool`). A spool
+stays on disk after loading, so a run can be loaded again later without re-crawling,
+under the sport's pipeline lock (`reload_spool`):
+
+    python sportscanner/crawlers/spool.py --load spool/badminton/20250101T093000
+
+Layout: one directory per run, `{CRAWL_SPOOL_DIR}/{sport}/{started}/`, holding one
+segment per write path ("upsert" via `insert_records_to_table`, "reload" via
+`truncate_by_composite_key_and_reload`) and provider, `{stage}/{provider}.jsonl.gz`.
+Segments are append-only gzip files of one `UnifiedParserSchema` JSON object per
+line; each append is a separate gzip member, so a crash mid-write loses at most that
+member, and earlier ones remain readable.
+"""
+import argparse
+import gzip
+import re
+import shutil
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+import sportscanner.storage.postgres.database as db
+from sportscanner.crawlers.parsers.core.schemas import UnifiedParserSchema
+from sportscanner.storage.postgres.availability_bitmaps import rebuild_availability_bitmaps
+from sportscanner.logger import logging
+from sportscanner.variables import settings
+
+UPSERT = "upsert"
+RELOAD = "reload"
+_RUN_FORMAT = "%Y%m%dT%H%M%S"
+
+# Connection-level failures are worth waiting out; anything else (a constraint
+# violation, bad data) would fail the same way again.
+LOAD_ATTEMPTS = 5
+
+
+@dataclass(frozen=True)
+class _SpoolTarget:
+    path: Path
+    stage: str
+
+
+_active_spool: ContextVar[Optional[_SpoolTarget]] = ContextVar("active_spool", default=None)
+
+
+def _segment_name(provider: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", provider.split("://")[-1]).strip("-") + ".jsonl.gz"
+
+
+def _prune_spools(root: Path, keep: timedelta):
+    cutoff = datetime.now() - keep
+    for run in root.glob("*/*"):
+        if run.is_dir() and datetime.fromtimestamp(run.stat().st_mtime) < cutoff:
+            shutil.rmtree(run, ignore_errors=True)
+
+
+@contextmanager
+def crawl_spool(sport: str) -> Iterator[Path]:
+    """Opens a new spool directory for one run of `sport`; every crawler that finishes
+    inside the block (including inside `asyncio.run`) appends to it, under the
+    "upsert" stage unless `spool_stage` says otherwise. Yields the spool's path.
+    Spools older than `CRAWL_SPOOL_RETENTION_DAYS` are removed first."""
+    root = Path(settings.CRAWL_SPOOL_DIR)
+    _prune_spools(root, timedelta(days=settings.CRAWL_SPOOL_RETENTION_DAYS))
+    path = root / sport / datetime.now().strftime(_RUN_FORMAT)
+    path.mkdir(parents=True, exist_ok=True)
+    token = _active_spool.set(_SpoolTarget(path, UPSERT))
+    try:
+        logging.info(f"Spooling {sport} crawl to {path}")
+        yield path
+    finally:
+        _active_spool.reset(token)
+
+
+@contextmanager
+def spool_stage(stage: str):
+    """Crawlers finishing inside the block spool under `stage` (UPSERT or RELOAD)."""
+    target = _active_spool.get()
+    if target is None:
+        yield
+        return
+    token = _active_spool.set(_SpoolTarget(target.path, stage))
+    try:
+        yield
+    finally:
+        _active_spool.reset(token)
+
+
+def append_to_spool(provider: str, slots: List[UnifiedParserSchema]):
+    """Appends one crawler's parsed slots to its segment of the active spool, as one
+    gzip member. A no-op outside `crawl_spool` or when there is nothing to write."""
+    target = _active_spool.get()
+    if target is None or not slots:
+        return
+    segment = target.path / target.stage / _segment_name(provider)
+    segment.parent.mkdir(exist_ok=True)
+    payload = "".join(slot.model_dump_json() + "\n" for slot in slots).encode()
+    with open(segment, "ab") as f:
+        f.write(gzip.compress(payload))
+
+
+def read_segment(segment: Path) -> Iterator[UnifiedParserSchema]:
+    """Streams a segment's slots. A truncated final member (a crash mid-append) ends
+    the stream with a warning rather than an error."""
+    with gzip.open(segment, "rt") as f:
+        try:
+            for line in f:
+                yield UnifiedParserSchema.model_validate_json(line)
+        except (EOFError, gzip.BadGzipFile):
+            logging.warning(f"{segment} ends in a truncated write; loading what precedes it")
+
+
+def spooled_slot_count(path: Path, stage: str = "*") -> int:
+    """Slots spooled in a run, optionally for one stage only. Counts lines rather than
+    parsing them; a truncated final member counts what precedes it, as `read_segment` does."""
+    count = 0
+    for segment in sorted(Path(path).glob(f"{stage}/*.jsonl.gz")):
+        with gzip.open(segment, "rt") as f:
+            try:
+                count += sum(1 for _ in f)
+            except (EOFError, gzip.BadGzipFile):
+                pass
+    return count
+
+
+def _table_for(path: Path):
+    sport = path.parent.name
+    for Table in db._SLOT_MODELS:
+        if Table.__tablename__ == sport:
+            return Table
+    raise ValueError(f"{path} is not under a sport's spool directory ({', '.join(db._SLOT_TABLES)})")
+
+
+@retry(
+    retry=retry_if_exception_type((OperationalError, InterfaceError)),
+    stop=stop_after_attempt(LOAD_ATTEMPTS),
+    wait=wait_exponential(multiplier=2, max=60),
+    before_sleep=lambda state: logging.warning(
+        f"Loading spool failed ({state.outcome.exception()!r}); attempt {state.attempt_number} of {LOAD_ATTEMPTS}"
+    ),
+    reraise=True,
+)
+def load_spool(path: Path) -> db.UpsertStats:
+    """Loads a run's spool into its sport's table as one crawl generation, one segment
+    (provider) at a time so only one provider's slots are in memory at once. If the
+    database drops out part-way, the generation is discarded and the whole load is
+    retried. Returns the run's `UpsertStats`, summed over its segments."""
+    path = Path(path)
+    TableForLoading = _table_for(path)
+    totals = db.UpsertStats()
+    with db.crawl_generation(TableForLoading) as generation:
+        for segment in sorted((path / UPSERT).glob("*.jsonl.gz")):
+            stats = db.insert_records_to_table(list(read_segment(segment)), TableForLoading, generation)
+            if stats is not None:
+                totals.add(stats)
+        for segment in sorted((path / RELOAD).glob("*.jsonl.gz")):
+            slots = list(read_segment(segment))
+            db.truncate_by_composite_key_and_reload(slots, TableForLoading, generation)
+            totals.reloaded += len(slots)
+    logging.success(
+        f"Loaded spool {path} into {TableForLoading.__tablename__}: "
+        f"{totals.inserted} inserted, {totals.changed} changed, {totals.unchanged} unchanged, "
+        f"{totals.stale} stale, {totals.reloaded} reloaded"
+    )
+    return totals
+
+
+def reload_spool(path: Path, force: bool = False) -> db.UpsertStats:
+    """Loads a spool by hand the way `run_pipeline` loads a fresh one: under the sport's
+    pipeline lock, queuing behind a run in progress (whose unpublished generation
+    `crawl_generation` would otherwise discard), and recorded in `crawl_runs`.
+
+    A spool crawled before the sport's latest successful run is refused unless `force`:
+    loading it would overwrite newer data and mark slots added since as stale."""
+    path = Path(path)
+    TableForLoading = _table_for(path)
+    sport = TableForLoading.__tablename__
+    crawled_at = datetime.strptime(path.name, _RUN_FORMAT)
+    with db.pipeline_lock(sport, wait=True):
+        latest = db.latest_successful_crawl_run(sport)
+        if latest is not None and crawled_at < latest and not force:
+            raise ValueError(
+                f"{path} was crawled before the latest successful {sport} run ({latest:%Y-%m-%d %H:%M:%S}); "
+                f"pass --force to load it anyway"
+            )
+        run_id = db.start_crawl_run(sport)
+        try:
+            stats = load_spool(path)
+        except BaseException as error:
+            db.finish_crawl_run(run_id, db.CrawlRunOutcome.FAILED, error=repr(error))
+            raise
+        db.finish_crawl_run(run_id, db.CrawlRunOutcome.SUCCEEDED, upserts=stats)
+        if settings.AVAILABILITY_BITMAPS:
+            rebuild_availability_bitmaps(TableForLoading)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or (re-)load crawl spools")
+    parser.add_argument("--load", type=Path, help="Spool directory of one run to load into the database")
+    parser.add_argument("--list", action="store_true", help="List spooled runs and their slot counts")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Load a spool even if it was crawled before the sport's latest successful run",
+    )
+    args = parser.parse_args()
+
+    if args.load:
+        reload_spool(args.load, force=args.force)
+    elif args.list:
+        for run in sorted(Path(settings.CRAWL_SPOOL_DIR).glob("*/*")):
+            logging.info(f"{run}: {spooled_slot_count(run)} slots")
+    else:
+        parser.print_help()
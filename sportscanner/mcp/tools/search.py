@@ -9,8 +9,8 @@ from pydantic import Field
 import sportscanner.storage.postgres.database as db
 from sportscanner.api.routers.venues.utils import get_sports_venues_within_radius
 from sportscanner.storage.postgres.dataset_transform import (
-    group_slots_by_attributes,
-    sort_and_format_grouped_slots_for_ui,
+    format_search_rows_for_ui,
+    search_documents_query,
 )
 from sportscanner.storage.postgres.tables import (
     BadmintonMasterTable,
@@ -18,6 +18,7 @@ from sportscanner.storage.postgres.tables import (
     PickleballMasterTable,
     SquashMasterTable,
 )
+from sportscanner.storage.postgres.venue_registry import venue_registry
 
 _TABLES = {
     "badminton": BadmintonMasterTable,
@@ -83,18 +84,8 @@ def find_available_courts(
     distance_reference = {
         item["venue"].composite_key: item["distance"] for item in nearby
     }
-    composite_keys = list(distance_reference.keys())
 
-    now = datetime.now()
-    slots = db.get_all_rows(
-        db.engine,
-        None,
-        db.select(query_table)
-        .where(query_table.composite_key.in_(composite_keys))
-        .where(query_table.spaces > 0)
-        .where(query_table.date == search_date),
+    rows = db.fetch_rows(
+        db.engine, search_documents_query(sport_key, distance_reference, search_date)
     )
-    grouped_slots = group_slots_by_attributes(
-        slots, attributes=("composite_key", "date")
-    )
-    return sort_and_format_grouped_slots_for_ui(grouped_slots, distance_reference)
+    return format_search_rows_for_ui(rows, venue_registry().lookup)
@@ -0,0 +1,37 @@
+"""In-process single-flight coalescing of identical concurrent work.
+
+A burst of identical requests (a popular postcode and date right after a push
+notification) used to geocode, resolve venues and query Postgres once per request,
+all of them missing the cache at the same moment. `single_flight(key, compute)` runs
+`compute` once per key at a time: callers arriving while it is in flight await the
+same result (or exception) instead of starting their own.
+
+The computation runs as its own task, so a caller that disconnects mid-flight does
+not cancel it for the others. Nothing is kept once it finishes; remembering results
+is the caches' job. Coalescing is per process (per event loop); across workers and
+instances the shared Valkey caches do the rest.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+_in_flight: Dict[str, "asyncio.Task"] = {}
+
+
+def _finished(key: str, task: "asyncio.Task"):
+    if _in_flight.get(key) is task:
+        del _in_flight[key]
+    # Mark the outcome as retrieved even if every caller has gone away meanwhile
+    if not task.cancelled():
+        task.exception()
+
+
+async def single_flight(key: str, compute: Callable[[], Awaitable[T]]) -> T:
+    """The result of `compute()`, shared with every concurrent caller using `key`."""
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(compute())
+        _in_flight[key] = task
+        task.add_done_callback(lambda finished: _finished(key, finished))
+    return await asyncio.shield(task)
@@ -0,0 +1,31 @@
+"""Uploads to the project's Cloud Storage bucket, through the same Firebase Admin app
+(and service-account credentials) as the Firestore repositories.
+
+Optional: only used when `settings.SNAPSHOT_BUCKET` is set.
+"""
+from pathlib import Path
+
+from firebase_admin import credentials, get_app, initialize_app, storage
+
+from sportscanner.logger import logging
+from sportscanner.variables import settings
+
+
+def _bucket(name: str):
+    try:
+        get_app()
+    except ValueError:
+        cred = credentials.Certificate(settings.CLOUD_FIRESTORE_CREDENTIALS_PATH)
+        initialize_app(cred, {"projectId": settings.CLOUD_FIRESTORE_PROJECT_ID})
+    return storage.bucket(name)
+
+
+def upload_files(bucket_name: str, root: Path, files) -> int:
+    """Uploads each of `files` (paths under `root`) to `bucket_name`, keyed by its
+    path relative to `root`. Returns the number of files uploaded."""
+    bucket = _bucket(bucket_name)
+    for file in files:
+        key = Path(file).relative_to(root).as_posix()
+        bucket.blob(key).upload_from_filename(str(file))
+    logging.info(f"Uploaded {len(files)} files to gs://{bucket_name}")
+    return len(files)
@@ -5,21 +5,56 @@ Tokens are used both for the (future) public REST API and, today, to
 authenticate the Sportscanner MCP server. A token belongs to exactly one
 Kinde user account. We store only a SHA-256 hash of the token — the raw
 value is returned to the caller once at creation time and never again.
+
+The MCP server authenticates every JSON-RPC call, so `authenticate` is hot:
+- verified tokens are cached in-process by hash for `API_TOKEN_CACHE_SECONDS`
+  (at most `API_TOKEN_CACHE_ENTRIES` of them). The cache is per process: revoking a
+  token drops it from the revoking process's cache immediately, but every other
+  worker keeps accepting it until its own entry expires, i.e. for up to the TTL.
+  Unknown tokens are never cached.
+- `last_used_at` is buffered and written for all tokens used since the last flush
+  in one UPDATE, at most every `API_TOKEN_LAST_USED_FLUSH_SECONDS`, rather than
+  committed on every call. `flush_last_used` writes out what is pending; the API
+  calls it on that interval from a lifespan task, so a buffered use is at most that
+  stale, and once more on shutdown. A crash loses at most one interval of uses.
+Setting either to 0 restores the uncached / write-every-call behaviour.
 """
 
 import hashlib
 import secrets
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Tuple
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import bindparam, update
 from sqlmodel import Session, select
 
+from sportscanner.logger import logging
 from sportscanner.storage.postgres.tables import ApiToken
+from sportscanner.variables import settings
 
 TOKEN_PREFIX = "ssc_"
 
 
+@dataclass(frozen=True)
+class _VerifiedToken:
+    token_id: str
+    kinde_user_id: str
+    expires_at: Optional[datetime]
+    # monotonic() time this entry must be re-verified by
+    cached_until: float
+
+
+# token hash -> verified token
+_verified: "OrderedDict[str, _VerifiedToken]" = OrderedDict()
+# token id -> most recent use not yet written
+_pending_last_used: Dict[str, datetime] = {}
+_flushed_at = 0.0
+
+
 def _hash_token(raw: str) -> str:
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
@@ -31,6 +66,31 @@ def _strip_bearer(value: str) -> str:
     return value
 
 
+def _cached_token(token_hash: str) -> Optional[_VerifiedToken]:
+    token = _verified.get(token_hash)
+    if token is None:
+        return None
+    if token.cached_until <= monotonic():
+        del _verified[token_hash]
+        return None
+    _verified.move_to_end(token_hash)
+    return token
+
+
+def _cache_token(token_hash: str, token: ApiToken):
+    if settings.API_TOKEN_CACHE_SECONDS <= 0:
+        return
+    _verified[token_hash] = _VerifiedToken(
+        token_id=token.id,
+        kinde_user_id=token.kinde_user_id,
+        expires_at=token.expires_at,
+        cached_until=monotonic() + settings.API_TOKEN_CACHE_SECONDS,
+    )
+    _verified.move_to_end(token_hash)
+    while len(_verified) > settings.API_TOKEN_CACHE_ENTRIES:
+        _verified.popitem(last=False)
+
+
 class ApiTokenRepository:
     def __init__(self, engine):
         self.engine = engine
@@ -64,7 +124,12 @@ class ApiTokenRepository:
                 .where(ApiToken.kinde_user_id == kinde_user_id)
                 .order_by(ApiToken.created_at.desc())
             )
-            return list(session.exec(statement))
+            tokens = list(session.exec(statement))
+        # Uses not flushed yet are newer than what is stored.
+        for token in tokens:
+            if token.id in _pending_last_used:
+                token.last_used_at = _pending_last_used[token.id]
+        return tokens
 
     def revoke(self, kinde_user_id: str, token_id: str) -> bool:
         """Revoke a token the user owns. Returns False if not found/owned."""
@@ -75,13 +140,46 @@ class ApiTokenRepository:
             token.revoked = True
             session.add(token)
             session.commit()
+            _verified.pop(token.token_hash, None)
             return True
 
+    def flush_last_used(self) -> int:
+        """Writes every buffered `last_used_at` in one transaction. Returns the number
+        of tokens updated; on failure the uses stay buffered for the next flush."""
+        global _flushed_at
+        _flushed_at = monotonic()
+        if not _pending_last_used:
+            return 0
+        batch = dict(_pending_last_used)
+        _pending_last_used.clear()
+        statement = (
+            update(ApiToken.__table__)
+            .where(ApiToken.__table__.c.id == bindparam("b_id"))
+            .values(last_used_at=bindparam("b_used_at"))
+        )
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    statement,
+                    [{"b_id": token_id, "b_used_at": used_at} for token_id, used_at in batch.items()],
+                )
+        except Exception as exc:
+            logging.warning(f"Failed to flush last_used_at for {len(batch)} API tokens: {exc}")
+            for token_id, used_at in batch.items():
+                _pending_last_used.setdefault(token_id, used_at)
+            return 0
+        return len(batch)
+
+    def _record_use(self, token_id: str):
+        _pending_last_used[token_id] = datetime.utcnow()
+        if monotonic() - _flushed_at >= settings.API_TOKEN_LAST_USED_FLUSH_SECONDS:
+            self.flush_last_used()
+
     def authenticate(self, raw_authorization: Optional[str]) -> Optional[str]:
         """
         Resolve a raw token (optionally 'Bearer '-prefixed) to a kinde_user_id.
         Returns None when the token is missing, unknown, revoked or expired.
-        Updates last_used_at on success.
+        Records last_used_at on success (buffered, see the module docstring).
         """
         if not raw_authorization:
             return None
@@ -89,15 +187,19 @@ class ApiTokenRepository:
         if not raw:
             return None
         token_hash = _hash_token(raw)
-        with Session(self.engine) as session:
-            token = session.exec(
-                select(ApiToken).where(ApiToken.token_hash == token_hash)
-            ).first()
-            if not token or token.revoked:
-                return None
-            if token.expires_at and token.expires_at < datetime.utcnow():
-                return None
-            token.last_used_at = datetime.utcnow()
-            session.add(token)
-            session.commit()
-            return token.kinde_user_id
+        cached = _cached_token(token_hash)
+        if cached is not None:
+            token_id, kinde_user_id, expires_at = cached.token_id, cached.kinde_user_id, cached.expires_at
+        else:
+            with Session(self.engine) as session:
+                token = session.exec(
+                    select(ApiToken).where(ApiToken.token_hash == token_hash)
+                ).first()
+                if not token or token.revoked:
+                    return None
+                _cache_token(token_hash, token)
+                token_id, kinde_user_id, expires_at = token.id, token.kinde_user_id, token.expires_at
+        if expires_at and expires_at < datetime.utcnow():
+            return None
+        self._record_use(token_id)
+        return kinde_user_id
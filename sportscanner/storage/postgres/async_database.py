@@ -0,0 +1,103 @@
+"""Async engine/session layer for the API process.
+
+`database.engine` is a synchronous psycopg2 engine: every query made through it
+from an `async def` FastAPI handler blocks the worker's event loop for the full
+DB round trip, so one slow search stalls every other in-flight request on that
+worker. Hot read paths in the API go through this module instead, which runs the
+same SQLAlchemy/SQLModel statements over asyncpg.
+
+The engine is created lazily on first use, so processes that never touch it (the
+crawler pipeline) neither open its pool nor need asyncpg importable.
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from sportscanner.logger import logging
+from sportscanner.variables import settings
+
+_async_engine: Optional[AsyncEngine] = None
+
+
+def _asyncpg_url_and_connect_args(connection_string: str):
+    """DB_CONNECTION_STRING is a libpq-style URL (`postgresql://...?sslmode=require`).
+    asyncpg doesn't understand `sslmode` as a query parameter - it takes the same
+    values via its `ssl` connect argument instead - so move it across."""
+    url = make_url(connection_string)
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    url = url.set(drivername="postgresql+asyncpg", query=query)
+    connect_args = {"ssl": sslmode} if sslmode else {}
+    return url, connect_args
+
+
+def get_async_engine() -> AsyncEngine:
+    """Process-wide async engine, created on first use.
+
+    Sized together with the sync engine (see `database._sync_pool_limits`): Aiven
+    caps the whole instance at 17 usable connections, shared by every API worker and
+    the crawler pipeline, so this pool is a fixed `ASYNC_DB_POOL_SIZE` with no
+    overflow, taken out of the process's `DB_PROCESS_CONNECTIONS`. Requests beyond it
+    queue for a connection (up to `pool_timeout`) instead of opening more.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url, connect_args = _asyncpg_url_and_connect_args(settings.DB_CONNECTION_STRING)
+        _async_engine = create_async_engine(
+            url,
+            connect_args=connect_args,
+            pool_pre_ping=True,
+            pool_size=settings.ASYNC_DB_POOL_SIZE,
+            max_overflow=0,
+            pool_recycle=300,
+            pool_timeout=10,
+            echo=False,
+        )
+        logging.info(f"Async database engine created (pool_size={settings.ASYNC_DB_POOL_SIZE})")
+    return _async_engine
+
+
+def async_session() -> AsyncSession:
+    """New AsyncSession on the shared async engine. Use as `async with async_session() as session:`.
+
+    `expire_on_commit=False` because an expired attribute can't be lazily reloaded
+    outside the session's greenlet - objects returned from a handler after commit
+    must keep their loaded values."""
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+
+async def get_all_rows_async(expression, params: Optional[dict] = None) -> List[Any]:
+    """Async counterpart of `database.get_all_rows`: returns all rows for a select()
+    (ORM objects for `select(Table)`, rows for selected columns or a text() clause)."""
+    async with async_session() as session:
+        result = await session.exec(expression, params=params)
+        return result.all()
+
+
+async def fetch_rows_async(expression, params: Optional[dict] = None) -> List[Row]:
+    """Async counterpart of `database.fetch_rows`: named-tuple rows for a
+    column-projected select()/text() clause, with no ORM hydration."""
+    async with get_async_engine().connect() as conn:
+        result = await conn.execute(expression, params)
+        return result.all()
+
+
+async def fetch_columns_async(expression, params: Optional[dict] = None) -> Dict[str, list]:
+    """Async counterpart of `database.fetch_columns`."""
+    async with get_async_engine().connect() as conn:
+        result = await conn.execute(expression, params)
+        keys = list(result.keys())
+        rows = result.all()
+    return {key: [row[i] for row in rows] for i, key in enumerate(keys)}
+
+
+async def stream_rows_async(expression, params: Optional[dict] = None, batch_size: int = 1000) -> AsyncIterator[Row]:
+    """Async counterpart of `database.stream_rows` (server-side cursor)."""
+    async with get_async_engine().connect() as conn:
+        result = await conn.stream(expression, params)
+        async for partition in result.partitions(batch_size):
+            for row in partition:
+                yield row
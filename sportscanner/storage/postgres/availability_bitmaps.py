@@ -0,0 +1,230 @@
+"""Bitmap-encoded daily availability: an optional compact alternative to row-per-slot.
+
+A venue/day of 40- and 60-minute badminton sessions is dozens of slot rows, each
+repeating composite_key, date, category and booking_url. `AvailabilityBitmap` stores
+one row per (sport, venue, date, session length) instead: bit i of `starts` is set
+when a session of that length starting at bucket i (`BUCKET_MINUTES` into the day)
+has spaces, and each set bit has a one-byte index into `price_bands`, the distinct
+prices of that day's sessions in pence.
+
+Built from a sport's published slot rows by `rebuild_availability_bitmaps` (after
+each crawl when `settings.AVAILABILITY_BITMAPS` is on, or from the CLI below); the
+slot tables remain the source of truth. Not carried over: categories (sessions of
+the same length are merged, so a start is free if any court category is), spaces
+counts and booking URLs.
+
+Usage:
+    python sportscanner/storage/postgres/availability_bitmaps.py --sport badminton
+"""
+import argparse
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import sqlalchemy
+import sqlmodel
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+import sportscanner.storage.postgres.database as db
+from sportscanner.logger import logging
+from sportscanner.storage.postgres.tables import AvailabilityBitmap
+
+BUCKET_MINUTES = 5
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+
+# `band_index` value for a session whose price has no numeric part ("Check website").
+UNKNOWN_PRICE_BAND = 255
+
+_PRICE_PATTERN = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+
+_BATCH_COLUMNS = ("composite_key", "date", "minutes")
+
+# (sport, composite_key, date, minutes)
+BitmapKey = Tuple[str, str, date, int]
+
+
+@dataclass
+class DayBitmap:
+    """One `AvailabilityBitmap` row's payload."""
+    starts: str  # BUCKETS_PER_DAY '0'/'1' characters, as Postgres returns bit(n)
+    price_bands: List[int]  # pence, ascending
+    band_index: bytes  # one band per set bit of `starts`, in bit order
+
+
+def to_bucket(t: time) -> int:
+    return (t.hour * 60 + t.minute) // BUCKET_MINUTES
+
+
+def from_bucket(bucket: int) -> time:
+    minutes = bucket * BUCKET_MINUTES
+    return time(minutes // 60, minutes % 60)
+
+
+def session_minutes(starting_time: time, ending_time: time) -> int:
+    minutes = (ending_time.hour * 60 + ending_time.minute) - (starting_time.hour * 60 + starting_time.minute)
+    return minutes if minutes > 0 else minutes + 24 * 60
+
+
+def price_in_pence(price: str) -> Optional[int]:
+    match = _PRICE_PATTERN.search(price or "")
+    return round(float(match.group()) * 100) if match else None
+
+
+def _cheaper(pence: Optional[int], than: Optional[int]) -> bool:
+    return pence is not None and (than is None or pence < than)
+
+
+def encode_day(sessions: Iterable[Tuple[time, Optional[int]]]) -> DayBitmap:
+    """Encodes one (venue, date, length)'s bookable sessions, given as (starting_time,
+    price in pence or None). Starts on the same bucket keep the cheaper price."""
+    cheapest: Dict[int, Optional[int]] = {}
+    for starting_time, pence in sessions:
+        bucket = to_bucket(starting_time)
+        if bucket not in cheapest or _cheaper(pence, cheapest[bucket]):
+            cheapest[bucket] = pence
+    bands = sorted({pence for pence in cheapest.values() if pence is not None})
+    if len(bands) >= UNKNOWN_PRICE_BAND:
+        raise ValueError(f"{len(bands)} distinct prices in one day; at most {UNKNOWN_PRICE_BAND - 1} fit a band index")
+    band_of = {pence: i for i, pence in enumerate(bands)}
+    bits = ["0"] * BUCKETS_PER_DAY
+    for bucket in cheapest:
+        bits[bucket] = "1"
+    band_index = bytes(
+        UNKNOWN_PRICE_BAND if cheapest[bucket] is None else band_of[cheapest[bucket]]
+        for bucket in sorted(cheapest)
+    )
+    return DayBitmap(starts="".join(bits), price_bands=bands, band_index=band_index)
+
+
+def decode_day(bitmap: DayBitmap, minutes: int) -> List[Tuple[time, time, Optional[int]]]:
+    """(starting_time, ending_time, price in pence or None) for every set bit."""
+    sessions = []
+    set_bits = [bucket for bucket, bit in enumerate(bitmap.starts) if bit == "1"]
+    for bucket, band in zip(set_bits, bitmap.band_index):
+        ending = from_bucket((bucket + minutes // BUCKET_MINUTES) % BUCKETS_PER_DAY)
+        pence = None if band == UNKNOWN_PRICE_BAND else bitmap.price_bands[band]
+        sessions.append((from_bucket(bucket), ending, pence))
+    return sessions
+
+
+def free_between(bitmap: DayBitmap, minutes: int, starting: time, ending: time) -> bool:
+    """Any session of `minutes` that starts at or after `starting` and ends by `ending`."""
+    first = to_bucket(starting)
+    last = to_bucket(ending) - minutes // BUCKET_MINUTES
+    return last >= first and "1" in bitmap.starts[first:last + 1]
+
+
+def free_between_clause(starting: time, ending: time, alias: str = "availability_bitmap"):
+    """where() clause: `free_between` evaluated in SQL on each row of `alias`, using the
+    row's own session length, so one query covers every length at once."""
+    return text(
+        f"position(B'1' IN substring({alias}.starts FROM :first_bucket + 1 "
+        f"FOR greatest(:last_bucket - {alias}.minutes / {BUCKET_MINUTES} - :first_bucket + 1, 0))) > 0"
+    ).bindparams(first_bucket=to_bucket(starting), last_bucket=to_bucket(ending))
+
+
+def free_between_query(sport: str, composite_keys: List[str], search_date: date, starting: time, ending: time):
+    """Venues/session lengths in `composite_keys` with any bookable session inside
+    [starting, ending] on `search_date`."""
+    return (
+        db.select(
+            AvailabilityBitmap.composite_key,
+            AvailabilityBitmap.minutes,
+            AvailabilityBitmap.starts,
+            AvailabilityBitmap.price_bands,
+            AvailabilityBitmap.band_index,
+        )
+        .where(AvailabilityBitmap.sport == sport)
+        .where(AvailabilityBitmap.composite_key.in_(composite_keys))
+        .where(AvailabilityBitmap.date == search_date)
+        .where(free_between_clause(starting, ending))
+    )
+
+
+def encode_slots(sport: str, slots) -> Dict[BitmapKey, DayBitmap]:
+    """Bitmaps for every (venue, date, session length) with bookable sessions among
+    `slots` (anything with composite_key, date, starting_time, ending_time, price and
+    spaces). Sessions that don't start on a bucket boundary can't be represented and
+    are skipped with a warning."""
+    sessions: Dict[BitmapKey, list] = defaultdict(list)
+    unaligned = 0
+    for slot in slots:
+        if slot.spaces <= 0:
+            continue
+        if slot.starting_time.minute % BUCKET_MINUTES or slot.starting_time.second:
+            unaligned += 1
+            continue
+        key = (sport, slot.composite_key, slot.date, session_minutes(slot.starting_time, slot.ending_time))
+        sessions[key].append((slot.starting_time, price_in_pence(slot.price)))
+    if unaligned:
+        logging.warning(f"{unaligned} {sport} slots not on a {BUCKET_MINUTES}-minute boundary left out of bitmaps")
+    return {key: encode_day(day) for key, day in sessions.items()}
+
+
+def rebuild_availability_bitmaps(TableForLoading: sqlmodel.main.SQLModelMetaclass) -> int:
+    """Replaces a sport's `availability_bitmap` rows with an encoding of its published
+    slots, in one transaction: changed rows are upserted and rows with no bookable
+    sessions left are deleted. Returns the number of bitmaps the sport now has."""
+    sport = TableForLoading.__tablename__
+    rows = db.fetch_rows(db.engine, (
+        db.select(
+            TableForLoading.composite_key, TableForLoading.date, TableForLoading.starting_time,
+            TableForLoading.ending_time, TableForLoading.price, TableForLoading.spaces,
+        )
+        .where(TableForLoading.spaces > 0)
+        .where(db.in_published_generation(TableForLoading))
+    ))
+    bitmaps = encode_slots(sport, rows)
+    values = [
+        dict(sport=sport, composite_key=composite_key, date=slot_date, minutes=minutes,
+             starts=bitmap.starts, price_bands=bitmap.price_bands, band_index=bitmap.band_index)
+        for (_, composite_key, slot_date, minutes), bitmap in bitmaps.items()
+    ]
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TEMP TABLE bitmap_batch ON COMMIT DROP AS "
+            f"SELECT {', '.join(_BATCH_COLUMNS)} FROM public.availability_bitmap WITH NO DATA"
+        ))
+        if values:
+            conn.execute(
+                insert(sqlalchemy.table("bitmap_batch", *[sqlalchemy.column(c) for c in _BATCH_COLUMNS])),
+                [{c: row[c] for c in _BATCH_COLUMNS} for row in values],
+            )
+            statement = insert(AvailabilityBitmap)
+            conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["sport", "composite_key", "date", "minutes"],
+                    set_={c: statement.excluded[c] for c in ("starts", "price_bands", "band_index")},
+                    where=text(
+                        "(availability_bitmap.starts, availability_bitmap.price_bands, availability_bitmap.band_index) "
+                        "IS DISTINCT FROM (excluded.starts, excluded.price_bands, excluded.band_index)"
+                    ),
+                ),
+                values,
+            )
+        removed = conn.execute(text('''
+            DELETE FROM public.availability_bitmap a
+            WHERE a.sport = :sport AND NOT EXISTS (
+                SELECT 1 FROM bitmap_batch b
+                WHERE b.composite_key = a.composite_key AND b.date = a.date AND b.minutes = a.minutes
+            )
+        ''').bindparams(sport=sport))
+    logging.success(
+        f"Rebuilt {len(values)} {sport} availability bitmaps from {len(rows)} bookable slots "
+        f"({removed.rowcount} emptied bitmaps removed)"
+    )
+    return len(values)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild bitmap-encoded availability from the slot tables")
+    parser.add_argument("--sport", choices=db._SLOT_TABLES, nargs="+", default=list(db._SLOT_TABLES))
+    args = parser.parse_args()
+
+    db.create_db_and_tables(db.engine)
+    for Table in db._SLOT_MODELS:
+        if Table.__tablename__ in args.sport:
+            rebuild_availability_bitmaps(Table)
@@ -1,13 +1,17 @@
-import uuid
+import argparse
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
 from enum import Enum
+from typing import Dict, Iterator
 
+import sqlalchemy
 import sqlmodel
 from sportscanner.logger import logging
-from sqlalchemy import Engine, text, func, update
+from sqlalchemy import Engine, and_, or_, text, func, update
 from sqlalchemy.dialects.postgresql import insert
-import hashlib
 
 import sportscanner.storage.postgres.tables
+from sportscanner.cache import cache_set_json
 from sportscanner.schemas import SportsVenueMappingModel
 from sportscanner.storage.postgres.utils import *
 from sportscanner.storage.postgres.tables import *
@@ -17,13 +21,34 @@ from sportscanner.variables import settings
 connection_string = settings.DB_CONNECTION_STRING
 
 engine_configs = {"timeout": 5}
-# Aiven max_connections is 20 (3 reserved for SUPERUSER). Cap each process
-# at 5 total so multiple workers + the crawler pipeline can coexist.
+
+
+def _sync_pool_limits():
+    """(pool_size, max_overflow) for the sync engine.
+
+    Aiven max_connections is 20 (3 reserved for SUPERUSER). Each process is capped at
+    `DB_PROCESS_CONNECTIONS` (5) in total so multiple workers + the crawler pipeline
+    can coexist. API processes also run the async engine, so the sync engine only
+    gets what its `ASYNC_DB_POOL_SIZE` pool leaves (3 + 2 by default, 1 + 1 in the API).
+    """
+    budget = settings.DB_PROCESS_CONNECTIONS
+    if settings.DB_API_PROCESS:
+        budget -= settings.ASYNC_DB_POOL_SIZE
+    if budget < 1:
+        raise ValueError(
+            f"ASYNC_DB_POOL_SIZE={settings.ASYNC_DB_POOL_SIZE} leaves no sync connections "
+            f"within DB_PROCESS_CONNECTIONS={settings.DB_PROCESS_CONNECTIONS}"
+        )
+    pool_size = max(1, budget - 2)
+    return pool_size, budget - pool_size
+
+
+_pool_size, _max_overflow = _sync_pool_limits()
 engine = create_engine(
     connection_string,
     pool_pre_ping=True,
-    pool_size=3,
-    max_overflow=2,
+    pool_size=_pool_size,
+    max_overflow=_max_overflow,
     pool_recycle=300,
     pool_timeout=10,
     echo=False,
@@ -36,6 +61,107 @@ class PipelineRefreshStatus(Enum):
     OBSOLETE = "Obsolete"
 
 
+class CrawlRunOutcome(Enum):
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    EMPTY = "empty"  # ran, but no provider returned slots; nothing written
+    FAILED = "failed"
+    SKIPPED = "skipped"  # another run for the sport held the pipeline lock
+
+
+@contextmanager
+def pipeline_lock(sport: str, wait: bool = False) -> Iterator[bool]:
+    """Cross-process lock on one sport's pipeline, via a Postgres session-level
+    advisory lock. Yields whether it was acquired.
+
+    Overlapping runs for the same sport (two workflow dispatches, a manual run during
+    a scheduled one) double the load on providers and race each other's writes.
+    Without `wait`, a second run gets `False` straight away and should skip; with it,
+    it queues until the first run releases the lock. The lock lives on a dedicated
+    connection held for the block and is released when the block exits - or by the
+    server if the process dies, since the connection goes with it.
+    """
+    with engine.connect() as conn:
+        key = f"sportscanner.pipeline.{sport}"
+        if wait:
+            conn.execute(text("SELECT pg_advisory_lock(hashtextextended(:key, 0))").bindparams(key=key))
+            acquired = True
+        else:
+            acquired = conn.execute(
+                text("SELECT pg_try_advisory_lock(hashtextextended(:key, 0))").bindparams(key=key)
+            ).scalar_one()
+        # Session-level locks outlive the transaction; don't sit idle in one.
+        conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtextextended(:key, 0))").bindparams(key=key))
+                conn.commit()
+
+
+@contextmanager
+def all_pipelines_lock() -> Iterator[None]:
+    """Every sport's `pipeline_lock` at once, waiting for each, held on one connection.
+    For maintenance that touches all slot tables (`retire_venues`); taken in a fixed
+    order, and pipelines only ever hold their own sport's, so it can't deadlock."""
+    keys = [f"sportscanner.pipeline.{sport}" for sport in _SLOT_TABLES]
+    with engine.connect() as conn:
+        for key in keys:
+            conn.execute(text("SELECT pg_advisory_lock(hashtextextended(:key, 0))").bindparams(key=key))
+        conn.commit()
+        try:
+            yield
+        finally:
+            for key in reversed(keys):
+                conn.execute(text("SELECT pg_advisory_unlock(hashtextextended(:key, 0))").bindparams(key=key))
+            conn.commit()
+
+
+def start_crawl_run(sport: str, outcome: CrawlRunOutcome = CrawlRunOutcome.RUNNING) -> int:
+    """Registers a pipeline run in `crawl_runs`; returns its id for `finish_crawl_run`."""
+    now = datetime.now()
+    with Session(engine) as session:
+        run = CrawlRun(sport=sport, started_at=now, outcome=outcome.value)
+        if outcome != CrawlRunOutcome.RUNNING:
+            run.finished_at, run.duration_seconds = now, 0.0
+        session.add(run)
+        session.commit()
+        return run.id
+
+
+def finish_crawl_run(
+    run_id: int,
+    outcome: CrawlRunOutcome,
+    providers: Optional[list] = None,
+    error: Optional[str] = None,
+    upserts: Optional["UpsertStats"] = None,
+):
+    """Records how a run ended, with one entry per provider (`ProviderRunStats.to_dict()`)
+    and, for a run that loaded anything, its total `UpsertStats`."""
+    providers = providers or []
+    with Session(engine) as session:
+        run = session.get(CrawlRun, run_id)
+        run.finished_at = datetime.now()
+        run.duration_seconds = (run.finished_at - run.started_at).total_seconds()
+        run.outcome = outcome.value
+        run.providers = providers
+        run.slots_collected = sum(provider["slots"] for provider in providers)
+        run.upserts = upserts.to_dict() if upserts is not None else None
+        run.error = error
+        session.commit()
+
+
+def latest_successful_crawl_run(sport: str) -> Optional[datetime]:
+    """When the sport's most recent succeeded run started, or None if none has."""
+    with Session(engine) as session:
+        return session.exec(
+            select(func.max(CrawlRun.started_at))
+            .where(CrawlRun.sport == sport)
+            .where(CrawlRun.outcome == CrawlRunOutcome.SUCCEEDED.value)
+        ).one()
+
+
 def get_refresh_status_for_pipeline(engine: Engine):
     """GET status of current refresh status from RefreshMetadata table"""
     with Session(engine) as session:
@@ -95,34 +221,161 @@ def pipeline_refresh_decision_based_on_interval(
         session.commit()
 
 
-def load_sports_centre_mappings(engine):
-    """Loads sports centre lookup sheet to Table: SportsVenue"""
-    sports_centre_lists: SportsVenueMappingModel = get_sports_venue_mappings_from_raw()
-    logging.debug("Loading sports venue mappings data to database")
+# sportsvenue columns that come from venues.json (`srid` is derived from lat/long).
+_VENUE_COLUMNS = (
+    "composite_key", "organisation", "organisation_website", "venue_name", "slug",
+    "postcode", "address", "latitude", "longitude", "sports",
+)
+
+
+@dataclass
+class VenueSyncStats:
+    """Outcome of `sync_sports_venues`."""
+    inserted: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def _venue_rows_from_mappings(sports_centre_lists: SportsVenueMappingModel) -> list:
+    return [
+        dict(
+            composite_key=generate_composite_key(
+                [organisation.organisation_website, venue.slug]
+            ),
+            organisation=organisation.organisation,
+            organisation_website=organisation.organisation_website,
+            venue_name=venue.venue_name,
+            slug=venue.slug,
+            postcode=venue.location.postcode,
+            address=venue.location.address,
+            latitude=venue.location.latitude,
+            longitude=venue.location.longitude,
+            sports=venue.sports,
+        )
+        for organisation in sports_centre_lists.root
+        for venue in organisation.venues
+    ]
+
+
+# Valkey key holding the venue table's version, which API processes compare against
+# their `VenueRegistry` (see venue_registry.py) to know when to reload it.
+VENUE_VERSION_KEY = "venues:version"
+VENUE_VERSION_TTL_SECONDS = 30 * 24 * 3600
+
+
+def sync_sports_venues(engine, remove_missing: bool = True) -> VenueSyncStats:
+    """Brings Table: SportsVenue in line with the venues.json lookup sheet, touching only
+    what differs.
+
+    The sheet is staged into a temp table and merged with one `INSERT ... ON CONFLICT
+    (composite_key) DO UPDATE ... WHERE ... IS DISTINCT FROM`, which also sets `srid`
+    from latitude/longitude, so new venues are inserted, edited ones updated and
+    unchanged ones not written at all. Adding a venue no longer means truncating every
+    slot table and reloading the whole sheet. The merge is additive, so it is safe to
+    run while crawls are in progress.
+
+    Venues no longer in the sheet are retired (unless `remove_missing` is False) by
+    `retire_venues`, which waits for every sport's pipeline lock. Slot data for every
+    other venue is left alone.
+
+    If anything changed, a new venue version is published so API processes reload
+    their venue registry.
+    """
+    venues = _venue_rows_from_mappings(get_sports_venue_mappings_from_raw())
+    columns = ", ".join(_VENUE_COLUMNS)
+    compared = [c for c in _VENUE_COLUMNS if c != "composite_key"]
+    stats = VenueSyncStats()
+
     with Session(engine) as session:
-        for organisation in sports_centre_lists.root:
-            for venue in organisation.venues:
-                session.add(
-                    SportsVenue(
-                        composite_key=generate_composite_key(
-                            [organisation.organisation_website, venue.slug]
-                        ),
-                        organisation=organisation.organisation,
-                        organisation_website=organisation.organisation_website,
-                        venue_name=venue.venue_name,
-                        slug=venue.slug,
-                        postcode=venue.location.postcode,
-                        address=venue.location.address,
-                        latitude=venue.location.latitude,
-                        longitude=venue.location.longitude,
-                        sports=venue.sports
-                    )
-                )
-        session.flush()  # write inserts to DB before the UPDATE can see them
-        # Ensure srid column is populated for distance calculations
-        session.execute(text("UPDATE sportsvenue SET srid = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326) WHERE srid IS NULL"))
+        session.execute(text(
+            f"CREATE TEMP TABLE venue_batch ON COMMIT DROP AS "
+            f"SELECT {columns} FROM public.sportsvenue WITH NO DATA"
+        ))
+        session.execute(
+            insert(sqlalchemy.table("venue_batch", *[sqlalchemy.column(c) for c in _VENUE_COLUMNS])),
+            venues,
+        )
+        merged = session.execute(text(f'''
+            INSERT INTO public.sportsvenue AS v ({columns}, srid)
+            SELECT {columns}, ST_SetSRID(ST_MakePoint(longitude, latitude), 4326) FROM venue_batch
+            ON CONFLICT (composite_key) DO UPDATE SET
+                {", ".join(f"{c} = excluded.{c}" for c in compared)},
+                srid = excluded.srid
+            WHERE ({", ".join(f"v.{c}" for c in compared)}, v.srid IS NULL)
+                IS DISTINCT FROM ({", ".join(f"excluded.{c}" for c in compared)}, FALSE)
+            RETURNING (xmax = 0) AS inserted
+        ''')).scalars().all()
+        stats.inserted = sum(1 for inserted in merged if inserted)
+        stats.changed = len(merged) - stats.inserted
+        stats.unchanged = len(venues) - len(merged)
+        removed_venues = session.execute(text(
+            "SELECT composite_key FROM public.sportsvenue "
+            "WHERE composite_key NOT IN (SELECT composite_key FROM venue_batch)"
+        )).scalars().all()
         session.commit()
-        logging.success("Sports venue mapping successfully loaded to database")
+
+    if remove_missing and removed_venues:
+        stats.removed = retire_venues(removed_venues)
+    if stats.inserted or stats.changed or stats.removed:
+        cache_set_json(VENUE_VERSION_KEY, datetime.now().isoformat(), ttl_seconds=VENUE_VERSION_TTL_SECONDS)
+    logging.success(
+        f"Synced {len(venues)} venues from the lookup sheet: {stats.inserted} added, "
+        f"{stats.changed} updated, {stats.unchanged} unchanged, {stats.removed} removed"
+    )
+    return stats
+
+
+# Tables keyed on composite_key that aren't versioned by crawl generation; a retired
+# venue's rows are simply deleted from them.
+_UNVERSIONED_VENUE_TABLES = ("venue_freshness", "availability_bitmap", "slot_changes", "slot_change_daily")
+
+
+def retire_venues(composite_keys) -> int:
+    """Removes venues and everything keyed on them. Returns the number of venues removed.
+
+    Holds every sport's pipeline lock (`all_pipelines_lock`) throughout, so no crawl
+    can write slots for a venue while it goes away. For each sport, the venues' open
+    slot rows and availability documents are closed in a crawl generation of their
+    own, so readers of the published generation see them disappear at once on
+    publish, like any other crawl, and garbage collection then deletes them. Only
+    after that are the unversioned rows and the venue rows themselves deleted, which
+    the slot tables' foreign keys require.
+    """
+    keys = list(composite_keys)
+    with all_pipelines_lock():
+        for TableForLoading in _SLOT_MODELS:
+            sport = TableForLoading.__tablename__
+            with Session(engine) as session:
+                has_rows = session.execute(text(
+                    f"SELECT 1 FROM public.{sport} WHERE composite_key = ANY(:keys) LIMIT 1"
+                ).bindparams(keys=keys)).first()
+            if not has_rows:
+                continue
+            with crawl_generation(TableForLoading) as generation:
+                with Session(engine) as session:
+                    session.execute(text(
+                        f"UPDATE public.{sport} SET gen_to = :generation "
+                        f"WHERE composite_key = ANY(:keys) AND gen_to IS NULL"
+                    ).bindparams(keys=keys, generation=generation))
+                    session.execute(text(
+                        "UPDATE public.availability_document SET gen_to = :generation "
+                        "WHERE sport = :sport AND composite_key = ANY(:keys) AND gen_to IS NULL"
+                    ).bindparams(keys=keys, sport=sport, generation=generation))
+                    session.commit()
+            logging.info(f"Retired {len(keys)} venues' {sport} slots in generation {generation}")
+
+        with Session(engine) as session:
+            for table in _UNVERSIONED_VENUE_TABLES:
+                session.execute(text(
+                    f"DELETE FROM public.{table} WHERE composite_key = ANY(:keys)"
+                ).bindparams(keys=keys))
+            removed = session.execute(text(
+                "DELETE FROM public.sportsvenue WHERE composite_key = ANY(:keys)"
+            ).bindparams(keys=keys))
+            session.commit()
+    logging.warning(f"Removed venues no longer in the lookup sheet: {', '.join(keys)}")
+    return removed.rowcount
 
 
 def truncate_table(engine, table: sqlmodel.main.SQLModelMetaclass):
@@ -136,66 +389,202 @@ def truncate_table(engine, table: sqlmodel.main.SQLModelMetaclass):
         )
 
 
+def _add_slot_versions(session: Session, slots_from_all_venues, TableForLoading: sqlmodel.main.SQLModelMetaclass, generation: int):
+    """Inserts the batch (deduplicated, since the natural-key index rejects repeats) as
+    new row versions in `generation`."""
+    for slots in _dedupe_on_natural_key(slots_from_all_venues):
+        orm_object = TableForLoading(
+            composite_key=slots.composite_key,
+            category=slots.category,
+            starting_time=slots.starting_time,
+            ending_time=slots.ending_time,
+            date=slots.date,
+            price=slots.price,
+            spaces=slots.spaces,
+            last_refreshed=slots.last_refreshed,
+            booking_url=slots.booking_url,
+            starts_at=datetime.combine(slots.date, slots.starting_time),
+            gen_from=generation,
+        )
+        session.add(orm_object)
+
+
 @timeit
-def truncate_and_reload_all(slots_from_all_venues, TableForLoading: sqlmodel.main.SQLModelMetaclass):
-    """Inserts the slots for an Organisation one by one into the table: SportScanner"""
+def truncate_and_reload_all(
+    slots_from_all_venues, TableForLoading: sqlmodel.main.SQLModelMetaclass, generation: Optional[int] = None
+):
+    """Replaces every slot in the table with the given ones, in crawl `generation`
+    (published on its own when not given)."""
+    if generation is None:
+        with crawl_generation(TableForLoading) as generation:
+            return truncate_and_reload_all(slots_from_all_venues, TableForLoading, generation)
+
     with Session(engine) as session:
-        statement = delete(TableForLoading)
-        results = session.exec(statement)
+        session.exec(
+            update(TableForLoading)
+            .where(TableForLoading.gen_to.is_(None))
+            .values(gen_to=generation)
+        )
         logging.debug(f"Loading fresh data items to db: {len(slots_from_all_venues)}")
-        for slots in slots_from_all_venues:
-            orm_object = TableForLoading(
-                uid=str(uuid.uuid4()),
-                composite_key=slots.composite_key,
-                category=slots.category,
-                starting_time=slots.starting_time,
-                ending_time=slots.ending_time,
-                date=slots.date,
-                price=slots.price,
-                spaces=slots.spaces,
-                last_refreshed=slots.last_refreshed,
-                booking_url=slots.booking_url,
-            )
-            session.add(orm_object)
+        _add_slot_versions(session, slots_from_all_venues, TableForLoading, generation)
+        session.flush()
+        composite_keys = session.exec(
+            select(TableForLoading.composite_key).where(TableForLoading.gen_to.is_(None)).distinct()
+        ).all()
+        refresh_availability_documents(session, TableForLoading, generation, composite_keys)
         session.commit()
 
 
 
+# Columns that identify one bookable slot; mirrors `tables._natural_key_index`.
+_NATURAL_KEY = ("composite_key", "date", "starting_time", "ending_time", "category")
+
+
+def _natural_key(slots) -> tuple:
+    return tuple(getattr(slots, column) for column in _NATURAL_KEY)
+
+
+def _dedupe_on_natural_key(slots_from_all_venues) -> list:
+    """De-dup a batch on the natural key, preferring the entry with spaces > 0.
+
+    This handles cases where both 40min and 60min API calls return the same slot, but
+    one returns spaces=0 (fallback from an empty response) and one returns real
+    availability. Keying on the tuple itself (rather than an MD5 of a formatted string)
+    is the same dedup the unique index enforces, without the per-slot hashing.
+    """
+    key_to_slots = {}
+    for slots in slots_from_all_venues:
+        key = _natural_key(slots)
+        existing = key_to_slots.get(key)
+        if existing is None or (slots.spaces > 0 and existing.spaces == 0):
+            key_to_slots[key] = slots
+    return list(key_to_slots.values())
+
+
+# Columns written for every slot, in the order they're staged and merged.
+_SLOT_COLUMNS = (
+    "composite_key", "category", "starting_time", "ending_time", "date",
+    "price", "spaces", "last_refreshed", "booking_url", "starts_at",
+)
+
+# A row is only rewritten when one of these differs from what's already stored.
+# `last_refreshed` is deliberately not one of them: freshness is served from
+# `venue_freshness` (see `record_venue_freshness`), so an unchanged slot is not
+# touched at all.
+_TRACKED_COLUMNS = ("spaces", "price", "booking_url")
+
+
+@dataclass
+class UpsertStats:
+    """Per-run outcome of `insert_records_to_table`. `load_spool` adds one up per
+    segment into a run total, counting slots loaded through
+    `truncate_by_composite_key_and_reload` as `reloaded`."""
+    inserted: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    stale: int = 0
+    documents: int = 0
+    reloaded: int = 0
+
+    def add(self, other: "UpsertStats"):
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _log_slot_changes_sql(source: str) -> str:
+    """INSERT into `slot_changes` from `source`, a CTE with the natural-key columns plus
+    `spaces`, `kind` and `delta`; :sport and :now are bound by the caller. Meant to run
+    as a data-modifying CTE of the merge statement that produced the transitions.
+    A slot ending at 00:00 ends at midnight, i.e. 24:00, not before it started."""
+    return f'''
+        INSERT INTO public.slot_changes
+            (sport, composite_key, starts_at, minutes, category, kind, spaces, delta, recorded_at)
+        SELECT :sport, composite_key, date + starting_time,
+            (extract(epoch FROM
+                CASE WHEN ending_time = time '00:00' THEN interval '24 hours'
+                    ELSE ending_time - time '00:00' END
+                - (starting_time - time '00:00')
+            ) / 60)::smallint,
+            category, kind, spaces, delta, :now
+        FROM {source}
+    '''
+
+
+def _log_reload_changes(session: Session, TableForLoading: sqlmodel.main.SQLModelMetaclass, generation: int,
+                        composite_keys, now: datetime):
+    """`slot_changes` for `truncate_by_composite_key_and_reload`, which closes every open
+    version for its venues and inserts the fresh ones: compares the two sets on the
+    natural key, logging the slots that appeared, changed spaces or disappeared (the
+    same transitions the merge logs)."""
+    table = f"public.{TableForLoading.__tablename__}"
+    key = ", ".join(_NATURAL_KEY)
+    either = ", ".join(f"coalesce(f.{c}, o.{c}) AS {c}" for c in _NATURAL_KEY)
+    same_slot = " AND ".join(f"f.{c} = o.{c}" for c in _NATURAL_KEY)
+    session.execute(text(f'''
+        WITH fresh AS (
+            SELECT {key}, spaces FROM {table}
+            WHERE composite_key = ANY(:keys) AND gen_from = :generation AND gen_to IS NULL
+        ), replaced AS (
+            SELECT {key}, spaces FROM {table}
+            WHERE composite_key = ANY(:keys) AND gen_to = :generation AND gen_from < :generation
+        ), transitions AS (
+            SELECT {either},
+                coalesce(f.spaces, 0) AS spaces,
+                CASE WHEN o.spaces IS NULL THEN 'a' WHEN f.spaces IS NULL THEN 'd' ELSE 'c' END AS kind,
+                coalesce(f.spaces, 0) - coalesce(o.spaces, 0) AS delta
+            FROM fresh f FULL JOIN replaced o ON {same_slot}
+            WHERE CASE WHEN f.spaces IS NULL THEN o.spaces != 0 ELSE o.spaces IS DISTINCT FROM f.spaces END
+        )
+        {_log_slot_changes_sql("transitions")}
+    ''').bindparams(
+        keys=list(composite_keys), generation=generation, sport=TableForLoading.__tablename__, now=now
+    ))
+
+
 @timeit
-def insert_records_to_table(slots_from_all_venues, TableForLoading: sqlmodel.main.SQLModelMetaclass):
-    """Bulk upsert slots into a table.
+def insert_records_to_table(
+    slots_from_all_venues, TableForLoading: sqlmodel.main.SQLModelMetaclass, generation: Optional[int] = None
+) -> Optional[UpsertStats]:
+    """Merge a batch of slots into a table, keyed on the slot's natural key
+    (composite_key, date, starting_time, ending_time, category).
+
+    Only rows that actually changed are written. Every run re-crawls the same slots,
+    and most come back identical; an unconditional `ON CONFLICT DO UPDATE` rewrote all
+    of them anyway, leaving a dead tuple and a WAL record per slot per run (bloat and
+    vacuum load on a small instance, for no change in data). The merge now only writes
+    a new row version when spaces/price/booking_url are distinct from what's stored;
+    unchanged rows are left alone, and their venues' freshness is recorded in
+    `venue_freshness` instead.
 
     Also handles stale slots: for any existing slots in DB that are NOT in the incoming
     data (i.e., the API no longer returns them), they will be marked as spaces=0.
     This ensures stale slots don't show old availability.
 
-    Previously this read every existing row for the incoming composite_keys/dates into
-    Python, diffed it against the incoming batch, and re-upserted the stale ones — an
-    app-side read-modify-write on every pipeline run. Marking stale slots is now a
-    single indexed UPDATE (WHERE composite_key/date match AND uid wasn't refreshed),
-    so nothing is read back from the DB at all.
+    The batch is staged into a temp table first so the merge and the
+    stale-marking anti-join are all set-based statements against it; nothing is read
+    back into Python except row counts. The slots that appeared, changed spaces or
+    disappeared are appended to `slot_changes` by those same statements.
+
+    Changes are written into crawl `generation` (see `crawl_generation`) and only
+    become visible to readers once it is published; without one, the batch is written
+    and published as a generation of its own.
     """
     if not slots_from_all_venues:
         logging.warning("No slots provided for insert; skipping.")
-        return
+        return None
 
-    now = datetime.now()
+    if generation is None:
+        with crawl_generation(TableForLoading) as generation:
+            return insert_records_to_table(slots_from_all_venues, TableForLoading, generation)
 
-    # De-dup the incoming batch by uid, preferring the entry with spaces > 0. This
-    # handles cases where both 40min and 60min API calls return the same slot, but one
-    # returns spaces=0 (fallback from an empty response) and one returns real availability.
-    uid_to_slots = {}
-    for slots in slots_from_all_venues:
-        key = f"{slots.composite_key}-{slots.category}-{slots.date}-{slots.starting_time}-{slots.ending_time}"
-        uid = hashlib.md5(key.encode("utf-8")).hexdigest()
-        existing = uid_to_slots.get(uid)
-        if existing is None or (slots.spaces > 0 and existing.spaces == 0):
-            uid_to_slots[uid] = slots
+    now = datetime.now()
 
     all_data = []
-    for uid, slots in uid_to_slots.items():
+    for slots in _dedupe_on_natural_key(slots_from_all_venues):
         all_data.append(dict(
-            uid=uid,
             composite_key=slots.composite_key,
             category=slots.category,
             starting_time=slots.starting_time,
@@ -210,38 +599,335 @@ def insert_records_to_table(slots_from_all_venues, TableForLoading: sqlmodel.mai
 
     if not all_data:
         logging.warning("No data to insert after processing.")
-        return
+        return None
 
-    composite_keys = {slots.composite_key for slots in slots_from_all_venues}
-    dates = {slots.date for slots in slots_from_all_venues}
-    incoming_uids = list(uid_to_slots.keys())
+    table = f"public.{TableForLoading.__tablename__}"
+    columns = ", ".join(_SLOT_COLUMNS)
+    matches_batch = " AND ".join(f"t.{c} = b.{c}" for c in _NATURAL_KEY)
+    stats = UpsertStats()
 
     with Session(engine) as session:
-        stmt = insert(TableForLoading).values(all_data)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=['uid'],
-            set_={c: stmt.excluded[c] for c in all_data[0] if c != 'uid'}
+        session.execute(text(
+            f"CREATE TEMP TABLE slot_batch ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {table} WITH NO DATA"
+        ))
+        session.execute(
+            insert(sqlalchemy.table("slot_batch", *[sqlalchemy.column(c) for c in _SLOT_COLUMNS])),
+            all_data,
         )
-        session.exec(stmt)
 
-        # Any row already in the DB for these composite_keys/dates that wasn't just
-        # refreshed above no longer appears in the source API response — mark it
-        # unavailable rather than leaving stale availability showing.
-        mark_stale_stmt = (
-            update(TableForLoading)
-            .where(TableForLoading.composite_key.in_(composite_keys))
-            .where(TableForLoading.date.in_(dates))
-            .where(TableForLoading.spaces != 0)
-            .where(TableForLoading.uid.not_in(incoming_uids))
-            .values(spaces=0, last_refreshed=now)
+        # A changed slot gets a new row version rather than an in-place update: close
+        # the open version (still visible to readers of the published generation) ...
+        changed_result = session.execute(text(f'''
+            UPDATE {table} t SET gen_to = :generation
+            FROM slot_batch b
+            WHERE {matches_batch} AND t.gen_to IS NULL
+            AND ({", ".join(f"t.{c}" for c in _TRACKED_COLUMNS)})
+                IS DISTINCT FROM ({", ".join(f"b.{c}" for c in _TRACKED_COLUMNS)})
+        ''').bindparams(generation=generation))
+        stats.changed = changed_result.rowcount
+
+        # ... and insert every slot that now has no open version (changed or new),
+        # logging the ones that are new or whose spaces moved to `slot_changes`: a
+        # version closed just above (from an earlier generation) means a change,
+        # none means the slot appeared.
+        inserted_result = session.execute(text(f'''
+            WITH inserted AS (
+                INSERT INTO {table} ({columns}, gen_from)
+                SELECT {columns}, :generation FROM slot_batch b
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {table} t WHERE {matches_batch} AND t.gen_to IS NULL
+                )
+                RETURNING {", ".join(_NATURAL_KEY)}, spaces
+            ), transitions AS (
+                SELECT b.*,
+                    CASE WHEN t.spaces IS NULL THEN 'a' ELSE 'c' END AS kind,
+                    b.spaces - COALESCE(t.spaces, 0) AS delta
+                FROM inserted b
+                LEFT JOIN {table} t ON {matches_batch}
+                    AND t.gen_to = :generation AND t.gen_from < :generation
+                WHERE t.spaces IS DISTINCT FROM b.spaces
+            ), logged AS ({_log_slot_changes_sql("transitions")})
+            SELECT count(*) FROM inserted
+        ''').bindparams(generation=generation, sport=TableForLoading.__tablename__, now=now))
+        inserted = inserted_result.scalar_one()
+        stats.inserted = inserted - stats.changed
+        stats.unchanged = len(all_data) - inserted
+
+        # Any row already in the DB for these composite_keys/dates that isn't in the
+        # batch no longer appears in the source API response — replace it with an
+        # unavailable version rather than leaving stale availability showing.
+        unavailable_copy = ", ".join(
+            {"spaces": "0", "last_refreshed": ":now"}.get(c, c) for c in _SLOT_COLUMNS
+        )
+        stale_result = session.execute(text(f'''
+            WITH retired AS (
+                UPDATE {table} t SET gen_to = :generation
+                WHERE t.composite_key IN (SELECT DISTINCT composite_key FROM slot_batch)
+                AND t.date IN (SELECT DISTINCT date FROM slot_batch)
+                AND t.gen_to IS NULL
+                AND t.spaces != 0
+                AND NOT EXISTS (SELECT 1 FROM slot_batch b WHERE {matches_batch})
+                RETURNING {", ".join(f"t.{c}" for c in _SLOT_COLUMNS)}
+            ), transitions AS (
+                SELECT {", ".join(_NATURAL_KEY)}, 0 AS spaces, 'd' AS kind, -spaces AS delta FROM retired
+            ), logged AS ({_log_slot_changes_sql("transitions")})
+            INSERT INTO {table} ({columns}, gen_from)
+            SELECT {unavailable_copy}, :generation FROM retired
+        ''').bindparams(now=now, generation=generation, sport=TableForLoading.__tablename__))
+        stats.stale = stale_result.rowcount
+
+        record_venue_freshness(session, TableForLoading.__tablename__, generation, "slot_batch")
+        stats.documents = refresh_availability_documents(
+            session,
+            TableForLoading,
+            generation,
+            composite_keys={row["composite_key"] for row in all_data},
+            dates={row["date"] for row in all_data},
         )
-        stale_result = session.exec(mark_stale_stmt)
 
         session.commit()
-        logging.success(
-            f"Upserted {len(all_data)} slots into {TableForLoading.__tablename__} "
-            f"(marked {stale_result.rowcount} stale rows unavailable)"
+    logging.success(
+        f"Merged {len(all_data)} slots into {TableForLoading.__tablename__} (generation {generation}): "
+        f"{stats.inserted} inserted, {stats.changed} changed, {stats.unchanged} unchanged, "
+        f"{stats.stale} stale rows marked unavailable, "
+        f"{stats.documents} availability documents rewritten"
+    )
+    return stats
+
+
+def record_venue_freshness(session: Session, sport: str, generation: int, source: str, **params) -> int:
+    """Upserts `venue_freshness` for every venue/date in `source` - an SQL relation with
+    the slot columns (the merge's staged batch, or the rows a reload just wrote) -
+    inside the caller's transaction. One row per venue/date, so the write is as small
+    as the health/search reads it replaces. Returns the number of rows written.
+
+    Not versioned by generation: if a crawl's generation is later discarded, its
+    freshness stays until the retried load (see `crawlers/spool.py`) overwrites it.
+    """
+    result = session.execute(text(f'''
+        INSERT INTO public.venue_freshness AS f
+            (sport, composite_key, date, last_refreshed, slot_count, bookable_count, provider_status, generation)
+        SELECT :sport, s.composite_key, s.date, max(s.last_refreshed), count(*),
+            count(*) FILTER (WHERE s.spaces > 0), 'ok', :generation
+        FROM {source} s
+        GROUP BY s.composite_key, s.date
+        ON CONFLICT (sport, composite_key, date) DO UPDATE SET
+            last_refreshed = excluded.last_refreshed,
+            slot_count = excluded.slot_count,
+            bookable_count = excluded.bookable_count,
+            provider_status = excluded.provider_status,
+            generation = excluded.generation
+    ''').bindparams(sport=sport, generation=generation, **params))
+    return result.rowcount
+
+
+def record_provider_status(sport: str, providers) -> int:
+    """Marks `venue_freshness` rows of providers whose crawl came back degraded
+    (`ProviderRunStats` with a tripped circuit breaker, or no request returning data),
+    so monitoring can tell a stale venue from a failing provider. Healthy providers'
+    rows were already set to "ok" by the write path."""
+    updated = 0
+    with Session(engine) as session:
+        for stats in providers:
+            if stats.circuit_breaker_tripped:
+                status = "circuit_breaker_tripped"
+            elif stats.requests and not stats.requests_with_data:
+                status = "no_data"
+            else:
+                continue
+            result = session.execute(text('''
+                UPDATE public.venue_freshness f SET provider_status = :status
+                FROM public.sportsvenue v
+                WHERE f.sport = :sport AND f.composite_key = v.composite_key
+                AND v.organisation_website = :provider AND f.provider_status != :status
+            ''').bindparams(sport=sport, provider=stats.provider, status=status))
+            updated += result.rowcount
+        session.commit()
+    return updated
+
+
+def refresh_availability_documents(
+    session: Session, TableForLoading: sqlmodel.main.SQLModelMetaclass, generation: int, composite_keys, dates=None
+) -> int:
+    """Rebuilds `availability_document` rows for the given venues (and dates, or every
+    date when `dates` is None) from the slot table's rows in `generation`, inside the
+    caller's transaction.
+
+    Search reads one pre-grouped document per venue/date instead of selecting raw slot
+    rows and grouping/formatting them in Python on every request. Only documents whose
+    availability actually changed get a new version (freshness alone doesn't count:
+    search reads that from `venue_freshness`); venue/dates with no bookable slots left
+    have their document closed. Returns the number of documents written.
+    """
+    if not composite_keys:
+        return 0
+    table = f"public.{TableForLoading.__tablename__}"
+    params = {"sport": TableForLoading.__tablename__, "keys": list(composite_keys), "generation": generation}
+    scope = "{alias}.composite_key = ANY(:keys)"
+    if dates is not None:
+        scope += " AND {alias}.date = ANY(:dates)"
+        params["dates"] = list(dates)
+
+    session.execute(text(f'''
+        CREATE TEMP TABLE fresh_documents ON COMMIT DROP AS
+        SELECT
+            composite_key,
+            date,
+            jsonb_agg(jsonb_build_object(
+                'startingTime', to_char(starting_time, 'HH24:MI'),
+                'endingTime', to_char(ending_time, 'HH24:MI'),
+                'available', true,
+                'bookingUrl', booking_url,
+                'price', price
+            ) ORDER BY starting_time, ending_time) AS availability,
+            min(starting_time) AS earliest_start,
+            min(substring(price from '[0-9]+[.]?[0-9]*')::numeric) AS min_price,
+            max(last_refreshed) AS last_refreshed,
+            count(*) AS slot_count
+        FROM {table} t
+        WHERE {scope.format(alias="t")} AND spaces > 0
+        AND {published_generation_sql("t", ":generation")}
+        GROUP BY composite_key, date
+    ''').bindparams(**{k: v for k, v in params.items() if k != "sport"}))
+    session.execute(text(f'''
+        UPDATE public.availability_document d SET gen_to = :generation
+        WHERE d.sport = :sport AND {scope.format(alias="d")} AND d.gen_to IS NULL
+        AND NOT EXISTS (
+            SELECT 1 FROM fresh_documents f
+            WHERE f.composite_key = d.composite_key AND f.date = d.date
+            AND f.availability = d.availability
+        )
+    ''').bindparams(**params))
+    written = session.execute(text('''
+        INSERT INTO public.availability_document
+            (sport, composite_key, date, availability, earliest_start, min_price, last_refreshed, slot_count, gen_from)
+        SELECT :sport, f.*, :generation FROM fresh_documents f
+        WHERE NOT EXISTS (
+            SELECT 1 FROM public.availability_document d
+            WHERE d.sport = :sport AND d.composite_key = f.composite_key AND d.date = f.date
+            AND d.gen_to IS NULL
         )
+    ''').bindparams(sport=params["sport"], generation=generation))
+    session.execute(text("DROP TABLE fresh_documents"))
+    return written.rowcount
+
+
+def published_generation_sql(alias: str, generation: str) -> str:
+    """SQL predicate: row `alias` belongs to crawl generation `generation` (a bind
+    parameter or SQL expression). See `GenerationColumns`."""
+    return (
+        f"{alias}.gen_from <= {generation} "
+        f"AND ({alias}.gen_to IS NULL OR {alias}.gen_to > {generation})"
+    )
+
+
+def current_generation_sql(sport: str) -> str:
+    """SQL expression for the published generation of `sport` (a bind parameter or
+    SQL expression), for raw text() queries; 0 before the sport's first publish."""
+    return (
+        f"COALESCE((SELECT g.current_generation FROM public.crawl_generation g "
+        f"WHERE g.sport = {sport}), 0)"
+    )
+
+
+def in_published_generation(Table: sqlmodel.main.SQLModelMetaclass, sport: Optional[str] = None):
+    """where() clause limiting a slot table (or `AvailabilityDocument`, given `sport`)
+    to the rows of its sport's published crawl generation. Every reader of slot rows or
+    documents applies this, so a crawl in progress is never partially visible."""
+    current = func.coalesce(
+        select(CrawlGeneration.current_generation)
+        .where(CrawlGeneration.sport == (sport or Table.__tablename__))
+        .scalar_subquery(),
+        0,
+    )
+    return and_(Table.gen_from <= current, or_(Table.gen_to.is_(None), Table.gen_to > current))
+
+
+def _current_generation(session: Session, sport: str) -> int:
+    return session.execute(text(
+        f"SELECT {current_generation_sql(':sport')}"
+    ).bindparams(sport=sport)).scalar_one()
+
+
+def _discard_unpublished_generations(session: Session, TableForLoading: sqlmodel.main.SQLModelMetaclass, current: int):
+    """Undo everything written for generations after `current` that never got published
+    (a crawl that failed or was killed): drop the row versions it inserted and reopen
+    the ones it closed."""
+    sport = TableForLoading.__tablename__
+    session.execute(text(
+        f"DELETE FROM public.{sport} WHERE gen_from > :current"
+    ).bindparams(current=current))
+    session.execute(text(
+        f"UPDATE public.{sport} SET gen_to = NULL WHERE gen_to > :current"
+    ).bindparams(current=current))
+    session.execute(text(
+        "DELETE FROM public.availability_document WHERE sport = :sport AND gen_from > :current"
+    ).bindparams(sport=sport, current=current))
+    session.execute(text(
+        "UPDATE public.availability_document SET gen_to = NULL WHERE sport = :sport AND gen_to > :current"
+    ).bindparams(sport=sport, current=current))
+
+
+def _collect_garbage(TableForLoading: sqlmodel.main.SQLModelMetaclass, generation: int) -> int:
+    """Bulk-deletes row versions no reader can see any more: closed at or before the
+    now-published `generation`."""
+    sport = TableForLoading.__tablename__
+    with Session(engine) as session:
+        slots = session.execute(text(
+            f"DELETE FROM public.{sport} WHERE gen_to <= :generation"
+        ).bindparams(generation=generation))
+        session.execute(text(
+            "DELETE FROM public.availability_document WHERE sport = :sport AND gen_to <= :generation"
+        ).bindparams(sport=sport, generation=generation))
+        session.commit()
+    return slots.rowcount
+
+
+@contextmanager
+def crawl_generation(TableForLoading: sqlmodel.main.SQLModelMetaclass) -> Iterator[int]:
+    """Write one crawl of a sport as a new generation and publish it atomically.
+
+    Yields the generation number to pass to `insert_records_to_table` /
+    `truncate_by_composite_key_and_reload`. Their writes stay invisible to readers
+    (see `in_published_generation`) until the block exits cleanly, at which point the
+    sport's `crawl_generation` pointer is bumped in a single-row transaction and the
+    superseded row versions are garbage-collected in bulk. If the block raises, the
+    generation's writes are discarded and the published data is left as it was.
+
+    Assumes one crawl per sport at a time (the pipeline holds `pipeline_lock`): a new
+    generation starts by discarding anything left unpublished from an earlier one.
+    """
+    sport = TableForLoading.__tablename__
+    with Session(engine) as session:
+        current = _current_generation(session, sport)
+        _discard_unpublished_generations(session, TableForLoading, current)
+        session.commit()
+    generation = current + 1
+
+    try:
+        yield generation
+    except BaseException:
+        with Session(engine) as session:
+            _discard_unpublished_generations(session, TableForLoading, current)
+            session.commit()
+        logging.error(f"Crawl generation {generation} for {sport} discarded; generation {current} stays published")
+        raise
+
+    with Session(engine) as session:
+        session.execute(
+            insert(CrawlGeneration)
+            .values(sport=sport, current_generation=generation, published_at=datetime.now())
+            .on_conflict_do_update(
+                index_elements=[CrawlGeneration.sport],
+                set_={"current_generation": generation, "published_at": datetime.now()},
+            )
+        )
+        session.commit()
+    collected = _collect_garbage(TableForLoading, generation)
+    logging.success(
+        f"Published crawl generation {generation} for {sport} ({collected} superseded slot rows collected)"
+    )
 
 
 def get_all_rows(engine, table: sqlmodel.main.SQLModelMetaclass, expression: select, params=None):
@@ -256,6 +942,37 @@ def get_all_rows(engine, table: sqlmodel.main.SQLModelMetaclass, expression: sel
     return rows
 
 
+def fetch_rows(engine, expression, params: Optional[dict] = None) -> List[sqlalchemy.Row]:
+    """Rows for a column-projected select() (or a text() clause) as lightweight named
+    tuples, executed on a plain connection rather than a Session.
+
+    `get_all_rows(select(Table))` hydrates a full ORM object per row (identity map,
+    instance state, every column) even when the caller reads three attributes. Select
+    only the columns you need - `select(Table.composite_key, Table.date, ...)` - and
+    read them by attribute (`row.date`) or position.
+    """
+    with engine.connect() as conn:
+        return conn.execute(expression, params).all()
+
+
+def fetch_columns(engine, expression, params: Optional[dict] = None) -> Dict[str, list]:
+    """Column-oriented variant of `fetch_rows`: `{column_name: [values...]}`, in row order."""
+    with engine.connect() as conn:
+        result = conn.execute(expression, params)
+        keys = list(result.keys())
+        rows = result.all()
+    return {key: [row[i] for row in rows] for i, key in enumerate(keys)}
+
+
+def stream_rows(engine, expression, params: Optional[dict] = None, batch_size: int = 1000) -> Iterator[sqlalchemy.Row]:
+    """Like `fetch_rows`, but over a server-side cursor: rows are pulled `batch_size`
+    at a time as the caller iterates, so a large result never sits in memory at once."""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(expression, params)
+        for partition in result.partitions(batch_size):
+            yield from partition
+
+
 def create_db_and_tables(engine):
     """Creates required schemas (if not exist) and then tables."""
     with engine.connect() as conn:
@@ -276,6 +993,13 @@ def create_db_and_tables(engine):
             McpAuthorizedClient.__table__,
             Notification.__table__,
             NotificationAck.__table__,
+            AvailabilityDocument.__table__,
+            CrawlGeneration.__table__,
+            CrawlRun.__table__,
+            SlotChange.__table__,
+            SlotChangeDaily.__table__,
+            AvailabilityBitmap.__table__,
+            VenueFreshness.__table__,
         ]
     )
 
@@ -284,13 +1008,19 @@ def create_db_and_tables(engine):
         conn.execute(text(
             "ALTER TABLE public.sportsvenue ADD COLUMN IF NOT EXISTS srid geometry(Point, 4326)"
         ))
+        conn.execute(text("ALTER TABLE public.crawl_runs ADD COLUMN IF NOT EXISTS upserts jsonb"))
         conn.commit()
 
     ensure_starts_at_column(engine)
+    ensure_natural_key(engine)
+    ensure_crawl_generations(engine)
     ensure_performance_indexes(engine)
+    ensure_availability_documents(engine)
+    ensure_venue_freshness(engine)
 
 
 _SLOT_TABLES = ("badminton", "squash", "pickleball", "padel")
+_SLOT_MODELS = (BadmintonMasterTable, SquashMasterTable, PickleballMasterTable, PadelMasterTable)
 
 
 def ensure_starts_at_column(engine):
@@ -308,31 +1038,124 @@ def ensure_starts_at_column(engine):
         conn.commit()
 
 
+def ensure_natural_key(engine):
+    """Migrates slot tables from the hashed `uid` text primary key to a bigint
+    surrogate `id`. Safe to run repeatedly: the key swap only runs while a `uid`
+    column still exists. The natural-key unique index itself is created by
+    `ensure_crawl_generations`.
+
+    Rows that collide on the natural key (possible only for rows written by
+    `truncate_by_composite_key_and_reload`, which never hashed its uids) are
+    collapsed first, keeping the available/most recently refreshed one, so the
+    unique index can be built. A NULL `spaces` or `last_refreshed` sorts as
+    unavailable/oldest; left NULL it would make the comparison NULL and keep both.
+    """
+    with engine.connect() as conn:
+        for table in _SLOT_TABLES:
+            has_uid = conn.execute(text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = :table AND column_name = 'uid'"
+            ).bindparams(table=table)).first()
+            if has_uid:
+                match = " AND ".join(f"a.{c} = b.{c}" for c in _NATURAL_KEY)
+                deduplicated = conn.execute(text(f'''
+                    DELETE FROM public.{table} a USING public.{table} b
+                    WHERE {match}
+                    AND ROW(coalesce(a.spaces, 0) > 0, coalesce(a.last_refreshed, '-infinity'), a.uid)
+                      < ROW(coalesce(b.spaces, 0) > 0, coalesce(b.last_refreshed, '-infinity'), b.uid)
+                '''))
+                conn.execute(text(f'ALTER TABLE public.{table} ADD COLUMN IF NOT EXISTS id bigserial'))
+                conn.execute(text(f'ALTER TABLE public.{table} DROP CONSTRAINT IF EXISTS {table}_pkey'))
+                conn.execute(text(f'ALTER TABLE public.{table} ADD PRIMARY KEY (id)'))
+                conn.execute(text(f'ALTER TABLE public.{table} DROP COLUMN uid'))
+                logging.info(
+                    f"Migrated {table} to natural-key upserts "
+                    f"(collapsed {deduplicated.rowcount} duplicate rows)"
+                )
+        conn.commit()
+
+
+def ensure_crawl_generations(engine):
+    """Adds crawl-generation versioning (`gen_from`/`gen_to`, see `GenerationColumns`)
+    to existing slot tables and `availability_document`. Safe to run repeatedly.
+
+    Existing slot rows become generation 0, which every reader sees. The natural-key
+    unique index moves to open rows only (a slot may have a superseded version awaiting
+    garbage collection alongside its open one), replacing the table-wide one. Documents
+    are derived data, so a pre-versioning `availability_document` is dropped and
+    recreated; `ensure_availability_documents` refills it.
+    """
+    natural_key = ", ".join(_NATURAL_KEY)
+    with engine.connect() as conn:
+        for table in _SLOT_TABLES:
+            conn.execute(text(f'ALTER TABLE public.{table} ADD COLUMN IF NOT EXISTS gen_from bigint NOT NULL DEFAULT 0'))
+            conn.execute(text(f'ALTER TABLE public.{table} ADD COLUMN IF NOT EXISTS gen_to bigint'))
+            conn.execute(text(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_open_natural_key '
+                f'ON public.{table} ({natural_key}) WHERE gen_to IS NULL'
+            ))
+            conn.execute(text(f'DROP INDEX IF EXISTS public.ux_{table}_natural_key'))
+        unversioned_documents = conn.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name = 'availability_document' AND column_name = 'gen_from'"
+        )).first() is None
+        if unversioned_documents:
+            conn.execute(text("DROP TABLE IF EXISTS public.availability_document"))
+            AvailabilityDocument.__table__.create(bind=conn)
+            logging.info("Recreated availability_document with crawl-generation columns")
+        conn.commit()
+
+
 def ensure_performance_indexes(engine):
     """Additive-only index migration — safe to run repeatedly against a live DB.
 
-    Every search filters `composite_key IN (...) AND date == X AND spaces > 0`, and
-    delete_past_slots() filters `date < today()`; with only the primary key (uid) to
-    go on, both were full table scans. Adds:
-      - a plain composite index (composite_key, date) per slot table — covers the
-        general composite_key/date lookups (search, delete_past_slots, the
-        insert-time stale-marking UPDATE).
-      - a partial composite index on the same columns WHERE spaces > 0 — near-free
-        given spaces > 0 is search's dominant filter; keeps the index small since
-        stale/unavailable rows (spaces = 0) are excluded from it entirely.
-      - a GiST index on sportsvenue.srid — ST_DWithin/ST_Distance in /venues/near
-        would otherwise sequential-scan as venue count grows.
+    Index set, per slot table:
+      - ix_{table}_bookable: (composite_key, date, starts_at) WHERE spaces > 0.
+        Matches bookable-slot reads — `composite_key IN/= ... AND date = X AND
+        spaces > 0 AND starts_at > now()` — so only the matching rows are fetched from
+        the heap; it holds no other columns, so these reads are never index-only.
+        Unavailable rows (spaces = 0) aren't in it at all. An earlier version that
+        INCLUDE-d every other column (roughly doubling each slot table) is dropped
+        and rebuilt in this shape.
+      - ix_{table}_date_freshness: (date, composite_key) INCLUDE (last_refreshed,
+        gen_from, gen_to). delete_past_slots() (`date < today()`) and the
+        consecutive-slots analytics (a date range) range-scan it, and max
+        last_refreshed per venue/date is index-only over it (`/health/scrapers` read
+        it that way before `venue_freshness`).
+      - a partial index on gen_to WHERE gen_to IS NOT NULL — only superseded row
+        versions are in it, so it stays tiny and makes the post-publish garbage
+        collection (`gen_to <= generation`) an index scan.
+    These replace the earlier (composite_key, date) index and its spaces > 0 partial
+    twin, which were dropped: every query they served is covered above, and the
+    insert-time stale-marking UPDATE uses the open natural-key index.
+
+    Plus a GiST index on sportsvenue.srid — ST_DWithin/ST_Distance in /venues/near
+    would otherwise sequential-scan as venue count grows.
+
+    `benchmarks/explain_indexes.py` records the plans these produce.
     """
     with engine.connect() as conn:
         for table in _SLOT_TABLES:
+            covering = conn.execute(text(
+                "SELECT 1 FROM pg_indexes WHERE schemaname = 'public' "
+                "AND indexname = :index AND indexdef LIKE '%INCLUDE%'"
+            ).bindparams(index=f"ix_{table}_bookable")).first()
+            if covering:
+                conn.execute(text(f'DROP INDEX public.ix_{table}_bookable'))
             conn.execute(text(
-                f'CREATE INDEX IF NOT EXISTS ix_{table}_composite_key_date '
-                f'ON public.{table} (composite_key, date)'
+                f'CREATE INDEX IF NOT EXISTS ix_{table}_bookable '
+                f'ON public.{table} (composite_key, date, starts_at) WHERE spaces > 0'
             ))
             conn.execute(text(
-                f'CREATE INDEX IF NOT EXISTS ix_{table}_composite_key_date_active '
-                f'ON public.{table} (composite_key, date) WHERE spaces > 0'
+                f'CREATE INDEX IF NOT EXISTS ix_{table}_date_freshness '
+                f'ON public.{table} (date, composite_key) INCLUDE (last_refreshed, gen_from, gen_to)'
             ))
+            conn.execute(text(
+                f'CREATE INDEX IF NOT EXISTS ix_{table}_gen_to '
+                f'ON public.{table} (gen_to) WHERE gen_to IS NOT NULL'
+            ))
+            conn.execute(text(f'DROP INDEX IF EXISTS public.ix_{table}_composite_key_date'))
+            conn.execute(text(f'DROP INDEX IF EXISTS public.ix_{table}_composite_key_date_active'))
         conn.execute(text(
             "CREATE INDEX IF NOT EXISTS ix_sportsvenue_srid_gist "
             "ON public.sportsvenue USING GIST (srid)"
@@ -340,14 +1163,59 @@ def ensure_performance_indexes(engine):
         conn.commit()
 
 
+def ensure_availability_documents(engine):
+    """Backfills `availability_document` for every sport/venue/date that has current
+    slots but no document yet (a fresh table, or documents introduced on a DB that
+    already holds slots). Otherwise they only appear as each sport's next crawl lands.
+    Written straight into each sport's published generation. Idempotent: existing,
+    unchanged documents aren't rewritten."""
+    with Session(engine) as session:
+        for TableForLoading in _SLOT_MODELS:
+            composite_keys = session.exec(
+                select(TableForLoading.composite_key)
+                .where(TableForLoading.date >= date.today())
+                .where(in_published_generation(TableForLoading))
+                .distinct()
+            ).all()
+            generation = _current_generation(session, TableForLoading.__tablename__)
+            written = refresh_availability_documents(session, TableForLoading, generation, composite_keys)
+            logging.info(f"Availability documents for {TableForLoading.__tablename__}: {written} written")
+        session.commit()
+
+
+def ensure_venue_freshness(engine):
+    """Backfills `venue_freshness` for sport/venue/dates with published slots but no
+    freshness row yet, so health and search have it before each sport's next crawl.
+    Idempotent: venue/dates that already have a row are left alone."""
+    with Session(engine) as session:
+        for TableForLoading in _SLOT_MODELS:
+            sport = TableForLoading.__tablename__
+            written = record_venue_freshness(
+                session,
+                sport,
+                _current_generation(session, sport),
+                f'''(SELECT t.* FROM public.{sport} t
+                    WHERE t.date >= CURRENT_DATE
+                    AND {published_generation_sql("t", ":generation")}
+                    AND NOT EXISTS (
+                        SELECT 1 FROM public.venue_freshness f
+                        WHERE f.sport = :sport AND f.composite_key = t.composite_key AND f.date = t.date
+                    ))''',
+            )
+            logging.info(f"Venue freshness for {sport}: {written} rows backfilled")
+        session.commit()
+
+
 def initialize_db_and_tables(engine):
     create_db_and_tables(engine)
+    truncate_table(engine, table=VenueFreshness)
+    truncate_table(engine, table=AvailabilityDocument)
     truncate_table(engine, table=BadmintonMasterTable)
     truncate_table(engine, table=SquashMasterTable)
     truncate_table(engine, table=PickleballMasterTable)
     truncate_table(engine, table=PadelMasterTable)
     truncate_table(engine, table=SportsVenue)
-    load_sports_centre_mappings(engine)
+    sync_sports_venues(engine)
 
 
 def get_all_sports_venues(engine) -> List[SportsVenue]:
@@ -358,45 +1226,54 @@ def get_all_sports_venues(engine) -> List[SportsVenue]:
 
 
 @timeit
-def truncate_by_composite_key_and_reload(slots_from_all_venues, TableForLoading: sqlmodel.main.SQLModelMetaclass):
+def truncate_by_composite_key_and_reload(
+    slots_from_all_venues, TableForLoading: sqlmodel.main.SQLModelMetaclass, generation: Optional[int] = None
+):
     """
-    Deletes rows for matching composite_key values in TableForLoading 
-    and inserts fresh slots for those keys.
+    Replaces rows for matching composite_key values in TableForLoading
+    with fresh slots for those keys, in crawl `generation` (published on its own when
+    not given). The replaced rows are closed rather than deleted, so readers keep
+    seeing them until the generation is published.
     """
     if not slots_from_all_venues:
         logging.warning("No slots provided for `Truncate by Composite Key and Reload`; skipping.")
         return
 
+    if generation is None:
+        with crawl_generation(TableForLoading) as generation:
+            return truncate_by_composite_key_and_reload(slots_from_all_venues, TableForLoading, generation)
+
     # Collect unique composite keys from incoming data
     composite_keys_to_delete = {slots.composite_key for slots in slots_from_all_venues}
 
     with Session(engine) as session:
-        # Delete only matching composite_key rows
-        delete_stmt = delete(TableForLoading).where(
-            TableForLoading.composite_key.in_(composite_keys_to_delete)
+        # Close only matching composite_key rows
+        close_stmt = (
+            update(TableForLoading)
+            .where(TableForLoading.composite_key.in_(composite_keys_to_delete))
+            .where(TableForLoading.gen_to.is_(None))
+            .values(gen_to=generation)
         )
-        deleted_count = session.exec(delete_stmt)
-        logging.info(f"Deleted {deleted_count.rowcount} rows from {TableForLoading.__tablename__} for composite_keys={composite_keys_to_delete}")
-
-        # Insert new rows
-        for slots in slots_from_all_venues:
-            orm_object = TableForLoading(
-                uid=str(uuid.uuid4()),
-                composite_key=slots.composite_key,
-                category=slots.category,
-                starting_time=slots.starting_time,
-                ending_time=slots.ending_time,
-                date=slots.date,
-                price=slots.price,
-                spaces=slots.spaces,
-                last_refreshed=slots.last_refreshed,
-                booking_url=slots.booking_url,
-                starts_at=datetime.combine(slots.date, slots.starting_time),
-            )
-            session.add(orm_object)
+        closed_count = session.exec(close_stmt)
+        logging.info(f"Closed {closed_count.rowcount} rows in {TableForLoading.__tablename__} for composite_keys={composite_keys_to_delete}")
+
+        _add_slot_versions(session, slots_from_all_venues, TableForLoading, generation)
+        session.flush()
+        _log_reload_changes(session, TableForLoading, generation, composite_keys_to_delete, datetime.now())
+        record_venue_freshness(
+            session,
+            TableForLoading.__tablename__,
+            generation,
+            f"(SELECT * FROM public.{TableForLoading.__tablename__} "
+            f"WHERE gen_from = :generation AND composite_key = ANY(:keys))",
+            keys=list(composite_keys_to_delete),
+        )
+        refresh_availability_documents(session, TableForLoading, generation, composite_keys_to_delete)
 
         session.commit()
-        logging.success(f"Reloaded {len(slots_from_all_venues)} slots into {TableForLoading.__tablename__}")
+        logging.success(
+            f"Reloaded {len(slots_from_all_venues)} slots into {TableForLoading.__tablename__} (generation {generation})"
+        )
 
 
 def delete_past_slots(TableForLoading: sqlmodel.main.SQLModelMetaclass) -> int:
@@ -407,19 +1284,98 @@ def delete_past_slots(TableForLoading: sqlmodel.main.SQLModelMetaclass) -> int:
     Without this, each day the date that ages out of the crawl window is never
     touched again and lingers forever, so the table grows unbounded. Padel — the
     highest-volume sport — hit the DB size limit within ~2 weeks (over half its
-    rows were past-date orphans). Runs every pipeline for every sport.
+    rows were past-date orphans). Runs every pipeline for every sport, and also
+    rolls the sport's expired slot changes up (`rollup_slot_changes`).
     """
     with Session(engine) as session:
         result = session.exec(
             delete(TableForLoading).where(TableForLoading.date < date.today())
         )
+        session.exec(
+            delete(AvailabilityDocument)
+            .where(AvailabilityDocument.sport == TableForLoading.__tablename__)
+            .where(AvailabilityDocument.date < date.today())
+        )
+        session.exec(
+            delete(VenueFreshness)
+            .where(VenueFreshness.sport == TableForLoading.__tablename__)
+            .where(VenueFreshness.date < date.today())
+        )
         session.commit()
         logging.info(
             f"Housekeeping: deleted {result.rowcount} past-date rows from {TableForLoading.__tablename__}"
         )
-        return result.rowcount
+    rollup_slot_changes(TableForLoading.__tablename__)
+    return result.rowcount
+
+
+# Raw `slot_changes` rows are kept this long, then folded into `slot_change_daily`.
+SLOT_CHANGE_RETENTION = timedelta(days=14)
+
+
+def rollup_slot_changes(sport: str, retention: timedelta = SLOT_CHANGE_RETENTION) -> int:
+    """Housekeeping: moves `slot_changes` rows for `sport` older than `retention` into
+    per-venue daily totals in `slot_change_daily`, in one statement (the DELETE's
+    RETURNING feeds the aggregate, so rows are never counted twice or lost). Days
+    already rolled up are added to, so it is safe to run on every pipeline run.
+    Returns the number of raw rows rolled up.
+    """
+    with Session(engine) as session:
+        result = session.execute(text('''
+            WITH expired AS (
+                DELETE FROM public.slot_changes
+                WHERE sport = :sport AND recorded_at < :cutoff
+                RETURNING composite_key, starts_at, kind, spaces, delta, recorded_at
+            ), daily AS (
+                INSERT INTO public.slot_change_daily AS d (
+                    sport, composite_key, day, appeared, disappeared, bookings, releases,
+                    spaces_booked, spaces_released, sold_out, booking_lead_minutes
+                )
+                SELECT
+                    :sport, composite_key, recorded_at::date,
+                    count(*) FILTER (WHERE kind = 'a'),
+                    count(*) FILTER (WHERE kind = 'd'),
+                    count(*) FILTER (WHERE kind = 'c' AND delta < 0),
+                    count(*) FILTER (WHERE kind = 'c' AND delta > 0),
+                    COALESCE(sum(-delta) FILTER (WHERE kind = 'c' AND delta < 0), 0),
+                    COALESCE(sum(delta) FILTER (WHERE kind = 'c' AND delta > 0), 0),
+                    count(*) FILTER (WHERE kind IN ('c', 'd') AND spaces = 0),
+                    COALESCE(sum(extract(epoch FROM starts_at - recorded_at) / 60)
+                        FILTER (WHERE kind = 'c' AND delta < 0), 0)::bigint
+                FROM expired
+                GROUP BY composite_key, recorded_at::date
+                ON CONFLICT (sport, composite_key, day) DO UPDATE SET
+                    appeared = d.appeared + excluded.appeared,
+                    disappeared = d.disappeared + excluded.disappeared,
+                    bookings = d.bookings + excluded.bookings,
+                    releases = d.releases + excluded.releases,
+                    spaces_booked = d.spaces_booked + excluded.spaces_booked,
+                    spaces_released = d.spaces_released + excluded.spaces_released,
+                    sold_out = d.sold_out + excluded.sold_out,
+                    booking_lead_minutes = d.booking_lead_minutes + excluded.booking_lead_minutes
+            )
+            SELECT count(*) FROM expired
+        ''').bindparams(sport=sport, cutoff=datetime.now() - retention))
+        rolled_up = result.scalar_one()
+        session.commit()
+    if rolled_up:
+        logging.info(f"Housekeeping: rolled {rolled_up} {sport} slot changes up into daily totals")
+    return rolled_up
 
 
 if __name__ == "__main__":
-    logging.info("Database being initialised, cache deleted and mappings reloaded")
-    initialize_db_and_tables(engine)
+    parser = argparse.ArgumentParser(description="Database maintenance tasks")
+    parser.add_argument(
+        "--task",
+        choices=["reset", "sync-venues"],
+        default="reset",
+        help="reset: truncate every table and reload venues; sync-venues: apply venues.json changes only",
+    )
+    args = parser.parse_args()
+
+    if args.task == "sync-venues":
+        create_db_and_tables(engine)
+        sync_sports_venues(engine)
+    else:
+        logging.info("Database being initialised, cache deleted and mappings reloaded")
+        initialize_db_and_tables(engine)
@@ -1,121 +1,131 @@
 import json
 from datetime import date, datetime, time, timedelta
-from itertools import groupby
-from operator import attrgetter
-from typing import List
+from typing import Dict, List, Optional
 from zoneinfo import ZoneInfo
 
 import httpx
 from PIL.TiffTags import lookup
 from pydantic import BaseModel
 from rich import print
+from sqlalchemy.dialects.postgresql import JSONB
 
 import sportscanner.storage.postgres.database as db
 import sportscanner.storage.postgres.tables
 from sportscanner.crawlers.pipeline import *
 
 
-def generate_venue_lookup() -> dict:
-    venues: List[sportscanner.storage.postgres.tables.SportsVenue] = db.get_all_sports_venues(db.engine)
-    reference_dict = {
-        venue.composite_key: {
-            "organisation": venue.organisation,
-            "venue_name": venue.venue_name,
-            "address": venue.address,
-        }
-        for venue in venues
+# ORDER BY for each `SortByOptions` value, on typed columns: after date, by the numeric
+# price of the venue's first slot (as displayed) or by distance; composite_key breaks ties.
+_SEARCH_ORDER = {
+    "distance": "d.date, v.distance, d.composite_key",
+    "price": "d.date, w.price_value NULLS LAST, d.composite_key",
+}
+
+
+def search_documents_query(
+        sport: str,
+        venue_distances: Dict[str, float],
+        search_date: date,
+        sort_by: str = "distance",
+        starting: Optional[time] = None,
+        ending: Optional[time] = None,
+        now: Optional[datetime] = None,
+        until: Optional[date] = None,
+):
+    """Search results for the venues in `venue_distances` (composite_key -> distance in
+    miles) on `search_date` (through `until`, when given): one row per venue/date from
+    its `AvailabilityDocument`, with the availability array cut down to slots inside
+    [starting, ending] that start after `now` (order preserved), the first of those
+    slots' price as displayed and as a number, and the earliest start. Venue/dates with
+    no such slot are left out.
+    Rows come back in response order for `sort_by` ("distance" or "price").
+
+    `last_refreshed` comes from `VenueFreshness`, which the pipeline updates every run;
+    a document is only rewritten when its availability changes."""
+    if sort_by not in _SEARCH_ORDER:
+        raise ValueError(f"Unsupported sort order {sort_by!r}; expected one of {sorted(_SEARCH_ORDER)}")
+    slot_filters, params = [], {}
+    if starting is not None:
+        slot_filters.append("(e.entry ->> 'startingTime')::time >= :starting")
+        params["starting"] = starting
+    if ending is not None:
+        slot_filters.append("(e.entry ->> 'endingTime')::time <= :ending")
+        params["ending"] = ending
+    if now is not None:
+        slot_filters.append("d.date + (e.entry ->> 'startingTime')::time > :now")
+        params["now"] = now
+    return db.text(f'''
+        SELECT
+            d.composite_key,
+            d.date,
+            v.distance,
+            w.availability,
+            w.availability -> 0 ->> 'price' AS price,
+            w.price_value,
+            w.earliest_start,
+            coalesce(f.last_refreshed, d.last_refreshed) AS last_refreshed
+        FROM public.availability_document d
+        JOIN unnest(CAST(:keys AS text[]), CAST(:distances AS float8[])) AS v(composite_key, distance)
+            ON v.composite_key = d.composite_key
+        LEFT JOIN public.venue_freshness f
+            ON f.sport = d.sport AND f.composite_key = d.composite_key AND f.date = d.date
+        CROSS JOIN LATERAL (
+            SELECT
+                jsonb_agg(e.entry ORDER BY e.n) AS availability,
+                (array_agg(substring(e.entry ->> 'price' FROM '[0-9]+[.]?[0-9]*')::numeric ORDER BY e.n))[1] AS price_value,
+                min((e.entry ->> 'startingTime')::time) AS earliest_start
+            FROM jsonb_array_elements(d.availability) WITH ORDINALITY AS e(entry, n)
+            {"WHERE " + " AND ".join(slot_filters) if slot_filters else ""}
+        ) w
+        WHERE d.sport = :sport AND d.date BETWEEN :search_date AND :until
+        AND {db.published_generation_sql("d", db.current_generation_sql(":sport"))}
+        AND w.availability IS NOT NULL
+        ORDER BY {_SEARCH_ORDER[sort_by]}
+    ''').bindparams(
+        sport=sport,
+        search_date=search_date,
+        until=until or search_date,
+        keys=list(venue_distances),
+        distances=[float(distance) for distance in venue_distances.values()],
+        **params,
+    ).columns(availability=JSONB)
+
+
+HEALTHCHECK_STALE_AFTER = timedelta(minutes=30)
+
+
+def healthcheck_deadline(last_refreshed: datetime) -> datetime:
+    """When a venue refreshed at `last_refreshed` turns "deprecated", in UK time."""
+    # Make last_refreshed timezone-aware in UK time if it's naive
+    if last_refreshed.tzinfo is None:
+        last_refreshed = last_refreshed.replace(tzinfo=ZoneInfo("Europe/London"))
+    return last_refreshed + HEALTHCHECK_STALE_AFTER
+
+
+def _healthcheck(last_refreshed: datetime) -> str:
+    now_uk = datetime.now(ZoneInfo("Europe/London"))
+    return "deprecated" if now_uk > healthcheck_deadline(last_refreshed) else "ok"
+
+
+def format_search_row_for_ui(row, lookup_dict: dict) -> dict:
+    """One search response item from a `search_documents_query` row, with venue
+    metadata attached from `lookup_dict`."""
+    # Populating metadata from venues into main availability items
+    lookup_data = lookup_dict.get(row.composite_key) or {}
+    return {
+        "composite_key": row.composite_key,
+        "venue": lookup_data.get("venue_name", ""),
+        "address": lookup_data.get("address", ""),
+        "distance": row.distance,
+        "price": row.price,
+        "organization": lookup_data.get("organisation", ""),
+        "date": row.date.strftime("%a, %b %d"),
+        "availability": row.availability,
+        "last_refreshed": row.last_refreshed.isoformat(),
+        "healthcheck": _healthcheck(row.last_refreshed)
     }
-    return reference_dict
-
-
-def group_slots_by_attributes(slots, attributes):
-    """
-    Group rows into a list of lists based on multiple attributes.
-
-    :param slots: List of objects to group.
-    :param attributes: List or tuple of attribute names to group by.
-    :return: List of grouped lists.
-    """
-    # Sort the slots by the attributes to ensure proper grouping
-    slots_sorted = sorted(slots, key=attrgetter(*attributes))
-
-    # Group the slots based on the attributes
-    grouped = groupby(
-        slots_sorted, key=lambda slot: tuple(getattr(slot, attr) for attr in attributes)
-    )
-
-    # Convert to a list of lists
-    grouped_slots = [list(group) for _, group in grouped]
-    return grouped_slots
-
-
-def sort_and_format_grouped_slots_for_ui(
-        grouped_slots, distance_from_venues_reference
-        ) -> List[dict]:
-    processed_slots: List = []
-    # Was called once per group inside the loop below: a full `SELECT * FROM
-    # sportsvenue` re-run for every distinct (venue, date) result, dominating
-    # search latency (29 groups -> 29 redundant full-table round trips). Venue
-    # metadata doesn't change per-group, so look it up once per call.
-    lookup_dict = generate_venue_lookup()
-    for groups in grouped_slots:
-        # Sort the groups based on 'date' and 'starting_time'
-        sorted_slots_in_group = sorted(
-            groups, key=attrgetter("date", "starting_time")
-        )
-
-        # Find the first slot with spaces > 0
-        sorted_slots_with_spaces = next(
-            (
-                sorted_slots_in_group[i:]
-                for i, elem in enumerate(sorted_slots_in_group)
-                if elem.spaces > 0
-            ),
-            [],  # Default to empty list if no slot with spaces > 0 is found
-        )
-        # If there are no slots with available spaces, skip the group
-        if not sorted_slots_with_spaces:
-            continue
-        # Get the earliest slot in the group (the first element in sorted list with spaces > 0)
-        earliest_slot_in_group: sportscanner.storage.postgres.tables.BadmintonMasterTable = sorted_slots_with_spaces[0]
-        availabilities = []
-        for x in sorted_slots_with_spaces:
-            _available: bool = True if x.spaces > 0 else False
-            availabilities.append(
-                {
-                    "startingTime": x.starting_time.strftime("%H:%M"),
-                    "endingTime": x.ending_time.strftime("%H:%M"),
-                    "available": _available,
-                    "bookingUrl": x.booking_url,
-                    "price": x.price,
-                }
-            )
-
-        # Populating metadata from venues into main availability items
-        lookup_data = lookup_dict.get(earliest_slot_in_group.composite_key, None)
-
-        now_uk = datetime.now(ZoneInfo("Europe/London"))
-        last_refreshed = earliest_slot_in_group.last_refreshed
-
-        # Make last_refreshed timezone-aware in UK time if it's naive
-        if last_refreshed.tzinfo is None:
-            last_refreshed = last_refreshed.replace(tzinfo=ZoneInfo("Europe/London"))
-        healthcheck = "deprecated" if now_uk - last_refreshed > timedelta(minutes=30) else "ok"
-
-        processed_slots.append(
-            {
-                "composite_key": earliest_slot_in_group.composite_key,
-                "venue": lookup_data.get("venue_name", ""),
-                "address": lookup_data.get("address", ""),
-                "distance": distance_from_venues_reference.get(
-                    earliest_slot_in_group.composite_key, 99
-                ),
-                "price": earliest_slot_in_group.price,
-                "organization": lookup_data.get("organisation", ""),
-                "date": earliest_slot_in_group.date.strftime("%a, %b %d"),
-                "availability": availabilities,
-                "last_refreshed": earliest_slot_in_group.last_refreshed.isoformat(),
-                "healthcheck": healthcheck
-            }
-        )
-    return processed_slots
+
+
+def format_search_rows_for_ui(rows, lookup_dict: dict) -> List[dict]:
+    """`format_search_row_for_ui` for every row, in the rows' order."""
+    return [format_search_row_for_ui(row, lookup_dict) for row in rows]
@@ -0,0 +1,292 @@
+"""Synthetic data for benchmarking the storage layer at scale, without running crawls.
+
+Seeds N venues (with PostGIS `srid`) and M slots per venue/date into the four sport
+tables, then optionally replays a sequence of crawl runs that mutate availability
+through the real write path (`crawl_generation` + `insert_records_to_table`), so
+upserts, stale marking, document refreshes, garbage collection and housekeeping can
+be timed at 10x-100x current volume.
+
+Distributions are loosely modelled on the real providers: venues clustered around
+central London, courts and session lengths per sport, prices by operator tier with
+peak-time uplift, and less availability at peak (weekday evenings, weekends).
+Everything is derived from `--seed`, so runs are reproducible.
+
+Writes to the configured database (DB_CONNECTION_STRING) and refuses to run with
+ENV=prod. Synthetic venues live under `https://synthetic-*.example` organisation
+websites and `--clear` removes them (and their slots) again.
+
+Usage:
+    python sportscanner/storage/postgres/seeder.py --venues 2000 --days 14 \\
+        --slots-per-day 24 --runs 5 --churn 0.05
+"""
+import argparse
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import sqlmodel
+from sqlalchemy import insert, text
+
+import sportscanner.storage.postgres.database as db
+from sportscanner.crawlers.parsers.core.schemas import UnifiedParserSchema
+from sportscanner.logger import logging
+from sportscanner.storage.postgres.tables import (
+    BadmintonMasterTable,
+    PadelMasterTable,
+    PickleballMasterTable,
+    SportsVenue,
+    SquashMasterTable,
+)
+from sportscanner.storage.postgres.utils import generate_composite_key
+from sportscanner.variables import settings
+
+SYNTHETIC_WEBSITE_PREFIX = "https://synthetic-"
+
+
+@dataclass(frozen=True)
+class SportProfile:
+    table: sqlmodel.main.SQLModelMetaclass
+    share_of_venues: float  # fraction of venues offering the sport
+    courts: Tuple[int, int]  # courts per venue (min, max)
+    sessions: Tuple[Tuple[str, int], ...]  # (category, minutes)
+    price_range: Tuple[float, float]  # off-peak price per session, by operator tier
+
+
+SPORT_PROFILES: Dict[str, SportProfile] = {
+    "badminton": SportProfile(BadmintonMasterTable, 0.8, (3, 8), (("Badminton 40min", 40), ("Badminton 60min", 60)), (7.5, 16.0)),
+    "squash": SportProfile(SquashMasterTable, 0.35, (1, 4), (("Squash 40min", 40),), (7.0, 12.0)),
+    "pickleball": SportProfile(PickleballMasterTable, 0.25, (2, 6), (("Pickleball 60min", 60),), (6.0, 14.0)),
+    "padel": SportProfile(PadelMasterTable, 0.2, (2, 6), (("Padel 60min", 60), ("Padel 90min", 90)), (24.0, 48.0)),
+}
+
+# Central London; venues scatter around it (roughly a 15-20 mile radius).
+_CENTRE = (51.5072, -0.1276)
+_SPREAD = (0.09, 0.14)
+
+# A slot's natural key: (composite_key, date, starting_time, ending_time, category).
+# Crawl state maps it to a mutable [price, spaces, courts, peak].
+SlotKey = Tuple[str, date, time, time, str]
+
+
+@dataclass
+class SyntheticCrawl:
+    """Availability state for every synthetic slot; each `run` mutates and returns it
+    the way a crawl of the real providers would see it."""
+    rng: random.Random
+    churn: float
+    drop_rate: float
+    slots: Dict[str, Dict[SlotKey, list]] = field(default_factory=dict)
+
+    def run(self, sport: str) -> List[UnifiedParserSchema]:
+        now = datetime.now()
+        response = []
+        for key, state in self.slots[sport].items():
+            price, spaces, courts, peak = state
+            if self.rng.random() < self.churn:
+                state[1] = spaces = _draw_spaces(self.rng, courts, peak)
+            if self.rng.random() < self.drop_rate:
+                continue  # not returned this run: stale-marked by the write path
+            composite_key, slot_date, starting_time, ending_time, category = key
+            response.append(UnifiedParserSchema.model_construct(
+                category=category,
+                starting_time=starting_time,
+                ending_time=ending_time,
+                date=slot_date,
+                price=price,
+                spaces=spaces,
+                composite_key=composite_key,
+                last_refreshed=now,
+                booking_url=f"https://example.com/book/{composite_key}",
+            ))
+        return response
+
+
+def _is_peak(slot_date: date, starting_time: time) -> bool:
+    if slot_date.weekday() >= 5:
+        return 9 <= starting_time.hour < 18
+    return 17 <= starting_time.hour < 21
+
+
+def _draw_spaces(rng: random.Random, courts: int, peak: bool) -> int:
+    probability_free = 0.2 if peak else 0.6
+    return sum(rng.random() < probability_free for _ in range(courts))
+
+
+def _session_starts(slot_date: date, minutes: int, count: int) -> List[time]:
+    """`count` start times spread over opening hours (07:00-22:00 weekdays,
+    08:00-21:00 weekends), on 5-minute boundaries."""
+    opens, closes = (8 * 60, 21 * 60) if slot_date.weekday() >= 5 else (7 * 60, 22 * 60)
+    last_start = closes - minutes
+    step = max(5, ((last_start - opens) // max(count - 1, 1)) // 5 * 5)
+    starts = [opens + i * step for i in range(count) if opens + i * step <= last_start]
+    return [time(start // 60, start % 60) for start in starts]
+
+
+def generate_venues(rng: random.Random, count: int) -> List[SportsVenue]:
+    venues = []
+    organisations = max(1, count // 8)
+    for i in range(count):
+        organisation = i % organisations
+        website = f"{SYNTHETIC_WEBSITE_PREFIX}{organisation}.example"
+        slug = f"synthetic-centre-{i}"
+        sports = [sport for sport, profile in SPORT_PROFILES.items() if rng.random() < profile.share_of_venues]
+        venues.append(SportsVenue(
+            composite_key=generate_composite_key([website, slug]),
+            organisation=f"Synthetic Leisure {organisation}",
+            organisation_website=website,
+            venue_name=f"Synthetic Centre {i}",
+            slug=slug,
+            postcode="SE1 8UL",
+            address=f"{i} Synthetic Road, London",
+            latitude=rng.gauss(_CENTRE[0], _SPREAD[0]),
+            longitude=rng.gauss(_CENTRE[1], _SPREAD[1]),
+            sports=sports or ["badminton"],
+        ))
+    return venues
+
+
+def seed_venues(engine, venues: List[SportsVenue]):
+    """Bulk-inserts venues and populates `srid` in the same transaction."""
+    with engine.begin() as conn:
+        conn.execute(insert(SportsVenue.__table__), [venue.model_dump() for venue in venues])
+        conn.execute(text(
+            "UPDATE public.sportsvenue SET srid = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326) "
+            "WHERE srid IS NULL AND organisation_website LIKE :prefix"
+        ).bindparams(prefix=f"{SYNTHETIC_WEBSITE_PREFIX}%"))
+    logging.success(f"Seeded {len(venues)} synthetic venues")
+
+
+def generate_slots(
+    rng: random.Random, venues: List[SportsVenue], days: int, slots_per_day: int
+) -> Dict[str, Dict[SlotKey, list]]:
+    """Per sport, the initial availability state of every slot: `slots_per_day` slots
+    per venue/date, split across the sport's session lengths."""
+    today = date.today()
+    tiers = {venue.organisation: rng.random() for venue in venues}
+    state: Dict[str, Dict[SlotKey, list]] = {sport: {} for sport in SPORT_PROFILES}
+    for venue in venues:
+        tier = tiers[venue.organisation]
+        for sport in venue.sports:
+            profile = SPORT_PROFILES[sport]
+            courts = rng.randint(*profile.courts)
+            low, high = profile.price_range
+            base_price = low + (high - low) * tier
+            per_session = max(1, slots_per_day // len(profile.sessions))
+            for offset in range(days):
+                slot_date = today + timedelta(days=offset)
+                for category, minutes in profile.sessions:
+                    price_scale = minutes / profile.sessions[0][1]
+                    for starting_time in _session_starts(slot_date, minutes, per_session):
+                        peak = _is_peak(slot_date, starting_time)
+                        ending = datetime.combine(slot_date, starting_time) + timedelta(minutes=minutes)
+                        price = base_price * price_scale * (1.3 if peak else 1.0)
+                        key = (venue.composite_key, slot_date, starting_time, ending.time(), category)
+                        state[sport][key] = [f"£{price:.2f}", _draw_spaces(rng, courts, peak), courts, peak]
+    return state
+
+
+def seed_slots(engine, state: Dict[str, Dict[SlotKey, list]], batch_size: int = 10_000):
+    """Bulk-loads the initial state into the slot tables (visible in the published
+    generation), then builds their availability documents. Not timed: this stands
+    in for history, the replayed runs are what get measured."""
+    now = datetime.now()
+    with engine.begin() as conn:
+        for sport, slots in state.items():
+            table = SPORT_PROFILES[sport].table.__table__
+            rows = [
+                dict(
+                    composite_key=composite_key, date=slot_date, starting_time=starting_time,
+                    ending_time=ending_time, category=category, price=price, spaces=spaces,
+                    last_refreshed=now, booking_url=f"https://example.com/book/{composite_key}",
+                    starts_at=datetime.combine(slot_date, starting_time), gen_from=0,
+                )
+                for (composite_key, slot_date, starting_time, ending_time, category), (price, spaces, _, _) in slots.items()
+            ]
+            for start in range(0, len(rows), batch_size):
+                conn.execute(insert(table), rows[start:start + batch_size])
+            logging.success(f"Seeded {len(rows)} synthetic {sport} slots")
+    db.ensure_availability_documents(engine)
+    db.ensure_venue_freshness(engine)
+
+
+def vacuum_analyze(engine):
+    """Fresh statistics and visibility map, so plans match a settled production table."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in (*db._SLOT_TABLES, "availability_document", "venue_freshness", "sportsvenue"):
+            conn.execute(text(f"VACUUM ANALYZE public.{table}"))
+
+
+def replay_crawl_runs(crawl: SyntheticCrawl, runs: int, sports: Optional[List[str]] = None) -> List[dict]:
+    """Replays `runs` crawl runs per sport through the pipeline's write path and returns
+    per-run timings and `UpsertStats`."""
+    results = []
+    for run in range(1, runs + 1):
+        for sport in sports or list(SPORT_PROFILES):
+            table = SPORT_PROFILES[sport].table
+            response = crawl.run(sport)
+            db.delete_past_slots(table)
+            tic = perf_counter()
+            with db.crawl_generation(table) as generation:
+                stats = db.insert_records_to_table(response, table, generation)
+            elapsed = perf_counter() - tic
+            results.append({"run": run, "sport": sport, "slots": len(response), "seconds": elapsed, "stats": stats})
+            logging.info(f"Run {run} {sport}: {len(response)} slots written in {elapsed:.2f}s ({stats})")
+    return results
+
+
+def clear_synthetic_data(engine):
+    synthetic_keys = (
+        "SELECT composite_key FROM public.sportsvenue WHERE organisation_website LIKE :prefix"
+    )
+    with engine.begin() as conn:
+        for table in (*db._SLOT_TABLES, "availability_document", "availability_bitmap", "slot_changes", "venue_freshness"):
+            conn.execute(text(
+                f"DELETE FROM public.{table} WHERE composite_key IN ({synthetic_keys})"
+            ).bindparams(prefix=f"{SYNTHETIC_WEBSITE_PREFIX}%"))
+        removed = conn.execute(text(
+            "DELETE FROM public.sportsvenue WHERE organisation_website LIKE :prefix"
+        ).bindparams(prefix=f"{SYNTHETIC_WEBSITE_PREFIX}%"))
+    logging.warning(f"Removed {removed.rowcount} synthetic venues and their slots")
+
+
+def seed(venues: int, days: int, slots_per_day: int, seed_value: int = 42, churn: float = 0.05,
+         drop_rate: float = 0.01) -> Tuple[List[SportsVenue], SyntheticCrawl]:
+    """Clears any previous synthetic data and seeds a fresh set into `db.engine`.
+    Returns the venues and a `SyntheticCrawl` positioned at the seeded state."""
+    if settings.ENV == "prod":
+        raise RuntimeError("Refusing to seed synthetic data with ENV=prod")
+    rng = random.Random(seed_value)
+    db.create_db_and_tables(db.engine)
+    clear_synthetic_data(db.engine)
+    synthetic_venues = generate_venues(rng, venues)
+    seed_venues(db.engine, synthetic_venues)
+    crawl = SyntheticCrawl(rng=rng, churn=churn, drop_rate=drop_rate)
+    crawl.slots = generate_slots(rng, synthetic_venues, days, slots_per_day)
+    seed_slots(db.engine, crawl.slots)
+    vacuum_analyze(db.engine)
+    return synthetic_venues, crawl
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic venues/slots and replay crawl runs")
+    parser.add_argument("--venues", type=int, default=200)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--slots-per-day", type=int, default=24, help="Slots per venue/date for each sport")
+    parser.add_argument("--runs", type=int, default=0, help="Crawl runs to replay after seeding")
+    parser.add_argument("--churn", type=float, default=0.05, help="Share of slots whose availability changes per run")
+    parser.add_argument("--drop-rate", type=float, default=0.01, help="Share of slots missing from each run's response")
+    parser.add_argument("--sports", nargs="+", choices=list(SPORT_PROFILES), help="Sports to replay (default: all)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clear", action="store_true", help="Only remove previously seeded synthetic data")
+    args = parser.parse_args()
+
+    if args.clear:
+        if settings.ENV == "prod":
+            raise RuntimeError("Refusing to touch synthetic data with ENV=prod")
+        clear_synthetic_data(db.engine)
+    else:
+        _, synthetic_crawl = seed(args.venues, args.days, args.slots_per_day, args.seed, args.churn, args.drop_rate)
+        if args.runs:
+            replay_crawl_runs(synthetic_crawl, args.runs, args.sports)
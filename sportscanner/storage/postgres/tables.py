@@ -1,10 +1,37 @@
 from datetime import date, datetime, time, timedelta
 from typing import List, Optional
 
-from sqlalchemy import Column, String
+from sqlalchemy import CHAR, BigInteger, Column, Index, Integer, LargeBinary, SmallInteger, String
 import sqlalchemy
 from sqlmodel import Field, Session, SQLModel, create_engine, delete, select, Column, String
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, BIT, JSONB
+
+
+def _natural_key_index(table_name: str) -> Index:
+    """One bookable slot: a venue, a date, a start/end time and an activity category.
+    The same slot crawled twice (in one run or a week apart) always maps to the same
+    open row (`gen_to IS NULL`, see `GenerationColumns`); older, superseded versions
+    of it are the only other rows that may share the key."""
+    return Index(
+        f"ux_{table_name}_open_natural_key",
+        "composite_key", "date", "starting_time", "ending_time", "category",
+        unique=True,
+        postgresql_where=sqlalchemy.text("gen_to IS NULL"),
+    )
+
+
+class GenerationColumns(SQLModel):
+    """Crawl-generation range a row version belongs to (see `database.crawl_generation`).
+
+    A row is part of generation N when `gen_from <= N` and `gen_to` is NULL or > N.
+    A crawl writing generation N+1 never changes a published row in place: it closes
+    the current version (`gen_to = N+1`) and inserts the new one (`gen_from = N+1`),
+    so readers filtering on the published generation (`CrawlGeneration`) keep seeing
+    generation N until the whole crawl is published.
+    """
+    gen_from: int = Field(default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"})
+    gen_to: Optional[int] = Field(default=None, sa_type=BigInteger)
+
 
 class SportsVenue(SQLModel, table=True):
     """Table containing information on Sports centres
@@ -24,11 +51,13 @@ class SportsVenue(SQLModel, table=True):
     __table_args__ = {"schema": "public"}
 
 
-class BadmintonMasterTable(SQLModel, table=True):
+class BadmintonMasterTable(GenerationColumns, table=True):
     """Table contains records of slots fetched from sport centres
     Original Model: UnifiedParserSchema -> Mapped to: SportScanner
     """
-    uid: str = Field(primary_key=True)
+    # Compact surrogate key. Slot identity is the natural key (see
+    # `_natural_key_index`); one key can have several row versions across generations.
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
     category: str
     starting_time: time
     ending_time: time
@@ -45,14 +74,16 @@ class BadmintonMasterTable(SQLModel, table=True):
 
     composite_key: str = Field(default=None, foreign_key="public.sportsvenue.composite_key")
     __tablename__ = "badminton"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (_natural_key_index("badminton"), {"schema": "public"})
 
 
-class SquashMasterTable(SQLModel, table=True):
+class SquashMasterTable(GenerationColumns, table=True):
     """Table contains records of slots fetched from sport centres
     Original Model: UnifiedParserSchema -> Mapped to: SportScanner
     """
-    uid: str = Field(primary_key=True)
+    # Compact surrogate key. Slot identity is the natural key (see
+    # `_natural_key_index`); one key can have several row versions across generations.
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
     category: str
     starting_time: time
     ending_time: time
@@ -69,14 +100,16 @@ class SquashMasterTable(SQLModel, table=True):
 
     composite_key: str = Field(default=None, foreign_key="public.sportsvenue.composite_key")
     __tablename__ = "squash"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (_natural_key_index("squash"), {"schema": "public"})
 
 
-class PickleballMasterTable(SQLModel, table=True):
+class PickleballMasterTable(GenerationColumns, table=True):
     """Table contains records of slots fetched from sport centres
     Original Model: UnifiedParserSchema -> Mapped to: SportScanner
     """
-    uid: str = Field(primary_key=True)
+    # Compact surrogate key. Slot identity is the natural key (see
+    # `_natural_key_index`); one key can have several row versions across generations.
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
     category: str
     starting_time: time
     ending_time: time
@@ -93,14 +126,16 @@ class PickleballMasterTable(SQLModel, table=True):
 
     composite_key: str = Field(default=None, foreign_key="public.sportsvenue.composite_key")
     __tablename__ = "pickleball"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (_natural_key_index("pickleball"), {"schema": "public"})
 
 
-class PadelMasterTable(SQLModel, table=True):
+class PadelMasterTable(GenerationColumns, table=True):
     """Table contains records of slots fetched from sport centres
     Original Model: UnifiedParserSchema -> Mapped to: SportScanner
     """
-    uid: str = Field(primary_key=True)
+    # Compact surrogate key. Slot identity is the natural key (see
+    # `_natural_key_index`); one key can have several row versions across generations.
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
     category: str
     starting_time: time
     ending_time: time
@@ -117,8 +152,178 @@ class PadelMasterTable(SQLModel, table=True):
 
     composite_key: str = Field(default=None, foreign_key="public.sportsvenue.composite_key")
     __tablename__ = "padel"
+    __table_args__ = (_natural_key_index("padel"), {"schema": "public"})
+
+
+class AvailabilityDocument(GenerationColumns, table=True):
+    """One row per (sport, venue, date): that day's bookable slots, pre-grouped and
+    pre-formatted for search by the pipeline (see `refresh_availability_documents`).
+
+    `availability` is the search response's availability array as JSONB (ordered by
+    starting time, only slots with spaces > 0); the remaining columns summarise it.
+    Versioned by crawl generation like the slot tables, so one (sport, venue, date)
+    has at most one open document plus superseded ones awaiting garbage collection.
+    """
+
+    __tablename__ = "availability_document"
+    __table_args__ = (
+        Index("ix_availability_document_lookup", "sport", "composite_key", "date"),
+        Index(
+            "ux_availability_document_open", "sport", "composite_key", "date",
+            unique=True, postgresql_where=sqlalchemy.text("gen_to IS NULL"),
+        ),
+        {"schema": "public"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
+    sport: str
+    composite_key: str = Field(foreign_key="public.sportsvenue.composite_key")
+    date: date
+    availability: list = Field(default_factory=list, sa_column=Column(JSONB, nullable=False))
+    earliest_start: time
+    # Numeric part of the cheapest slot's price string ("£12.80" -> 12.80); None when
+    # no slot has a numeric price (e.g. "Check website").
+    min_price: Optional[float] = None
+    last_refreshed: datetime
+    slot_count: int
+
+
+class AvailabilityBitmap(SQLModel, table=True):
+    """Optional compact encoding of a sport's published availability: one row per
+    (sport, venue, date, session length) instead of one per slot. See
+    `availability_bitmaps.py` for the format; rebuilt from the slot tables, never
+    written by the crawl merge."""
+
+    __tablename__ = "availability_bitmap"
     __table_args__ = {"schema": "public"}
 
+    sport: str = Field(primary_key=True)
+    composite_key: str = Field(primary_key=True)
+    date: date = Field(primary_key=True)
+    minutes: int = Field(primary_key=True, sa_type=SmallInteger)
+    # One bit per 5-minute bucket of the day: a session of `minutes` starting there has spaces.
+    starts: str = Field(sa_type=BIT(288))
+    price_bands: List[int] = Field(sa_column=Column(ARRAY(Integer), nullable=False))
+    band_index: bytes = Field(sa_type=LargeBinary)
+
+
+class VenueFreshness(SQLModel, table=True):
+    """Per (sport, venue, date): when the pipeline last wrote slots for it, how many,
+    and the health of the provider that crawls it. Maintained by the write path in the
+    same transaction as the slot merge (see `record_venue_freshness`), so health checks
+    and search read one small row per venue/date instead of aggregating slot rows."""
+
+    __tablename__ = "venue_freshness"
+    __table_args__ = {"schema": "public"}
+
+    sport: str = Field(primary_key=True)
+    composite_key: str = Field(primary_key=True)
+    date: date = Field(primary_key=True)
+    last_refreshed: datetime
+    slot_count: int
+    bookable_count: int
+    # "ok" when the last write carried slots; otherwise set from the provider's run
+    # stats: "no_data" or "circuit_breaker_tripped" (see `record_provider_status`).
+    provider_status: str = "ok"
+    # Crawl generation that last wrote the row.
+    generation: int = Field(default=0, sa_type=BigInteger)
+
+
+class CrawlGeneration(SQLModel, table=True):
+    """Per-sport pointer to the last published crawl generation. Readers only see slot
+    rows/documents that belong to it; a crawl publishes by bumping it (one row update)."""
+
+    __tablename__ = "crawl_generation"
+    __table_args__ = {"schema": "public"}
+
+    sport: str = Field(primary_key=True)
+    current_generation: int = Field(default=0, sa_type=BigInteger)
+    published_at: Optional[datetime] = None
+
+
+class SlotChange(SQLModel, table=True):
+    """Append-only log of slot transitions, written by `insert_records_to_table` in the
+    same statements as the merge: a slot appearing (`kind` "a"), its spaces changing
+    ("c"), or it disappearing from the provider's response ("d").
+
+    Kept narrow because it grows with every run: the slot is identified by venue,
+    start, length and category rather than the slot table's natural key, spaces and
+    their delta are smallints, and there is no foreign key or btree beyond the primary
+    key (time-range scans use a BRIN index). Rows older than `SLOT_CHANGE_RETENTION`
+    are folded into `SlotChangeDaily` by `rollup_slot_changes`.
+    """
+
+    __tablename__ = "slot_changes"
+    __table_args__ = (
+        Index("ix_slot_changes_recorded_at", "recorded_at", postgresql_using="brin"),
+        {"schema": "public"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
+    sport: str
+    composite_key: str
+    starts_at: datetime
+    minutes: int = Field(sa_type=SmallInteger)
+    category: str
+    kind: str = Field(sa_type=CHAR(1))
+    # Spaces after the transition, and the change from before it (new slots count
+    # from 0, disappeared slots go to 0).
+    spaces: int = Field(sa_type=SmallInteger)
+    delta: int = Field(sa_type=SmallInteger)
+    recorded_at: datetime
+
+
+class SlotChangeDaily(SQLModel, table=True):
+    """Per-venue daily totals of `SlotChange` rows past retention (see
+    `rollup_slot_changes`), keyed on the day the changes were recorded."""
+
+    __tablename__ = "slot_change_daily"
+    __table_args__ = {"schema": "public"}
+
+    sport: str = Field(primary_key=True)
+    composite_key: str = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    appeared: int = 0
+    disappeared: int = 0
+    # Spaces-changed transitions that took spaces away (bookings) or gave them back
+    # (cancellations/releases), and the spaces involved.
+    bookings: int = 0
+    releases: int = 0
+    spaces_booked: int = 0
+    spaces_released: int = 0
+    # Transitions that left a slot with no spaces (changed to 0 or disappeared).
+    sold_out: int = 0
+    # Sum of (starts_at - recorded_at) in minutes over bookings; divide by `bookings`
+    # for the average booking lead time.
+    booking_lead_minutes: int = Field(default=0, sa_type=BigInteger)
+
+
+class CrawlRun(SQLModel, table=True):
+    """One pipeline run for a sport: when it ran, how it ended and what each provider
+    returned (see `database.start_crawl_run` / `finish_crawl_run`)."""
+
+    __tablename__ = "crawl_runs"
+    __table_args__ = (
+        Index("ix_crawl_runs_sport_started_at", "sport", "started_at"),
+        {"schema": "public"},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True, sa_type=BigInteger)
+    sport: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    # running / succeeded / empty / failed / skipped (`database.CrawlRunOutcome`)
+    outcome: str
+    slots_collected: Optional[int] = None
+    # One `ProviderRunStats` per provider: requests, requests with data, slots,
+    # seconds, whether its circuit breaker tripped.
+    providers: list = Field(default_factory=list, sa_column=Column(JSONB, nullable=False, server_default="[]"))
+    # The run's total `UpsertStats` (inserted, changed, unchanged, stale, documents,
+    # reloaded); NULL for runs that loaded nothing.
+    upserts: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
+    error: Optional[str] = None
+
 
 class RefreshMetadata(SQLModel, table=True):
     """Table containing Refresh data, and if refresh is in progress"""
@@ -0,0 +1,144 @@
+"""Process-wide, in-memory registry of the venue table.
+
+`sportsvenue` is about a hundred rows and only changes when `sync_sports_venues`
+applies an edit to the lookup sheet, yet search, the venue endpoints, the MCP tools
+and analytics each re-read it (`SELECT ... FROM sportsvenue`) on every call. The
+registry loads it once per process (at API startup, or on first use) and serves
+lookups by composite_key, sport and organisation from dicts, with no DB round trip.
+
+Refreshing: `sync_sports_venues` publishes a new venue version to Valkey whenever
+it changes the table. At most every `VENUE_REGISTRY_CHECK_SECONDS` a lookup compares
+that version with the one the registry was loaded at and reloads if they differ.
+Without Valkey there is no version to compare, so the registry is also reloaded
+once it is `VENUE_REGISTRY_MAX_AGE_SECONDS` old. `reload_venue_registry` (and its
+async counterpart) force a reload.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Dict, Iterable, List, Optional
+
+import sportscanner.storage.postgres.async_database as async_db
+import sportscanner.storage.postgres.database as db
+from sportscanner.cache import cache_get_json, cache_get_json_async
+from sportscanner.logger import logging
+from sportscanner.storage.postgres.tables import SportsVenue
+from sportscanner.variables import settings
+
+
+@dataclass(frozen=True)
+class VenueRegistry:
+    """One loaded snapshot of the venue table. Never mutated; a reload swaps in a
+    new one, so a request keeps a consistent view for as long as it holds it."""
+    version: Optional[str]
+    loaded_at: float
+    by_key: Dict[str, SportsVenue]
+    by_sport: Dict[str, List[SportsVenue]]
+    by_organisation: Dict[str, List[SportsVenue]]
+    # composite_key -> the venue fields search responses carry (see
+    # `format_search_rows_for_ui`)
+    lookup: Dict[str, dict]
+
+    @classmethod
+    def from_venues(cls, venues: Iterable[SportsVenue], version: Optional[str]) -> "VenueRegistry":
+        by_key, by_sport, by_organisation = {}, defaultdict(list), defaultdict(list)
+        for venue in sorted(venues, key=lambda v: v.composite_key):
+            by_key[venue.composite_key] = venue
+            by_organisation[venue.organisation].append(venue)
+            for sport in venue.sports or []:
+                by_sport[sport].append(venue)
+        lookup = {
+            venue.composite_key: {
+                "organisation": venue.organisation,
+                "venue_name": venue.venue_name,
+                "address": venue.address,
+            }
+            for venue in by_key.values()
+        }
+        return cls(version, monotonic(), by_key, dict(by_sport), dict(by_organisation), lookup)
+
+    @property
+    def venues(self) -> List[SportsVenue]:
+        return list(self.by_key.values())
+
+    def get(self, composite_key: str) -> Optional[SportsVenue]:
+        return self.by_key.get(composite_key)
+
+    def for_sport(self, sport: str) -> List[SportsVenue]:
+        return self.by_sport.get(sport, [])
+
+    def for_sports(self, sports: Iterable[str]) -> List[SportsVenue]:
+        """Venues offering any of `sports`."""
+        sports = set(sports)
+        return [venue for venue in self.by_key.values() if sports.intersection(venue.sports or [])]
+
+    def for_organisation(self, organisation: str) -> List[SportsVenue]:
+        return self.by_organisation.get(organisation, [])
+
+
+_registry: Optional[VenueRegistry] = None
+_checked_at = 0.0
+
+
+def _published_version() -> Optional[str]:
+    return cache_get_json(db.VENUE_VERSION_KEY)
+
+
+async def _published_version_async() -> Optional[str]:
+    return await cache_get_json_async(db.VENUE_VERSION_KEY)
+
+
+def _due_for_check() -> Optional[bool]:
+    """True/False when a reload is (not) needed regardless of the published version,
+    None when it comes down to comparing versions."""
+    global _checked_at
+    if _registry is None:
+        return True
+    now = monotonic()
+    if now - _checked_at < settings.VENUE_REGISTRY_CHECK_SECONDS:
+        return False
+    _checked_at = now
+    if now - _registry.loaded_at >= settings.VENUE_REGISTRY_MAX_AGE_SECONDS:
+        return True
+    return None
+
+
+def _version_changed(version: Optional[str]) -> bool:
+    return version is not None and version != _registry.version
+
+
+def _install(venues: List[SportsVenue], version: Optional[str]) -> VenueRegistry:
+    global _registry, _checked_at
+    _registry = VenueRegistry.from_venues(venues, version)
+    _checked_at = _registry.loaded_at
+    logging.info(f"Venue registry loaded: {len(_registry.by_key)} venues (version {version})")
+    return _registry
+
+
+def reload_venue_registry() -> VenueRegistry:
+    # Read the version first: a sync landing mid-load then shows up as a newer
+    # version at the next check rather than being missed.
+    version = _published_version()
+    return _install(db.get_all_rows(db.engine, SportsVenue, db.select(SportsVenue)), version)
+
+
+async def reload_venue_registry_async() -> VenueRegistry:
+    version = await _published_version_async()
+    return _install(await async_db.get_all_rows_async(db.select(SportsVenue)), version)
+
+
+def venue_registry() -> VenueRegistry:
+    """The current registry, (re)loaded first if it is missing or out of date."""
+    due = _due_for_check()
+    if due or (due is None and _version_changed(_published_version())):
+        return reload_venue_registry()
+    return _registry
+
+
+async def venue_registry_async() -> VenueRegistry:
+    """`venue_registry` for API handlers: the version check and any reload go through
+    the async Valkey client and engine."""
+    due = _due_for_check()
+    if due or (due is None and _version_changed(await _published_version_async())):
+        return await reload_venue_registry_async()
+    return _registry
@@ -0,0 +1,118 @@
+"""Columnar (Parquet) snapshots of the slot tables and the venue table.
+
+Analytics and offline debugging used to query production Postgres directly,
+competing with API reads for the instance's 20 connections. After each successful
+crawl the pipeline writes the sport's published slots and the venue table to
+`settings.SNAPSHOT_PATH` (and, when `SNAPSHOT_BUCKET` is set, uploads them to Cloud
+Storage), so those reads can run off the files instead:
+
+    {SNAPSHOT_PATH}/slots/sport={sport}/date={date}/slots.parquet
+    {SNAPSHOT_PATH}/venues/venues.parquet
+
+Partitions are Hive-style, so `pandas.read_parquet` / pyarrow / DuckDB prune on sport
+and date. Each run replaces its sport's partitions, so the files always hold the
+latest published crawl; partitions for dates that are no longer crawled are removed.
+
+Parquet needs pyarrow, which is only imported here: if it is missing, exporting logs
+a warning and does nothing.
+"""
+import os
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import sqlmodel
+
+import sportscanner.storage.postgres.database as db
+from sportscanner.logger import logging
+from sportscanner.storage.postgres.tables import SportsVenue
+from sportscanner.variables import settings
+
+_SLOT_COLUMNS = (
+    "composite_key", "category", "date", "starting_time", "ending_time", "starts_at",
+    "price", "spaces", "booking_url", "last_refreshed",
+)
+_VENUE_COLUMNS = (
+    "composite_key", "organisation", "organisation_website", "venue_name", "slug",
+    "postcode", "address", "latitude", "longitude", "sports",
+)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path):
+    """Writes via a temporary file and a rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".parquet.partial")
+    df.to_parquet(partial, engine="pyarrow", index=False)
+    os.replace(partial, path)
+
+
+def export_snapshot(TableForLoading: sqlmodel.main.SQLModelMetaclass, root: Optional[str] = None) -> List[Path]:
+    """Writes `TableForLoading`'s published slots, one file per date, plus the venue
+    table, under `root` (default `settings.SNAPSHOT_PATH`). Returns the files written."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logging.warning("pyarrow is not installed; skipping Parquet snapshot")
+        return []
+
+    sport = TableForLoading.__tablename__
+    root = Path(root or settings.SNAPSHOT_PATH)
+    snapshot_at = datetime.now()
+
+    slots = pd.DataFrame(db.fetch_columns(db.engine, (
+        db.select(*[getattr(TableForLoading, c) for c in _SLOT_COLUMNS])
+        .where(db.in_published_generation(TableForLoading))
+    )))
+    venues = pd.DataFrame(db.fetch_columns(db.engine, db.select(*[getattr(SportsVenue, c) for c in _VENUE_COLUMNS])))
+
+    written = []
+    sport_dir = root / "slots" / f"sport={sport}"
+    exported_dates = set()
+    if not slots.empty:
+        slots["snapshot_at"] = snapshot_at
+        for slot_date, partition in slots.groupby("date"):
+            exported_dates.add(f"date={slot_date.isoformat()}")
+            path = sport_dir / f"date={slot_date.isoformat()}" / "slots.parquet"
+            _write_parquet(partition.drop(columns="date"), path)
+            written.append(path)
+    if sport_dir.exists():
+        for partition_dir in sport_dir.iterdir():
+            if partition_dir.is_dir() and partition_dir.name not in exported_dates:
+                shutil.rmtree(partition_dir)
+
+    venues["snapshot_at"] = snapshot_at
+    venues_path = root / "venues" / "venues.parquet"
+    _write_parquet(venues, venues_path)
+    written.append(venues_path)
+
+    logging.success(
+        f"Snapshot of {len(slots)} {sport} slots ({len(exported_dates)} dates) and {len(venues)} venues written to {root}"
+    )
+    if settings.SNAPSHOT_BUCKET:
+        from sportscanner.storage.cloudstorage.bucket import upload_files
+        upload_files(settings.SNAPSHOT_BUCKET, root, written)
+    return written
+
+
+def read_snapshot(sport: str, starting_date: Optional[date] = None, ending_date: Optional[date] = None,
+                  root: Optional[str] = None) -> pd.DataFrame:
+    """A sport's snapshotted slots, optionally limited to a date range (only the
+    matching partitions are read). `date` comes back as a column."""
+    filters = []
+    if starting_date is not None:
+        filters.append(("date", ">=", starting_date.isoformat()))
+    if ending_date is not None:
+        filters.append(("date", "<=", ending_date.isoformat()))
+    df = pd.read_parquet(
+        Path(root or settings.SNAPSHOT_PATH) / "slots" / f"sport={sport}",
+        engine="pyarrow",
+        filters=filters or None,
+    )
+    df["date"] = pd.to_datetime(df["date"].astype(str)).dt.date
+    return df
+
+
+def read_venues_snapshot(root: Optional[str] = None) -> pd.DataFrame:
+    return pd.read_parquet(Path(root or settings.SNAPSHOT_PATH) / "venues" / "venues.parquet", engine="pyarrow")
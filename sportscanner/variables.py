@@ -14,11 +14,29 @@ env_file = ".env" if os.getenv("ENV") == "prod" else ".dev.env"
 
 class Settings(BaseSettings):
     DB_CONNECTION_STRING: str
+    # Connections one process may hold across both engines (docs/database.md). API
+    # processes (DB_API_PROCESS, set by api/root.py) give ASYNC_DB_POOL_SIZE of them to
+    # the async (asyncpg) engine and the rest to the sync one; others use all of them
+    # for the sync engine.
+    DB_PROCESS_CONNECTIONS: int = 5
+    DB_API_PROCESS: bool = False
+    ASYNC_DB_POOL_SIZE: int = 3
     HTTPX_CLIENT_MAX_CONNECTIONS: int
     HTTPX_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int
     HTTPX_CLIENT_TIMEOUT: float
     CRAWLER_MAX_CONCURRENT_REQUESTS_PER_PROVIDER: int = 20
     USE_PROXIES: bool = False
+    # Crawlers spool parsed slots here before they are loaded (see crawlers/spool.py).
+    CRAWL_SPOOL_DIR: str = "spool"
+    CRAWL_SPOOL_RETENTION_DAYS: int = 3
+    # Also rebuild the bitmap-encoded availability (storage/postgres/availability_bitmaps.py)
+    # after each successful crawl.
+    AVAILABILITY_BITMAPS: bool = False
+    # Parquet snapshot of each sport's slots and the venues after every successful
+    # crawl (storage/snapshots.py); disabled when unset. SNAPSHOT_BUCKET additionally
+    # uploads them to that Cloud Storage bucket.
+    SNAPSHOT_PATH: Optional[str] = None
+    SNAPSHOT_BUCKET: Optional[str] = None
     ROTATING_PROXY_ENDPOINT: str
     API_BASE_URL: Optional[str] = "http://localhost:8000/"
     CLOUD_FIRESTORE_CREDENTIALS_PATH: Optional[str]
@@ -29,10 +47,37 @@ class Settings(BaseSettings):
     ENV: str
     KINDE_DOMAIN: str
     KINDE_CLIENT_ID: str
+    # How long a resolved Kinde identity is reused for the same refresh token
+    # (core/kinde/auth.py), and how many tokens are remembered per process.
+    KINDE_IDENTITY_CACHE_SECONDS: int = 120
+    KINDE_IDENTITY_CACHE_ENTRIES: int = 1024
+    # Personal API tokens (storage/postgres/api_token_repository.py): how long a
+    # verified token is reused without a DB lookup, how many are remembered per
+    # process, and how often buffered last_used_at values are written. 0 disables.
+    API_TOKEN_CACHE_SECONDS: int = 30
+    API_TOKEN_CACHE_ENTRIES: int = 1024
+    API_TOKEN_LAST_USED_FLUSH_SECONDS: int = 60
     # Valkey (Redis-protocol-compatible) cache for near-static lookups (postcode
     # geocoding, venues-within-radius). Optional — caching is skipped entirely if unset.
     VALKEY_URL: Optional[str] = None
     CACHE_TTL_SECONDS: int = 300
+    # Postcode coordinates effectively never change, so geocodes are kept far longer
+    # than venue lists (30 days).
+    GEOCODE_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    # Refresh-ahead (cache.refresh_ahead): keys hit at least this often are rewritten
+    # in the background once this fraction of their TTL is left.
+    CACHE_REFRESH_MIN_HITS: int = 3
+    CACHE_REFRESH_AHEAD_FRACTION: float = 0.2
+    # Connection pool size of the async Valkey client, per API process.
+    VALKEY_MAX_CONNECTIONS: int = 10
+    # Search response cache (api/routers/search/response_cache.py): entries are
+    # invalidated by crawl generation; the TTL is only a backstop.
+    SEARCH_CACHE_ENTRIES: int = 512
+    SEARCH_CACHE_TTL_SECONDS: int = 3600
+    # In-process venue registry (storage/postgres/venue_registry.py): how often a lookup
+    # checks the published venue version, and the reload interval when there is none.
+    VENUE_REGISTRY_CHECK_SECONDS: int = 30
+    VENUE_REGISTRY_MAX_AGE_SECONDS: int = 3600
     # Public origin the MCP server's OAuth proxy is reachable at. Must be the
     # true domain root (no "/mcp" suffix) — the proxy builds its OAuth routes
     # (redirect callback, /token, /authorize) and RFC 9728 protected-resource